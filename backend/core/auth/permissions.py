@@ -1,10 +1,56 @@
-from typing import Union, cast
+from __future__ import annotations
 
-from django.db.models import Q
-from django.shortcuts import get_object_or_404
+from dataclasses import dataclass
+from typing import Dict, Optional, Union, cast
+
+from django.http import Http404
 from rest_framework import permissions
+from rest_framework.request import Request
+
+from core.models import Membership, Recipe, Team, User, user_active_team_ids
+
+
+@dataclass(frozen=True)
+class TeamMembership:
+    team: Team
+    # `None` when the user has neither joined nor been invited to the team
+    membership: Optional[Membership]
+
+    @property
+    def is_member(self) -> bool:
+        return self.membership is not None and self.membership.is_active
+
 
-from core.models import Membership, Recipe, Team, User
+def get_team_membership(request: Request, team_pk: Union[str, int]) -> TeamMembership:
+    """
+    Load the team and the requesting user's membership of it in one query,
+    memoized on the request so permissions and views share the lookup.
+
+    Raises `Http404` if the team doesn't exist.
+    """
+    memo: Optional[Dict[str, TeamMembership]] = getattr(
+        request, "_team_memberships", None
+    )
+    if memo is None:
+        memo = {}
+        setattr(request, "_team_memberships", memo)
+    key = str(team_pk)
+    if key not in memo:
+        try:
+            membership = (
+                Membership.objects.select_related("team")
+                .filter(team=team_pk, user=request.user)
+                .first()
+            )
+            team = membership.team if membership is not None else None
+            if team is None:
+                team = Team.objects.filter(pk=team_pk).first()
+        except ValueError:
+            team = None
+        if team is None:
+            raise Http404
+        memo[key] = TeamMembership(team=team, membership=membership)
+    return memo[key]
 
 
 class DisallowAny:
@@ -24,15 +70,18 @@ class IsTeamMember(permissions.BasePermission):
         team_pk = view.kwargs["team_pk"]
         if team_pk == "me":
             return True
-        team: Team = get_object_or_404(Team, pk=team_pk)
-        return team.is_member(request.user)
+        if str(team_pk) in {str(pk) for pk in user_active_team_ids(request.user)}:
+            return True
+        # 404 for teams that don't exist, 403 for ones the user isn't in
+        return get_team_membership(request, team_pk).is_member
 
 
 class IsTeamMemberIfPrivate(permissions.BasePermission):
     def has_permission(self, request, view) -> bool:
-        team_pk = view.kwargs["team_pk"]
-        team: Team = get_object_or_404(Team, pk=team_pk)
-        return team.is_member(request.user) or (team.is_public and request.user)
+        team_membership = get_team_membership(request, view.kwargs["team_pk"])
+        return team_membership.is_member or (
+            team_membership.team.is_public and request.user
+        )
 
 
 class IsTeamAdmin(permissions.BasePermission):
@@ -41,12 +90,8 @@ class IsTeamAdmin(permissions.BasePermission):
             team_pk = view.kwargs["pk"]
         else:
             team_pk = view.kwargs["team_pk"]
-        team = get_object_or_404(Team, pk=team_pk)
-        return (
-            team.membership_set.filter(level=Membership.ADMIN)
-            .filter(user=request.user)
-            .exists()
-        )
+        membership = get_team_membership(request, team_pk).membership
+        return membership is not None and membership.level == Membership.ADMIN
 
 
 class IsTeamAdminOrMembershipOwner(permissions.BasePermission):
@@ -57,24 +102,26 @@ class IsTeamAdminOrMembershipOwner(permissions.BasePermission):
     def has_object_permission(self, request, view, membership: Membership) -> bool:
         if not isinstance(membership, Membership):
             raise TypeError("This permission only works for membership objects")
-        object_owner: bool = membership.user == request.user
-        team_admin = membership.team.is_admin(request.user)
-        return object_owner or team_admin
+        object_owner: bool = membership.user_id == request.user.id
+        if object_owner:
+            return True
+        requester = get_team_membership(request, membership.team_id).membership
+        return (
+            requester is not None
+            and requester.is_active
+            and requester.level == Membership.ADMIN
+        )
 
 
 class NonSafeIfMemberOrAdmin(IsTeamMember):
     def has_permission(self, request, view) -> bool:
         if request.method in permissions.SAFE_METHODS:
             return True
-        team_pk = view.kwargs["team_pk"]
-        team = get_object_or_404(Team, pk=team_pk)
-        return (
-            team.membership_set.filter(
-                Q(level=Membership.ADMIN) | Q(level=Membership.CONTRIBUTOR)
-            )
-            .filter(user=request.user)
-            .exists()
-        )
+        membership = get_team_membership(request, view.kwargs["team_pk"]).membership
+        return membership is not None and membership.level in {
+            Membership.ADMIN,
+            Membership.CONTRIBUTOR,
+        }
 
 
 def has_recipe_access(*, user: User, recipe: Recipe) -> bool:
@@ -82,7 +129,7 @@ def has_recipe_access(*, user: User, recipe: Recipe) -> bool:
     return (
         cast(bool, recipe.owner == user)
         if isinstance(recipe_owner, User)
-        else recipe_owner.is_member(user)
+        else recipe_owner.id in user_active_team_ids(user)
     )
 
 
@@ -0,0 +1,94 @@
+"""
+Batched writes from a background thread
+
+Used for bookkeeping writes that shouldn't hold up the request, like the
+shopping list log, recipe view tracking and stored recipe documents. Items are queued and a daemon
+thread passes them to `write` in batches. Anything still queued when the
+process exits is flushed by an `atexit` hook.
+"""
+from __future__ import annotations
+
+import abc
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Generic, TypeVar
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+BATCH_SIZE = 100
+FLUSH_INTERVAL_SEC = 5.0
+MAX_QUEUED = 10_000
+
+
+class BatchWriter(abc.ABC, Generic[T]):
+    name: str
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[T] = queue.Queue(maxsize=MAX_QUEUED)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def sync(self) -> bool:
+        """Write inline with the caller instead, tests rely on this."""
+        return False
+
+    @abc.abstractmethod
+    def write(self, batch: list[T]) -> None:
+        ...
+
+    def submit(self, item: T) -> None:
+        if self.sync():
+            self.write([item])
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            logger.warning("%s is full, dropping item", self.name)
+
+    def flush(self) -> None:
+        """Write any queued items from the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self.write(batch)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=self.name, daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL_SEC
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(
+                        self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    )
+                except queue.Empty:
+                    break
+            try:
+                self.write(batch)
+            except Exception:
+                logger.exception("failed to write %s batch", self.name)
+            finally:
+                close_old_connections()
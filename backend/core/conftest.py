@@ -4,6 +4,7 @@ from logging import getLogger
 import pytest
 from rest_framework.test import APIClient
 
+from core.cumin.caching import clear_parse_caches
 from core.models import (
     Ingredient,
     Note,
@@ -18,6 +19,16 @@ from core.models import (
 getLogger("flake8").propagate = False
 
 
+@pytest.fixture(autouse=True)
+def parse_caches():
+    """
+    Parsed ingredients are cached per process, start each test with empty
+    caches.
+    """
+    yield
+    clear_parse_caches()
+
+
 @pytest.fixture
 def user():
     """
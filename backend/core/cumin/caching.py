@@ -0,0 +1,60 @@
+"""
+Caches of parsed ingredient text
+
+Sized by `CUMIN_PARSE_CACHE_SIZE`, which is read when a cache is first used
+rather than at import, and again whenever the setting changes, e.g. under
+`override_settings`.
+"""
+from __future__ import annotations
+
+import functools
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+T = TypeVar("T")
+
+_caches: list[ParseCache[Any]] = []
+
+
+class ParseCache(Generic[T]):
+    """
+    `functools.lru_cache` sized by `CUMIN_PARSE_CACHE_SIZE`, see
+    `cache_info()` for hit & miss counts.
+    """
+
+    def __init__(self, func: Callable[..., T]) -> None:
+        self._func = func
+        self._cached: Optional[functools._lru_cache_wrapper[T]] = None
+        functools.update_wrapper(self, func)
+        _caches.append(self)
+
+    def _wrapper(self) -> functools._lru_cache_wrapper[T]:
+        if self._cached is None:
+            self._cached = functools.lru_cache(maxsize=settings.CUMIN_PARSE_CACHE_SIZE)(
+                self._func
+            )
+        return self._cached
+
+    def __call__(self, *args: Hashable) -> T:
+        return self._wrapper()(*args)
+
+    def cache_info(self) -> functools._CacheInfo:
+        return self._wrapper().cache_info()
+
+    def cache_clear(self) -> None:
+        # rebuilt with the current size on the next call
+        self._cached = None
+
+
+def clear_parse_caches() -> None:
+    for cache in _caches:
+        cache.cache_clear()
+
+
+@receiver(setting_changed)
+def resize_parse_caches(setting: str, **kwargs: object) -> None:
+    if setting == "CUMIN_PARSE_CACHE_SIZE":
+        clear_parse_caches()
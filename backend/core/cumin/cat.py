@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Any, Mapping
+import functools
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Iterable, Mapping
 
+from core.cumin.caching import ParseCache
 from core.schedule.inflect import singularize
 
 DEPARTMENT_MAPPING = {
@@ -442,51 +445,128 @@ DEPARTMENT_MAPPING = {
 }
 
 
-def create_trie(mapping: Mapping[str, set[str]]) -> dict[str, Any]:
-    trie: dict[str, Any] = {}
+@dataclass(frozen=True)
+class Automaton:
+    """
+    Aho–Corasick automaton over singularized words.
+
+    Node 0 is the root. `outputs` holds every phrase ending at a node, its own
+    and those reachable through its failure links, as
+    (word count, category, length of the original ingredient).
+    """
+
+    goto: list[dict[str, int]]
+    fail: list[int]
+    outputs: list[tuple[tuple[int, str, int], ...]]
+
+
+def create_trie(mapping: Mapping[str, set[str]]) -> Automaton:
+    goto: list[dict[str, int]] = [{}]
+    terminal: list[tuple[int, str, int] | None] = [None]
     for category, ingredients in mapping.items():
         for ingredient in ingredients:
-            tree = trie
+            node = 0
             words = [singularize(x) for x in ingredient.replace("-", " ").split()]
-            for idx, word in enumerate(words):
-                if word in tree:
-                    tree = tree[word]
-                else:
-                    tree[word] = {}
-                    tree = tree[word]
-                is_last = idx == len(words) - 1
-                if is_last and "$" not in tree:
-                    tree["$"] = (category, len(ingredient))
-    return trie
+            for word in words:
+                child = goto[node].get(word)
+                if child is None:
+                    child = len(goto)
+                    goto[node][word] = child
+                    goto.append({})
+                    terminal.append(None)
+                node = child
+            # first mapping to claim a phrase keeps it
+            if words and terminal[node] is None:
+                terminal[node] = (len(words), category, len(ingredient))
+
+    fail = [0] * len(goto)
+    outputs: list[tuple[tuple[int, str, int], ...]] = [()] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        node = queue.popleft()
+        own = terminal[node]
+        outputs[node] = ((own,) if own is not None else ()) + outputs[fail[node]]
+        for word, child in goto[node].items():
+            state = fail[node]
+            while state and word not in goto[state]:
+                state = fail[state]
+            fail[child] = goto[state].get(word, 0)
+            queue.append(child)
+    return Automaton(goto=goto, fail=fail, outputs=outputs)
 
 
 trie = create_trie(DEPARTMENT_MAPPING)
 
 
-def search(item: str, trie: dict[str, Any] = trie) -> dict[str, set[int]]:
-    items = [singularize(x) for x in item.split()]
+def search(item: str, trie: Automaton = trie) -> dict[str, set[int]]:
+    goto, fail, outputs = trie.goto, trie.fail, trie.outputs
+    matches: list[tuple[int, int, str, int]] = []
+    state = 0
+    for end, word in enumerate(singularize(x) for x in item.split()):
+        while state and word not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(word, 0)
+        for length, cat, cnt in outputs[state]:
+            matches.append((end - length + 1, end, cat, cnt))
+    # report matches in the order of a left to right walk from each word
+    matches.sort(key=lambda x: (x[0], x[1]))
     counts = defaultdict(set)
-    for start in range(len(items)):
-        tree = trie
-        for word in items[start:]:
-            if word not in tree:
-                break
-            tree = tree[word]
-            if "$" in tree:
-                cat, cnt = tree["$"]
-                counts[cat].add(cnt)
+    for _, _, cat, cnt in matches:
+        counts[cat].add(cnt)
     return counts
 
 
+NORMALIZE_TRANSLATION = str.maketrans({"-": " ", ",": None, ")": None, "(": None})
+
+
+def normalize(ingredient: str) -> str:
+    return ingredient.lower().translate(NORMALIZE_TRANSLATION)
+
+
 def category(ingredient: str) -> str:
-    res = search(
-        ingredient.lower()
-        .replace("-", " ")
-        .replace(",", "")
-        .replace(")", "")
-        .replace("(", "")
-    )
+    return _category(normalize(ingredient))
+
+
+def categorize_many(
+    names: Iterable[str], overrides: Mapping[str, str] | None = None
+) -> dict[str, str]:
+    """
+    Categorize each of `names`.
+
+    `overrides` maps ingredient names to categories. When any of them match a
+    name they win over `DEPARTMENT_MAPPING`.
+    """
+    override_trie = _override_trie(frozenset(overrides.items())) if overrides else None
+    categories = {}
+    for name in names:
+        normalized = normalize(name)
+        if override_trie is not None:
+            res = search(normalized, override_trie)
+            if res:
+                categories[name] = _best_match(res)
+                continue
+        categories[name] = _category(normalized)
+    return categories
+
+
+@ParseCache
+def _category(name: str) -> str:
+    res = search(name)
     if not res:
         return "unknown"
 
+    return _best_match(res)
+
+
+# Keyed by the overrides themselves so editing them results in a new matcher,
+# stale entries age out of the cache.
+@functools.lru_cache(maxsize=128)
+def _override_trie(overrides: frozenset[tuple[str, str]]) -> Automaton:
+    mapping: dict[str, set[str]] = defaultdict(set)
+    for name, cat in sorted(overrides):
+        mapping[cat].add(normalize(name))
+    return create_trie(mapping)
+
+
+def _best_match(res: Mapping[str, set[int]]) -> str:
     return sorted(res.items(), key=lambda x: -max(x[1]))[0][0]
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, Sequence
+from fractions import Fraction
+from typing import Dict, Iterable, Tuple, Union
 
-from core.cumin.quantity import BaseUnit, Quantity, parse_quantity
+from core.cumin.quantity import MASS, VOLUME, BaseUnit, Quantity, Unit, parse_quantity
 from core.schedule.inflect import singularize
 
 
@@ -13,6 +14,8 @@ class Ingredient:
     quantity: str
     name: str
     description: str = ""
+    # number of times the ingredient is needed, e.g., a recipe scheduled twice
+    count: int = 1
 
 
 def normalize_ingredient_name(*, name: str) -> str:
@@ -27,10 +30,26 @@ class IngredientItem:
 
 IngredientList = Dict[str, IngredientItem]
 
+# (singular name, base unit) where each Unit.UNKNOWN uses its unknown_unit
+IngredientGroup = Tuple[str, Union[BaseUnit, str, None]]
 
-def combine_ingredients(ingredients: Sequence[Ingredient]) -> IngredientList:
-    # being kind of dynamic with the types here so not the easiest on the eyes.
-    ingredient_map: dict[str, dict[BaseUnit | str | None, Quantity]] = defaultdict(dict)
+# factor to convert a unit to its base unit, e.g., milliliters for volumes
+BASE_UNIT_FACTOR: dict[Unit, Fraction] = {**VOLUME, **MASS}
+
+
+def combine_ingredients(ingredients: Iterable[Ingredient]) -> IngredientList:
+    """
+    Sum the quantities of each ingredient.
+
+    We parse everything up front and then group by (singular name, base unit),
+    summing each group in its base unit. The sum is converted back to the
+    smallest unit we saw for the group, which is the same result as adding up
+    the `Quantity`s one by one, without creating a `Quantity` per addition.
+
+    Each ingredient counts `Ingredient.count` times towards its group.
+    """
+    totals: dict[IngredientGroup, Fraction] = {}
+    smallest_unit: dict[IngredientGroup, Quantity] = {}
 
     plural_name: dict[str, str] = dict()
 
@@ -44,26 +63,33 @@ def combine_ingredients(ingredients: Sequence[Ingredient]) -> IngredientList:
         if name != normalized_name:
             plural_name[name] = normalized_name
 
-        if base_unit == BaseUnit.UNKNOWN:
-            # For each Unit.UNKNOWN, we treat the unknown_unit, as a unique
-            # base value.
-            if quantity.unknown_unit not in ingredient_map[name]:
-                ingredient_map[name][quantity.unknown_unit] = quantity
-            else:
-                ingredient_map[name][quantity.unknown_unit] += quantity
-        elif name not in ingredient_map:
-            ingredient_map[name][base_unit] = quantity
+        # For each Unit.UNKNOWN, we treat the unknown_unit, as a unique base value.
+        key: IngredientGroup = (
+            name,
+            quantity.unknown_unit if base_unit == BaseUnit.UNKNOWN else base_unit,
+        )
+        amount = quantity.quantity * BASE_UNIT_FACTOR.get(quantity.unit, 1) * ingr.count
+        if key not in totals:
+            totals[key] = amount
+            smallest_unit[key] = quantity
         else:
-            base_unit_quantity = ingredient_map[name].get(base_unit)
-            if base_unit_quantity is None:
-                ingredient_map[name][base_unit] = quantity
-            else:
-                ingredient_map[name][base_unit] = base_unit_quantity + quantity
+            totals[key] += amount
+            if quantity.unit < smallest_unit[key].unit:
+                smallest_unit[key] = quantity
 
     output: IngredientList = defaultdict(IngredientItem)
 
-    for ingre_name, unit_to_quantity in ingredient_map.items():
-        name = plural_name.get(ingre_name, ingre_name)
-        output[name].quantities += unit_to_quantity.values()
+    # groups are in insertion order so the names and their quantities keep the
+    # order we first saw them in
+    for key, total in totals.items():
+        ingre_name, _ = key
+        unit = smallest_unit[key]
+        output[plural_name.get(ingre_name, ingre_name)].quantities.append(
+            Quantity(
+                quantity=total / BASE_UNIT_FACTOR.get(unit.unit, 1),
+                unit=unit.unit,
+                unknown_unit=unit.unknown_unit,
+            )
+        )
 
     return output
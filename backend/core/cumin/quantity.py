@@ -1,17 +1,16 @@
 from __future__ import annotations
 
-import decimal
 import enum
-import itertools
+import re
 from dataclasses import dataclass
-from decimal import Decimal
 from enum import Enum
+from fractions import Fraction
 from typing import Tuple
 
-MALFORMED_UNITS = {"large", "medium", "small", "fresh"}
+from core.cumin.caching import ParseCache
 
+MALFORMED_UNITS = {"large", "medium", "small", "fresh"}
 
-quantity_chars = set(" /.0123456789")
 
 UNICODE_FRACTION_MAPPING = {
     "½": "1/2",
@@ -34,6 +33,8 @@ UNICODE_FRACTION_MAPPING = {
     "⅒": "1/10",
 }
 
+UNICODE_FRACTION_TRANSLATION = str.maketrans(UNICODE_FRACTION_MAPPING)
+
 
 def unicode_fractions_to_ascii(s: str) -> str:
     """
@@ -41,11 +42,7 @@ def unicode_fractions_to_ascii(s: str) -> str:
     equivalent `1/2`
     """
 
-    output = ""
-    for char in s:
-        output += UNICODE_FRACTION_MAPPING.get(char, char)
-
-    return output
+    return s.translate(UNICODE_FRACTION_TRANSLATION)
 
 
 def max_quantity(quantity: str) -> str:
@@ -54,9 +51,7 @@ def max_quantity(quantity: str) -> str:
 
     1 cup plain whole-milk
     """
-    if " to " in quantity:
-        return quantity.split(" to ")[-1]
-    return quantity.split("-")[-1]
+    return quantity.split(" to ")[-1].split("-")[-1]
 
 
 @enum.unique
@@ -113,7 +108,14 @@ class Unit(str, Enum):
 
 def get_unit(val: str) -> Unit:
     val_cased = val.strip()
+    unit = ALIAS_TO_UNIT.get(val_cased)
+    if unit is not None:
+        return unit
     val = val_cased.lower()
+    unit = LOWERCASE_ALIAS_TO_UNIT.get(val)
+    if unit is not None:
+        return unit
+    # fallback for units that aren't an exact alias, e.g., `cupful` or `Tbsp.`
     if "cup" in val:
         return Unit.CUP
     if val == "kg":
@@ -145,23 +147,29 @@ def get_unit(val: str) -> Unit:
     return Unit.UNKNOWN
 
 
-def fraction_to_decimal(val: str) -> Decimal | None:
+def parse_fraction(val: str) -> Fraction | None:
+    """
+    "1 1/2" -> Fraction(3, 2)
+
+    We keep quantities as exact fractions so summing many ingredients doesn't
+    accumulate rounding errors. They're converted to decimals when rendered.
+    """
     try:
-        total = Decimal(0)
+        total = Fraction(0)
         for v in val.strip().split(" "):
             if "/" in v:
                 top, bot = v.split("/")
-                total += Decimal(top) / Decimal(bot)
+                total += Fraction(top) / Fraction(bot)
             else:
-                total += Decimal(v)
+                total += Fraction(v)
         return total
-    except decimal.InvalidOperation:
+    except (ValueError, ZeroDivisionError):
         return None
 
 
-@dataclass
+@dataclass(frozen=True)
 class Quantity:
-    quantity: Decimal
+    quantity: Fraction
     unit: Unit
     unknown_unit: str | None = None
 
@@ -211,22 +219,12 @@ class Quantity:
 
 
 def _parse_quantity(val: str) -> Quantity:
-    value = iter(unicode_fractions_to_ascii(max_quantity(val).strip()))
-
-    quantity = ""
-    unit_str = ""
-    for c in value:
-        if c in quantity_chars:
-            quantity += c
-        else:
-            unit_str += c
-            break
-
-    for c in value:
-        if c in quantity_chars:
-            break
-        # handle case of two units and quantities next to each other
-        unit_str += c
+    value = unicode_fractions_to_ascii(max_quantity(val).strip())
+
+    match = QUANTITY_RE.match(value)
+    assert match is not None, "pattern can match the empty string"
+    quantity = match["quantity"]
+    unit_str = match["unit"] or match["other"]
 
     # strip out misplaced words, e.g., `1 large` `lemon` instead of `1` `large lemon`
     if unit_str in MALFORMED_UNITS:
@@ -239,7 +237,7 @@ def _parse_quantity(val: str) -> Quantity:
         unknown_unit = unit_str
 
     return Quantity(
-        quantity=fraction_to_decimal(quantity) or Decimal(1),
+        quantity=parse_fraction(quantity) or Fraction(1),
         unit=unit,
         unknown_unit=unknown_unit,
     )
@@ -264,7 +262,7 @@ class BaseUnit(Enum):
     UNKNOWN = "UNKNOWN"
 
 
-TEASPOON_ML = Decimal(4.92892)
+TEASPOON_ML = Fraction("4.92892")
 TABLESPOON_ML = 3 * TEASPOON_ML
 FLUID_OUNCE_ML = 2 * TABLESPOON_ML
 CUP_ML = 8 * FLUID_OUNCE_ML
@@ -273,32 +271,36 @@ QUART_ML = 2 * PINT_ML
 GALLON_ML = 4 * QUART_ML
 
 
-OUNCE_GRAM = Decimal(28.34952)
+OUNCE_GRAM = Fraction("28.34952")
 
-MASS: dict[Unit, Decimal] = {
-    Unit.GRAM: Decimal(1),
+MASS: dict[Unit, Fraction] = {
+    Unit.GRAM: Fraction(1),
     Unit.OUNCE: OUNCE_GRAM,
     Unit.POUND: 16 * OUNCE_GRAM,
-    Unit.KILOGRAM: Decimal(1000),
+    Unit.KILOGRAM: Fraction(1000),
 }
 
 
-VOLUME: dict[Unit, Decimal] = {
-    Unit.MILLILITER: Decimal(1),
+VOLUME: dict[Unit, Fraction] = {
+    Unit.MILLILITER: Fraction(1),
     Unit.TEASPOON: TEASPOON_ML,
     Unit.TABLESPOON: TABLESPOON_ML,
     Unit.FLUID_OUNCE: FLUID_OUNCE_ML,
     Unit.CUP: CUP_ML,
     Unit.PINT: PINT_ML,
     Unit.QUART: QUART_ML,
-    Unit.LITER: Decimal(1000),
+    Unit.LITER: Fraction(1000),
     Unit.GALLON: GALLON_ML,
 }
 
 
+@ParseCache
 def parse_quantity(val: str) -> Quantity:
     """
     handle "3 Tablespoon + 1 teaspoon" format
+
+    Results are cached by the raw text, see `parse_quantity.cache_info()` for
+    hit & miss counts.
     """
     quantities = val.split("+")
     a = _parse_quantity(quantities[0])
@@ -349,24 +351,38 @@ UNIT_TO_ALIASES: dict[Unit, list[str]] = {
     ],
 }
 
-# NOTE(sbdchd): we add some whitespace so when we search the ingredient for the quantity
-units_ws = tuple(
-    x + " " for x in itertools.chain.from_iterable(UNIT_TO_ALIASES.values())
-)
-
-larger_to_smaller_units_ws = sorted(units_ws, key=lambda x: -len(x))
+ALIAS_TO_UNIT: dict[str, Unit] = {
+    alias: unit for unit, aliases in UNIT_TO_ALIASES.items() for alias in aliases
+}
 
+# `T` and `t` only differ by case so we leave them to the case sensitive lookup
+LOWERCASE_ALIAS_TO_UNIT: dict[str, Unit] = {
+    alias: unit for alias, unit in ALIAS_TO_UNIT.items() if alias.islower()
+}
 
-def starts_with(string: str, prefixes: tuple[str, ...] | str) -> bool:
-    """
-    case insensitive str.starts_with
-    """
-    if isinstance(prefixes, str):
-        prefixes = (prefixes,)
-    for prefix in prefixes:
-        if string[: len(prefix)].casefold() == prefix.casefold():
-            return True
-    return False
+# Splits the quantity, unit & name of an ingredient in one match, used both
+# for ingredient text & the stored quantities of ingredients.
+#
+# NOTE: we require some whitespace after a known unit so we don't eat the
+# start of the name, e.g., `1 large egg` shouldn't match the `l` alias.
+#
+# Longer aliases come first since the regex engine takes the first alternative
+# that matches, e.g., `tablespoons` instead of `tablespoon`.
+QUANTITY_RE = re.compile(
+    # numbers, fractions, ranges, whitespace, and the `to` in `7 to 8`
+    r"(?P<quantity>(?:[\d/.\-\s]|(?<= )(?-i:to) )*)"
+    # a known unit
+    + r"(?:(?P<unit>"
+    + "|".join(
+        re.escape(alias) for alias in sorted(ALIAS_TO_UNIT, key=lambda x: -len(x))
+    )
+    + r")(?= )"
+    # otherwise the run up to the next quantity character, a unit when
+    # parsing quantities, e.g., `ounces` in `4 ounces/112 grams`, or the start
+    # of the name
+    + r"|(?P<other>[^ /.0-9]*))",
+    re.IGNORECASE,
+)
 
 
 def parse_quantity_name(text: str) -> tuple[str, str]:
@@ -380,57 +396,18 @@ def parse_quantity_name(text: str) -> tuple[str, str]:
     """
 
     value = unicode_fractions_to_ascii(text.strip())
-    quantity = ""
-    name = ""
-
-    idx = 0
-    in_quantity = True
-
-    while idx < len(value):
-        c = value[idx]
-        if c.isdigit() or c in {"/", ".", "-"}:
-            if in_quantity:
-                quantity += c
-            else:
-                name += c
-            idx += 1
-            continue
-        # ensure w/ '7 to 8 cups', the 'to 8` is added to the quantity portion
-        # of the result
-        elif in_quantity and c == "t" and value[idx - 1 : idx + 3] == " to ":
-            letters = "to "
-            quantity += letters
-            idx += len(letters)
-            continue
-        elif c.isspace():
-            if in_quantity:
-                quantity += c
-            else:
-                name += c
-            idx += 1
-            continue
-        else:
-            if starts_with(value[idx:], units_ws) and in_quantity:
-                in_quantity = False
-                eat_count = 0
-                for unit in larger_to_smaller_units_ws:
-                    if starts_with(value[idx:], unit):
-                        eat_count = len(unit)
-                        break
-                for _ in range(eat_count):
-                    quantity += value[idx]
-                    idx += 1
-                continue
-            if in_quantity:
-                in_quantity = False
-            name += c
-            idx += 1
-            continue
-
-    return (quantity.strip(), name.strip())
+    match = QUANTITY_RE.match(value)
+    assert match is not None, "pattern can match the empty string"
+    end = match.end("unit") if match["unit"] is not None else match.end("quantity")
+    return (value[:end].strip(), value[end:].strip())
 
 
+@ParseCache
 def parse_ingredient(text: str) -> IngredientResult:
+    """
+    Results are cached by the raw text, see `parse_ingredient.cache_info()`
+    for hit & miss counts.
+    """
     quantity_name, _, description = text.partition(",")
     quantity, name = parse_quantity_name(quantity_name)
     is_optional = "optional" in text.lower()
@@ -3,7 +3,7 @@ from collections import defaultdict
 from pathlib import Path
 from textwrap import dedent
 
-from core.cumin.cat import category, create_trie, search
+from core.cumin.cat import categorize_many, category, create_trie, search
 
 
 def test_categorize_ingredients() -> None:
@@ -118,3 +118,36 @@ def test_trie() -> None:
     trie = create_trie(mapping)
     assert search("red chile flakes", trie=trie)
     assert search("red chile powder", trie=trie)
+
+
+def test_trie_overlapping_phrases() -> None:
+    mapping = {
+        "produce": {"chile"},
+        "spices": {"red chile flakes", "chile flakes"},
+    }
+
+    trie = create_trie(mapping)
+    # falls back to the shorter phrase once the longer one stops matching
+    assert search("red chile powder", trie=trie) == {"produce": {len("chile")}}
+    assert search("dried red chile flakes", trie=trie) == {
+        "produce": {len("chile")},
+        "spices": {len("red chile flakes"), len("chile flakes")},
+    }
+
+
+def test_category_normalizes_name() -> None:
+    assert category("Red-Chile Flakes, (crushed)") == category("red chile flakes")
+    assert category("red chile flakes") == "spices"
+
+
+def test_categorize_many() -> None:
+    names = ["Soy Sauce", "dark soy sauce", "egg", "sauce", "thinly sliced"]
+    assert categorize_many(names) == {name: category(name) for name in names}
+
+    assert categorize_many(names, overrides={"soy sauce": "aisle 4"}) == {
+        "Soy Sauce": "aisle 4",
+        "dark soy sauce": "aisle 4",
+        "egg": "dairy",
+        "sauce": "unknown",
+        "thinly sliced": "unknown",
+    }
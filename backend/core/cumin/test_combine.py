@@ -1,5 +1,5 @@
 import json
-from decimal import Decimal
+from fractions import Fraction
 from typing import Sequence
 
 import pytest
@@ -11,7 +11,7 @@ from core.cumin.combine import (
     Quantity,
     combine_ingredients,
 )
-from core.cumin.quantity import Unit
+from core.cumin.quantity import Unit, parse_quantity
 from core.renderers import JSONRenderer
 
 
@@ -27,8 +27,8 @@ from core.renderers import JSONRenderer
             {
                 "soy sauce": IngredientItem(
                     quantities=[
-                        Quantity(quantity=Decimal(4), unit=Unit.TEASPOON),
-                        Quantity(quantity=Decimal(1), unit=Unit.SOME),
+                        Quantity(quantity=Fraction(4), unit=Unit.TEASPOON),
+                        Quantity(quantity=Fraction(1), unit=Unit.SOME),
                     ]
                 )
             },
@@ -44,9 +44,9 @@ from core.renderers import JSONRenderer
                 "flour": IngredientItem(
                     quantities=[
                         # mass != volume so we get two separate quantities
-                        Quantity(quantity=Decimal(3), unit=Unit.CUP),
-                        Quantity(quantity=Decimal(1), unit=Unit.SOME),
-                        Quantity(quantity=Decimal(250), unit=Unit.GRAM),
+                        Quantity(quantity=Fraction(3), unit=Unit.CUP),
+                        Quantity(quantity=Fraction(1), unit=Unit.SOME),
+                        Quantity(quantity=Fraction(250), unit=Unit.GRAM),
                     ]
                 )
             },
@@ -75,3 +75,37 @@ def test_combining_ingredients_to_json() -> None:
             ],
         }
     }
+
+
+def test_combining_matches_adding_quantities() -> None:
+    """
+    Summing a group in its base unit should give the same result as adding
+    the quantities together one at a time.
+    """
+    quantities = ["1 cup", "2 tbs", "1 tsp", "1/2 cup", "3 tablespoons", "1 pinch"]
+    ingredients = [Ingredient(quantity=q, name="olive oil") for q in quantities]
+
+    volume = [parse_quantity(q) for q in quantities[:-1]]
+    expected = volume[0]
+    for q in volume[1:]:
+        expected += q
+
+    assert combine_ingredients(ingredients) == {
+        "olive oil": IngredientItem(
+            quantities=[expected, Quantity(quantity=Fraction(1), unit=Unit.SOME)]
+        )
+    }
+    assert expected == Quantity(quantity=Fraction(88), unit=Unit.TEASPOON)
+
+
+def test_combining_weighted_ingredients() -> None:
+    """
+    An ingredient with a count should combine the same as repeating it.
+    """
+    ingredients = [("2 tbs", "soy sauce"), ("some", "garlic"), ("1 bag", "chips")]
+    repeated = [
+        Ingredient(quantity=q, name=n) for _ in range(3) for q, n in ingredients
+    ]
+    weighted = [Ingredient(quantity=q, name=n, count=3) for q, n in ingredients]
+
+    assert combine_ingredients(weighted) == combine_ingredients(repeated)
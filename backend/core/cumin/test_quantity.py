@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from decimal import Decimal
+import dataclasses
+from fractions import Fraction
+from typing import Any
 
 import pytest
 
@@ -9,7 +11,7 @@ from core.cumin.quantity import (
     IncompatibleUnit,
     IngredientResult,
     Unit,
-    fraction_to_decimal,
+    parse_fraction,
     parse_ingredient,
     parse_quantity,
     parse_quantity_name,
@@ -19,37 +21,46 @@ from core.cumin.quantity import (
 @pytest.mark.parametrize(
     "quantity,expected",
     [
-        ("1/2 Tablespoon", Quantity(quantity=Decimal(0.5), unit=Unit.TABLESPOON)),
-        ("3 1/2 Tablespoon", Quantity(quantity=Decimal(3.5), unit=Unit.TABLESPOON)),
-        ("1 tsp", Quantity(quantity=Decimal(1), unit=Unit.TEASPOON)),
-        ("4 oz", Quantity(quantity=Decimal(4), unit=Unit.OUNCE)),
-        ("4 ounces/112 grams", Quantity(quantity=Decimal(4), unit=Unit.OUNCE)),
-        ("4 ounces", Quantity(quantity=Decimal(4), unit=Unit.OUNCE)),
-        ("1 1/2 cups", Quantity(quantity=Decimal(1.5), unit=Unit.CUP)),
-        ("3lbs", Quantity(quantity=Decimal(3), unit=Unit.POUND)),
-        ("225 grams", Quantity(quantity=Decimal(225), unit=Unit.GRAM)),
-        ("1 kg", Quantity(quantity=Decimal(1), unit=Unit.KILOGRAM)),
-        ("pinch", Quantity(quantity=Decimal(1), unit=Unit.SOME)),
-        ("1/2 liter", Quantity(quantity=Decimal(0.5), unit=Unit.LITER)),
-        ("180 milliliters", Quantity(quantity=Decimal(180), unit=Unit.MILLILITER)),
-        ("2 quarts", Quantity(quantity=Decimal(2), unit=Unit.QUART)),
-        ("1/2 gallon", Quantity(quantity=Decimal(0.5), unit=Unit.GALLON)),
-        ("½ gallon", Quantity(quantity=Decimal(0.5), unit=Unit.GALLON)),
-        ("⅓ tsp", Quantity(quantity=Decimal(1) / Decimal(3), unit=Unit.TEASPOON)),
-        ("1/8 t", Quantity(quantity=Decimal(1) / Decimal(8), unit=Unit.TEASPOON)),
-        ("1/8 T", Quantity(quantity=Decimal(1) / Decimal(8), unit=Unit.TABLESPOON)),
-        ("1 tbs", Quantity(quantity=Decimal(1), unit=Unit.TABLESPOON)),
-        ("4-5", Quantity(quantity=Decimal(5), unit=Unit.NONE)),
-        ("4 to 6", Quantity(quantity=Decimal(6), unit=Unit.NONE)),
-        ("1lb", Quantity(quantity=Decimal(1), unit=Unit.POUND)),
-        ("1 pound", Quantity(quantity=Decimal(1), unit=Unit.POUND)),
-        ("1 bag", Quantity(quantity=Decimal(1), unit=Unit.UNKNOWN, unknown_unit="bag")),
+        ("1/2 Tablespoon", Quantity(quantity=Fraction(1, 2), unit=Unit.TABLESPOON)),
+        ("3 1/2 Tablespoon", Quantity(quantity=Fraction(7, 2), unit=Unit.TABLESPOON)),
+        ("1 tsp", Quantity(quantity=Fraction(1), unit=Unit.TEASPOON)),
+        ("4 oz", Quantity(quantity=Fraction(4), unit=Unit.OUNCE)),
+        ("4 ounces/112 grams", Quantity(quantity=Fraction(4), unit=Unit.OUNCE)),
+        ("4 ounces", Quantity(quantity=Fraction(4), unit=Unit.OUNCE)),
+        ("1 1/2 cups", Quantity(quantity=Fraction(3, 2), unit=Unit.CUP)),
+        ("3lbs", Quantity(quantity=Fraction(3), unit=Unit.POUND)),
+        ("225 grams", Quantity(quantity=Fraction(225), unit=Unit.GRAM)),
+        ("1 kg", Quantity(quantity=Fraction(1), unit=Unit.KILOGRAM)),
+        ("2 kilograms", Quantity(quantity=Fraction(2), unit=Unit.KILOGRAM)),
+        ("5g", Quantity(quantity=Fraction(5), unit=Unit.GRAM)),
+        ("250 ml", Quantity(quantity=Fraction(250), unit=Unit.MILLILITER)),
+        ("pinch", Quantity(quantity=Fraction(1), unit=Unit.SOME)),
+        ("1/2 liter", Quantity(quantity=Fraction(1, 2), unit=Unit.LITER)),
+        ("180 milliliters", Quantity(quantity=Fraction(180), unit=Unit.MILLILITER)),
+        ("2 quarts", Quantity(quantity=Fraction(2), unit=Unit.QUART)),
+        ("1/2 gallon", Quantity(quantity=Fraction(1, 2), unit=Unit.GALLON)),
+        ("½ gallon", Quantity(quantity=Fraction(1, 2), unit=Unit.GALLON)),
+        ("⅓ tsp", Quantity(quantity=Fraction(1, 3), unit=Unit.TEASPOON)),
+        ("1/8 t", Quantity(quantity=Fraction(1, 8), unit=Unit.TEASPOON)),
+        ("1/8 T", Quantity(quantity=Fraction(1, 8), unit=Unit.TABLESPOON)),
+        ("1 tbs", Quantity(quantity=Fraction(1), unit=Unit.TABLESPOON)),
+        ("4-5", Quantity(quantity=Fraction(5), unit=Unit.NONE)),
+        ("4 to 6", Quantity(quantity=Fraction(6), unit=Unit.NONE)),
+        ("2 to 4-5 cups", Quantity(quantity=Fraction(5), unit=Unit.CUP)),
+        ("1 pinch of", Quantity(quantity=Fraction(1), unit=Unit.SOME)),
+        ("4 ounces/112 grams", Quantity(quantity=Fraction(4), unit=Unit.OUNCE)),
+        ("1lb", Quantity(quantity=Fraction(1), unit=Unit.POUND)),
+        ("1 pound", Quantity(quantity=Fraction(1), unit=Unit.POUND)),
+        (
+            "1 bag",
+            Quantity(quantity=Fraction(1), unit=Unit.UNKNOWN, unknown_unit="bag"),
+        ),
         (
             "1 Tablespoon + 1 teaspoon",
-            Quantity(quantity=Decimal(4), unit=Unit.TEASPOON),
+            Quantity(quantity=Fraction(4), unit=Unit.TEASPOON),
         ),
-        ("some", Quantity(quantity=Decimal(1), unit=Unit.SOME)),
-        ("1", Quantity(quantity=Decimal(1), unit=Unit.NONE)),
+        ("some", Quantity(quantity=Fraction(1), unit=Unit.SOME)),
+        ("1", Quantity(quantity=Fraction(1), unit=Unit.NONE)),
     ],
 )
 def test_parsing_quantities(quantity: str, expected: Quantity | None) -> None:
@@ -58,10 +69,10 @@ def test_parsing_quantities(quantity: str, expected: Quantity | None) -> None:
 
 @pytest.mark.parametrize(
     "fraction,expected",
-    [("1/2", Decimal(0.5)), ("11/2", Decimal(5.5)), ("1 1/2", Decimal(1.5))],
+    [("1/2", Fraction(1, 2)), ("11/2", Fraction(11, 2)), ("1 1/2", Fraction(3, 2))],
 )
-def test_fraction_to_decimal(fraction: str, expected: Decimal | None) -> None:
-    assert fraction_to_decimal(fraction) == expected
+def test_parse_fraction(fraction: str, expected: Fraction | None) -> None:
+    assert parse_fraction(fraction) == expected
 
 
 @pytest.mark.parametrize(
@@ -69,68 +80,68 @@ def test_fraction_to_decimal(fraction: str, expected: Decimal | None) -> None:
     [
         (
             (
-                Quantity(quantity=Decimal(3), unit=Unit.POUND),
-                Quantity(quantity=Decimal(1), unit=Unit.POUND),
+                Quantity(quantity=Fraction(3), unit=Unit.POUND),
+                Quantity(quantity=Fraction(1), unit=Unit.POUND),
             ),
-            Quantity(quantity=Decimal(4), unit=Unit.POUND),
+            Quantity(quantity=Fraction(4), unit=Unit.POUND),
         ),
         (
             (
-                Quantity(quantity=Decimal(0.5), unit=Unit.LITER),
-                Quantity(quantity=Decimal(1), unit=Unit.LITER),
+                Quantity(quantity=Fraction(1, 2), unit=Unit.LITER),
+                Quantity(quantity=Fraction(1), unit=Unit.LITER),
             ),
-            Quantity(quantity=Decimal(1.5), unit=Unit.LITER),
+            Quantity(quantity=Fraction(3, 2), unit=Unit.LITER),
         ),
         (
             (
-                Quantity(quantity=Decimal(1), unit=Unit.TEASPOON),
-                Quantity(quantity=Decimal(3), unit=Unit.TABLESPOON),
+                Quantity(quantity=Fraction(1), unit=Unit.TEASPOON),
+                Quantity(quantity=Fraction(3), unit=Unit.TABLESPOON),
             ),
-            Quantity(quantity=Decimal(10), unit=Unit.TEASPOON),
+            Quantity(quantity=Fraction(10), unit=Unit.TEASPOON),
         ),
         (
             (
-                Quantity(quantity=Decimal(1), unit=Unit.NONE),
-                Quantity(quantity=Decimal(3), unit=Unit.NONE),
+                Quantity(quantity=Fraction(1), unit=Unit.NONE),
+                Quantity(quantity=Fraction(3), unit=Unit.NONE),
             ),
-            Quantity(quantity=Decimal(4), unit=Unit.NONE),
+            Quantity(quantity=Fraction(4), unit=Unit.NONE),
         ),
         # check ordering
         (
             (
-                Quantity(quantity=Decimal(150), unit=Unit.GRAM),
-                Quantity(quantity=Decimal(1), unit=Unit.KILOGRAM),
+                Quantity(quantity=Fraction(150), unit=Unit.GRAM),
+                Quantity(quantity=Fraction(1), unit=Unit.KILOGRAM),
             ),
-            Quantity(quantity=Decimal(1150), unit=Unit.GRAM),
+            Quantity(quantity=Fraction(1150), unit=Unit.GRAM),
         ),
         (
             (
-                Quantity(quantity=Decimal(1), unit=Unit.KILOGRAM),
-                Quantity(quantity=Decimal(150), unit=Unit.GRAM),
+                Quantity(quantity=Fraction(1), unit=Unit.KILOGRAM),
+                Quantity(quantity=Fraction(150), unit=Unit.GRAM),
             ),
-            Quantity(quantity=Decimal(1150), unit=Unit.GRAM),
+            Quantity(quantity=Fraction(1150), unit=Unit.GRAM),
         ),
         # `some` should be removed when combined with a proper amount
         (
             (
-                Quantity(quantity=Decimal(2), unit=Unit.TEASPOON),
-                Quantity(quantity=Decimal(1), unit=Unit.SOME),
+                Quantity(quantity=Fraction(2), unit=Unit.TEASPOON),
+                Quantity(quantity=Fraction(1), unit=Unit.SOME),
             ),
-            Quantity(quantity=Decimal(2), unit=Unit.TEASPOON),
+            Quantity(quantity=Fraction(2), unit=Unit.TEASPOON),
         ),
         (
             (
-                Quantity(quantity=Decimal(1), unit=Unit.SOME),
-                Quantity(quantity=Decimal(2), unit=Unit.TEASPOON),
+                Quantity(quantity=Fraction(1), unit=Unit.SOME),
+                Quantity(quantity=Fraction(2), unit=Unit.TEASPOON),
             ),
-            Quantity(quantity=Decimal(2), unit=Unit.TEASPOON),
+            Quantity(quantity=Fraction(2), unit=Unit.TEASPOON),
         ),
         (
             (
-                Quantity(quantity=Decimal(1), unit=Unit.UNKNOWN, unknown_unit="bag"),
-                Quantity(quantity=Decimal(1), unit=Unit.UNKNOWN, unknown_unit="bag"),
+                Quantity(quantity=Fraction(1), unit=Unit.UNKNOWN, unknown_unit="bag"),
+                Quantity(quantity=Fraction(1), unit=Unit.UNKNOWN, unknown_unit="bag"),
             ),
-            Quantity(quantity=Decimal(2), unit=Unit.UNKNOWN, unknown_unit="bag"),
+            Quantity(quantity=Fraction(2), unit=Unit.UNKNOWN, unknown_unit="bag"),
         ),
     ],
 )
@@ -148,9 +159,9 @@ def test_adding_quantities_with_diff_unknown_units() -> None:
     """
 
     with pytest.raises(IncompatibleUnit):
-        Quantity(quantity=Decimal(1), unit=Unit.UNKNOWN, unknown_unit="bag") + Quantity(
-            quantity=Decimal(2), unit=Unit.UNKNOWN, unknown_unit="thing"
-        )
+        Quantity(
+            quantity=Fraction(1), unit=Unit.UNKNOWN, unknown_unit="bag"
+        ) + Quantity(quantity=Fraction(2), unit=Unit.UNKNOWN, unknown_unit="thing")
 
 
 def test_adding_incompatible_units() -> None:
@@ -159,8 +170,8 @@ def test_adding_incompatible_units() -> None:
     error higher up.
     """
     with pytest.raises(IncompatibleUnit):
-        Quantity(quantity=Decimal(1), unit=Unit.TABLESPOON) + Quantity(
-            quantity=Decimal(2), unit=Unit.GRAM
+        Quantity(quantity=Fraction(1), unit=Unit.TABLESPOON) + Quantity(
+            quantity=Fraction(2), unit=Unit.GRAM
         )
 
 
@@ -300,3 +311,25 @@ def test_parse_quantity_name(ingredient: str, expected: tuple[str, str]) -> None
 )
 def test_parse_ingredient(ingredient: str, expected: IngredientResult) -> None:
     assert parse_ingredient(ingredient) == expected
+
+
+def test_parse_quantity_is_cached() -> None:
+    first = parse_quantity("1 tablespoon")
+    second = parse_quantity("1 tablespoon")
+
+    assert first is second
+    info = parse_quantity.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+    # cached values are shared between callers so they can't be mutable
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.quantity = Fraction(2)  # type: ignore [misc]
+
+
+def test_parse_cache_size_follows_setting(settings: Any) -> None:
+    parse_quantity("1 tablespoon")
+    settings.CUMIN_PARSE_CACHE_SIZE = 1
+    parse_quantity("1 tablespoon")
+    parse_quantity("2 tablespoons")
+    info = parse_quantity.cache_info()
+    assert (info.maxsize, info.currsize, info.misses) == (1, 1, 2)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+import pydantic
+from django.http import FileResponse, HttpResponseRedirect
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from typing_extensions import Literal
+
+from core.export.jobs import archive_name, download_url, local_path
+from core.models import ExportJob
+from core.request import AuthedRequest
+from core.serialization import RequestParams
+
+
+class CreateExportParams(RequestParams):
+    filetype: Literal["json", "yaml"]
+    include_uploads: bool = False
+
+
+class ExportJobResponse(pydantic.BaseModel):
+    id: int
+    status: str
+    filetype: str
+    include_uploads: bool
+    recipe_count: int
+    created: datetime
+    finished_at: Optional[datetime]
+    download_url: Optional[str]
+
+
+def serialize_job(request: AuthedRequest, job: ExportJob) -> ExportJobResponse:
+    return ExportJobResponse(
+        id=job.id,
+        status=job.status,
+        filetype=job.filetype,
+        include_uploads=job.include_uploads,
+        recipe_count=job.recipe_count,
+        created=job.created,
+        finished_at=job.finished_at,
+        download_url=(
+            request.build_absolute_uri(f"/api/v1/exports/{job.id}/download")
+            if job.status == ExportJob.COMPLETE
+            else None
+        ),
+    )
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def export_create_view(request: AuthedRequest) -> Response:
+    """
+    Queue an export of all the user's recipes, poll the job until it's
+    `complete` and then fetch its `download_url`.
+
+    An unfinished job for the same export is returned instead of queueing
+    another one.
+    """
+    params = CreateExportParams.parse_obj(request.data)
+    existing = (
+        ExportJob.objects.filter(
+            user=request.user,
+            filetype=params.filetype,
+            include_uploads=params.include_uploads,
+            status__in=(ExportJob.PENDING, ExportJob.RUNNING),
+        )
+        .order_by("created")
+        .first()
+    )
+    if existing is not None:
+        return Response(serialize_job(request, existing))
+    job = ExportJob.objects.create(
+        user=request.user,
+        filetype=params.filetype,
+        include_uploads=params.include_uploads,
+    )
+    return Response(serialize_job(request, job), status=status.HTTP_201_CREATED)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def export_detail_view(request: AuthedRequest, export_pk: int) -> Response:
+    job = get_object_or_404(ExportJob.objects.filter(user=request.user), pk=export_pk)
+    return Response(serialize_job(request, job))
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def export_download_view(
+    request: AuthedRequest, export_pk: int
+) -> FileResponse | HttpResponseRedirect | Response:
+    job = get_object_or_404(
+        ExportJob.objects.filter(user=request.user, status=ExportJob.COMPLETE),
+        pk=export_pk,
+    )
+    if job.storage == "s3":
+        return HttpResponseRedirect(download_url(job))
+    try:
+        archive = open(local_path(job), "rb")
+    except FileNotFoundError:
+        # expired, or written to another host's disk
+        return Response(
+            {"error": True, "message": "export is no longer available"},
+            status=status.HTTP_410_GONE,
+        )
+    return FileResponse(archive, as_attachment=True, filename=archive_name(job))
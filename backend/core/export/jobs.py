@@ -0,0 +1,244 @@
+"""
+Background recipe exports
+
+An `ExportJob` is created by the API and picked up by the
+`process_export_jobs` management command. The worker serializes the user's
+recipes a chunk at a time into a zip, optionally along with their note
+uploads, and stores it on local disk or in the upload bucket.
+
+Workers heartbeat while they build an archive, jobs left `running` without
+a heartbeat for `EXPORT_JOB_TIMEOUT_SEC` are picked up again. Each claim bumps
+the job's `attempt` and only the latest attempt can finish the job, an
+earlier worker that is still going stops at its next heartbeat. Finished
+jobs are deleted along with their archives after `EXPORT_RETENTION_DAYS`.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core import config
+from core.export.streams import export_chunks, export_queryset, stream_json, stream_yaml
+from core.models import ExportJob, Upload
+from core.models.upload import s3
+
+logger = logging.getLogger(__name__)
+
+# seconds between deletes of expired jobs by the worker
+PRUNE_INTERVAL_SEC = 60 * 60
+# seconds between heartbeats of a running job
+HEARTBEAT_INTERVAL_SEC = 60
+
+
+class JobLost(Exception):
+    """The job was claimed by another worker"""
+
+
+def archive_name(job: ExportJob) -> str:
+    return f"recipes-{job.created:%Y-%m-%d}.zip"
+
+
+def claim_next_job() -> Optional[ExportJob]:
+    """
+    Mark the oldest pending job as running, skipping jobs other workers
+    are claiming.
+
+    Running jobs without a recent heartbeat are claimed as well, their
+    worker was likely killed before it could finish them.
+    """
+    stale = timezone.now() - timedelta(seconds=settings.EXPORT_JOB_TIMEOUT_SEC)
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=ExportJob.PENDING)
+                | Q(status=ExportJob.RUNNING, heartbeat_at__lt=stale)
+            )
+            .order_by("created")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ExportJob.RUNNING
+        job.started_at = job.heartbeat_at = timezone.now()
+        job.attempt += 1
+        job.save()
+        return job
+
+
+def heartbeat(job: ExportJob) -> None:
+    """
+    Mark the job as still running, raising `JobLost` if another worker has
+    claimed it since.
+    """
+    now = timezone.now()
+    if (
+        job.heartbeat_at is not None
+        and (now - job.heartbeat_at).total_seconds() < HEARTBEAT_INTERVAL_SEC
+    ):
+        return
+    if not ExportJob.objects.filter(pk=job.pk, attempt=job.attempt).update(
+        heartbeat_at=now
+    ):
+        raise JobLost
+    job.heartbeat_at = now
+
+
+def finish_job(job: ExportJob) -> bool:
+    """Save the job's result unless another worker has claimed it since"""
+    return bool(
+        ExportJob.objects.filter(pk=job.pk, attempt=job.attempt).update(
+            status=job.status,
+            recipe_count=job.recipe_count,
+            storage=job.storage,
+            key=job.key,
+            error=job.error,
+            finished_at=job.finished_at,
+            modified=timezone.now(),
+        )
+    )
+
+
+def process_next_job() -> Optional[ExportJob]:
+    job = claim_next_job()
+    if job is None:
+        return None
+    try:
+        with tempfile.TemporaryFile() as archive:
+            job.recipe_count = write_archive(job, archive)
+            archive.seek(0)
+            heartbeat(job)
+            job.storage, job.key = store_archive(job, archive)
+    except JobLost:
+        logger.warning("export job %s was claimed by another worker", job.id)
+        return job
+    except Exception as e:
+        logger.exception("export job %s failed", job.id)
+        job.status = ExportJob.FAILED
+        job.error = str(e)
+    else:
+        job.status = ExportJob.COMPLETE
+    job.finished_at = timezone.now()
+    if not finish_job(job):
+        logger.warning("export job %s was claimed by another worker", job.id)
+        # the archive is only ever referenced by this attempt
+        delete_archive(job)
+    return job
+
+
+def write_archive(job: ExportJob, archive: IO[bytes]) -> int:
+    """Write the zip of the job's recipes, returning the number of recipes"""
+    recipe_ids: list[int] = []
+
+    def chunks() -> Iterator[list[dict[str, Any]]]:
+        for chunk in export_chunks(export_queryset(job.user)):
+            recipe_ids.extend(recipe["id"] for recipe in chunk)
+            heartbeat(job)
+            yield chunk
+
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        with zf.open(f"recipes.{job.filetype}", "w") as f:
+            stream = stream_json if job.filetype == "json" else stream_yaml
+            for part in stream(chunks()):
+                f.write(part.encode())
+        if job.include_uploads:
+            write_uploads(job, zf, recipe_ids)
+    return len(recipe_ids)
+
+
+def write_uploads(job: ExportJob, zf: zipfile.ZipFile, recipe_ids: list[int]) -> None:
+    uploads = Upload.objects.filter(
+        completed=True, note__recipe_id__in=recipe_ids
+    ).values_list("bucket", "key", "note__recipe_id")
+    for bucket, key, recipe_id in uploads.iterator():
+        heartbeat(job)
+        with zf.open(f"uploads/{recipe_id}/{key.replace('/', '-')}", "w") as f:
+            s3.download_fileobj(bucket, key, f)
+
+
+def store_archive(job: ExportJob, archive: IO[bytes]) -> tuple[str, str]:
+    # per attempt so a worker that lost the job never touches the archive of
+    # the one that claimed it
+    key = f"exports/{job.user_id}/{job.id}/{job.attempt}/{archive_name(job)}"
+    if settings.EXPORT_STORAGE == "s3":
+        s3.upload_fileobj(
+            archive,
+            config.STORAGE_BUCKET_NAME,
+            key,
+            ExtraArgs={"ContentType": "application/zip"},
+        )
+        return "s3", key
+    path = Path(settings.EXPORT_DIRECTORY) / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # written under a temporary name so a partial archive is never served
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+        try:
+            shutil.copyfileobj(archive, f)
+        except BaseException:
+            os.remove(f.name)
+            raise
+    os.replace(f.name, path)
+    return "local", key
+
+
+def download_url(job: ExportJob) -> str:
+    """Presigned url of an archive in the upload bucket"""
+    url: str = s3.generate_presigned_url(
+        "get_object",
+        Params={
+            "Bucket": config.STORAGE_BUCKET_NAME,
+            "Key": job.key,
+            "ResponseContentDisposition": f'attachment; filename="{archive_name(job)}"',
+        },
+    )
+    return url
+
+
+def local_path(job: ExportJob) -> str:
+    assert job.key is not None
+    return os.path.join(settings.EXPORT_DIRECTORY, job.key)
+
+
+def delete_archive(job: ExportJob) -> None:
+    if job.key is None:
+        return
+    if job.storage == "s3":
+        s3.delete_object(Bucket=config.STORAGE_BUCKET_NAME, Key=job.key)
+        return
+    try:
+        os.remove(local_path(job))
+    except FileNotFoundError:
+        pass
+
+
+def delete_expired_jobs() -> int:
+    """
+    Delete jobs that finished before the retention period along with their
+    archives, returning the number of jobs deleted.
+    """
+    expired = ExportJob.objects.filter(
+        status__in=(ExportJob.COMPLETE, ExportJob.FAILED),
+        finished_at__lt=timezone.now() - timedelta(days=settings.EXPORT_RETENTION_DAYS),
+    )
+    deleted: list[int] = []
+    for job in expired.iterator():
+        try:
+            delete_archive(job)
+        except Exception:
+            # keep the job so the archive is retried on the next prune
+            logger.exception("deleting archive of export job %s failed", job.id)
+        else:
+            deleted.append(job.id)
+    ExportJob.objects.filter(id__in=deleted).delete()
+    return len(deleted)
@@ -0,0 +1,72 @@
+"""
+Chunked serialization of recipe exports
+
+Shared by the streaming export views and the background export jobs.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+
+from core.export.serializers import RecipeExportSerializer
+from core.models import Recipe, User, user_and_team_recipes
+from core.response import dump_yaml_all
+
+# recipes loaded & serialized at a time while streaming a bulk export
+EXPORT_CHUNK_SIZE = 100
+
+
+def export_queryset(user: User) -> QuerySet[Recipe]:
+    return user_and_team_recipes(user).prefetch_related(
+        "owner", "step_set", "ingredient_set", "scheduledrecipe_set"
+    )
+
+
+def export_chunks(queryset: QuerySet[Recipe]) -> Iterator[list[dict[str, Any]]]:
+    """
+    Serialize the recipes a chunk at a time so memory stays flat however many
+    recipes are exported.
+
+    Ids come from a server side cursor, `prefetch_related` doesn't work with
+    `iterator()`, so each chunk of recipes is loaded separately.
+    """
+    ids = queryset.order_by("pk").values_list("pk", flat=True)
+    chunk: list[int] = []
+    for recipe_id in ids.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        chunk.append(recipe_id)
+        if len(chunk) == EXPORT_CHUNK_SIZE:
+            yield _serialize_chunk(queryset, chunk)
+            chunk = []
+    if chunk:
+        yield _serialize_chunk(queryset, chunk)
+
+
+def _serialize_chunk(
+    queryset: QuerySet[Recipe], ids: list[int]
+) -> list[dict[str, Any]]:
+    recipes = queryset.filter(pk__in=ids).order_by("pk")
+    return list(RecipeExportSerializer(recipes, many=True).data)
+
+
+def stream_json(chunks: Iterator[list[dict[str, Any]]]) -> Iterator[str]:
+    # same layout as `json.dumps(recipes, indent=2)`
+    yield "["
+    first = True
+    for chunk in chunks:
+        for recipe in chunk:
+            rendered = json.dumps(recipe, cls=DjangoJSONEncoder, indent=2)
+            yield ("\n  " if first else ",\n  ") + rendered.replace("\n", "\n  ")
+            first = False
+    yield "]" if first else "\n]"
+
+
+def stream_yaml(chunks: Iterator[list[dict[str, Any]]]) -> Iterator[str]:
+    first = True
+    for chunk in chunks:
+        for recipe in chunk:
+            # a document per recipe, same as `yaml.dump_all` would write
+            yield dump_yaml_all([recipe], explicit_start=not first)
+            first = False
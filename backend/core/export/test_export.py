@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import json
+
 import pytest
 import yaml
 from django.test import Client
 
+from core.export import streams
 from core.models import Recipe, User
 
 pytestmark = pytest.mark.django_db
@@ -23,11 +26,28 @@ def test_bulk_export_json(
     c.force_login(user)
     res = c.get(url)
     assert res.status_code == 200
-    recipes = res.json()
+    recipes = json.loads(res.getvalue())
     assert len(recipes) == 2, "user should have two recipes"
     recipe2.move_to(user2)
     res = c.get(url)
-    assert len(res.json()) == 1, "user should only have their recipes"
+    assert len(json.loads(res.getvalue())) == 1, "user should only have their recipes"
+
+
+def test_bulk_export_is_chunked(
+    c: Client, monkeypatch: pytest.MonkeyPatch, user: User, recipe: Recipe
+) -> None:
+    monkeypatch.setattr(streams, "EXPORT_CHUNK_SIZE", 2)
+    for _ in range(4):
+        recipe.duplicate(actor=user)
+    c.force_login(user)
+    res = c.get("/recipes.json")
+    assert res.streaming
+    recipes = json.loads(res.getvalue())
+    assert [r["id"] for r in recipes] == sorted(r["id"] for r in recipes)
+    assert len(recipes) == 5
+
+    res = c.get("/recipes.yaml")
+    assert len(list(yaml.safe_load_all(res.getvalue()))) == 5
 
 
 @pytest.mark.parametrize("filetype", ["yaml", "yml"])
@@ -46,15 +66,16 @@ def test_bulk_export_yaml(
     c.force_login(user)
     res = c.get(url)
     assert res.status_code == 200
-    assert "!!python/" not in res.content.decode(
+    content = res.getvalue()
+    assert "!!python/" not in content.decode(
         "utf-8"
     ), "we don't want python objects to be serialized"
-    recipes = list(yaml.safe_load_all(res.content))
+    recipes = list(yaml.safe_load_all(content))
     assert len(recipes) == 2, "user should have two recipes"
     recipe2.move_to(user2)
     res = c.get(url)
     assert (
-        len(list(yaml.safe_load_all(res.content))) == 1
+        len(list(yaml.safe_load_all(res.getvalue()))) == 1
     ), "user should only have their recipes"
 
 
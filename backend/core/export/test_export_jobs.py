@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+from datetime import timedelta
+from pathlib import Path
+from typing import IO
+
+import pytest
+import yaml
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.export import jobs
+from core.export.jobs import delete_expired_jobs, process_next_job
+from core.models import ExportJob, Note, Recipe, Upload, User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def export_directory(settings, tmp_path: Path) -> Path:
+    settings.EXPORT_STORAGE = "local"
+    settings.EXPORT_DIRECTORY = str(tmp_path)
+    return tmp_path
+
+
+def test_export_job(
+    client: APIClient, user: User, user2: User, recipe: Recipe, recipe2: Recipe
+) -> None:
+    client.force_authenticate(user)
+    res = client.post("/api/v1/exports/", {"filetype": "json"})
+    assert res.status_code == 201
+    job_id = res.json()["id"]
+    assert res.json()["status"] == "pending"
+    assert res.json()["download_url"] is None
+
+    job = process_next_job()
+    assert job is not None and job.id == job_id
+    assert process_next_job() is None, "jobs should only be processed once"
+
+    res = client.get(f"/api/v1/exports/{job_id}/")
+    assert res.json()["status"] == "complete"
+    assert res.json()["recipe_count"] == 2
+    assert res.json()["download_url"].endswith(f"/api/v1/exports/{job_id}/download")
+
+    res = client.get(f"/api/v1/exports/{job_id}/download")
+    assert res.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(res.getvalue())) as zf:
+        recipes = json.loads(zf.read("recipes.json"))
+    assert sorted(r["id"] for r in recipes) == sorted([recipe.id, recipe2.id])
+
+    client.force_authenticate(user2)
+    assert client.get(f"/api/v1/exports/{job_id}/").status_code == 404
+    assert client.get(f"/api/v1/exports/{job_id}/download").status_code == 404
+
+
+def test_export_download_missing_archive(client: APIClient, user: User) -> None:
+    job = ExportJob.objects.create(user=user, filetype="json")
+    process_next_job()
+    job.refresh_from_db()
+    Path(jobs.local_path(job)).unlink()
+
+    client.force_authenticate(user)
+    res = client.get(f"/api/v1/exports/{job.id}/download")
+    assert res.status_code == 410
+
+
+def test_export_job_with_uploads(
+    monkeypatch: pytest.MonkeyPatch, user: User, recipe: Recipe
+) -> None:
+    def download_fileobj(bucket: str, key: str, f: IO[bytes]) -> None:
+        f.write(f"{bucket}:{key}".encode())
+
+    monkeypatch.setattr(jobs.s3, "download_fileobj", download_fileobj)
+    note = Note.objects.filter(recipe=recipe).first()
+    Upload.objects.create(
+        created_by=user, bucket="bucket", key="1/abc/pie.jpg", completed=True, note=note
+    )
+    Upload.objects.create(
+        created_by=user, bucket="bucket", key="1/def/draft.jpg", completed=False
+    )
+    job = ExportJob.objects.create(user=user, filetype="yaml", include_uploads=True)
+
+    process_next_job()
+    job.refresh_from_db()
+    assert job.status == ExportJob.COMPLETE
+    with zipfile.ZipFile(jobs.local_path(job)) as zf:
+        assert [r["name"] for r in yaml.safe_load_all(zf.read("recipes.yaml"))] == [
+            recipe.name
+        ]
+        assert zf.read(f"uploads/{recipe.id}/1-abc-pie.jpg") == b"bucket:1/abc/pie.jpg"
+        assert len(zf.namelist()) == 2
+
+
+def test_failed_export_job(monkeypatch: pytest.MonkeyPatch, user: User) -> None:
+    def store_archive(job: ExportJob, archive: IO[bytes]) -> tuple[str, str]:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(jobs, "store_archive", store_archive)
+    job = ExportJob.objects.create(user=user, filetype="json")
+    process_next_job()
+    job.refresh_from_db()
+    assert job.status == ExportJob.FAILED
+    assert job.error == "disk full"
+    assert job.finished_at is not None
+
+
+def test_export_reuses_unfinished_job(client: APIClient, user: User) -> None:
+    client.force_authenticate(user)
+    res = client.post("/api/v1/exports/", {"filetype": "json"})
+    assert res.status_code == 201
+    job_id = res.json()["id"]
+
+    res = client.post("/api/v1/exports/", {"filetype": "json"})
+    assert res.status_code == 200
+    assert res.json()["id"] == job_id
+
+    res = client.post("/api/v1/exports/", {"filetype": "yaml"})
+    assert res.status_code == 201
+    assert res.json()["id"] != job_id
+
+    process_next_job()
+    process_next_job()
+    res = client.post("/api/v1/exports/", {"filetype": "json"})
+    assert res.status_code == 201, "finished jobs shouldn't be reused"
+    assert ExportJob.objects.filter(user=user).count() == 3
+
+
+def test_stale_running_job_is_requeued(settings, user: User) -> None:
+    settings.EXPORT_JOB_TIMEOUT_SEC = 60
+    running = ExportJob.objects.create(
+        user=user,
+        filetype="json",
+        status=ExportJob.RUNNING,
+        started_at=timezone.now() - timedelta(hours=1),
+        heartbeat_at=timezone.now(),
+        attempt=1,
+    )
+    assert process_next_job() is None, "jobs with a heartbeat are still running"
+
+    ExportJob.objects.filter(id=running.id).update(
+        heartbeat_at=timezone.now() - timedelta(seconds=61)
+    )
+    job = process_next_job()
+    assert job is not None and job.id == running.id
+    job.refresh_from_db()
+    assert job.status == ExportJob.COMPLETE
+    assert job.attempt == 2
+    assert Path(jobs.local_path(job)).exists()
+
+
+def test_lost_job_is_left_to_its_new_worker(
+    monkeypatch: pytest.MonkeyPatch, export_directory: Path, user: User, recipe: Recipe
+) -> None:
+    monkeypatch.setattr(jobs, "HEARTBEAT_INTERVAL_SEC", 0)
+    write_archive = jobs.write_archive
+    store_archive = jobs.store_archive
+
+    def reclaim(job: ExportJob) -> None:
+        ExportJob.objects.filter(pk=job.pk).update(attempt=F("attempt") + 1)
+
+    def write_archive_then_reclaim(job: ExportJob, archive: IO[bytes]) -> int:
+        reclaim(job)
+        return write_archive(job, archive)
+
+    # claimed while building, stops at the next heartbeat
+    monkeypatch.setattr(jobs, "write_archive", write_archive_then_reclaim)
+    job = ExportJob.objects.create(user=user, filetype="json")
+    process_next_job()
+    job.refresh_from_db()
+    assert job.status == ExportJob.RUNNING
+    assert job.finished_at is None
+    assert list(export_directory.rglob("*.zip")) == []
+
+    def store_archive_then_reclaim(
+        job: ExportJob, archive: IO[bytes]
+    ) -> tuple[str, str]:
+        stored = store_archive(job, archive)
+        reclaim(job)
+        return stored
+
+    # claimed after the archive was stored, which is removed again
+    monkeypatch.setattr(jobs, "write_archive", write_archive)
+    monkeypatch.setattr(jobs, "store_archive", store_archive_then_reclaim)
+    job = ExportJob.objects.create(user=user, filetype="json")
+    process_next_job()
+    job.refresh_from_db()
+    assert job.status == ExportJob.RUNNING
+    assert [p for p in export_directory.rglob("*") if p.is_file()] == []
+
+
+def test_delete_expired_jobs(settings, user: User, recipe: Recipe) -> None:
+    settings.EXPORT_RETENTION_DAYS = 7
+    expired = ExportJob.objects.create(user=user, filetype="json")
+    process_next_job()
+    recent = ExportJob.objects.create(user=user, filetype="json")
+    process_next_job()
+    pending = ExportJob.objects.create(user=user, filetype="json")
+    ExportJob.objects.filter(id=expired.id).update(
+        finished_at=timezone.now() - timedelta(days=8)
+    )
+    expired.refresh_from_db()
+    recent.refresh_from_db()
+    assert Path(jobs.local_path(expired)).exists()
+
+    assert delete_expired_jobs() == 1
+    assert not Path(jobs.local_path(expired)).exists()
+    assert Path(jobs.local_path(recent)).exists()
+    assert set(ExportJob.objects.values_list("id", flat=True)) == {
+        recent.id,
+        pending.id,
+    }
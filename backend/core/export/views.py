@@ -1,12 +1,14 @@
+from __future__ import annotations
+
 from typing import Optional
 
 from django.contrib.auth.decorators import login_required
-from django.http import Http404, JsonResponse
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.views.decorators.http import require_http_methods
 
 from core.export.serializers import RecipeExportSerializer
-from core.models import user_and_team_recipes
+from core.export.streams import export_chunks, export_queryset, stream_json, stream_yaml
 from core.request import AuthedRequest
 from core.response import YamlResponse
 
@@ -15,22 +17,21 @@ from core.response import YamlResponse
 @login_required(login_url="/login/")
 def export_recipes(request: AuthedRequest, filetype: str, pk: Optional[str] = None):
 
-    queryset = user_and_team_recipes(request.user).prefetch_related(
-        "owner", "step_set", "ingredient_set", "scheduledrecipe_set"
-    )
-
-    if pk is not None:
-        queryset = get_object_or_404(queryset, pk=pk)  # type: ignore[assignment]
-
-    many = pk is None
+    queryset = export_queryset(request.user)
 
-    recipes = RecipeExportSerializer(queryset, many=many).data
+    if filetype not in ("yaml", "yml", "json"):
+        raise Http404("unknown export filetype")
 
-    if filetype in ("yaml", "yml"):
-        return YamlResponse(recipes)
+    if pk is not None:
+        recipe = RecipeExportSerializer(get_object_or_404(queryset, pk=pk)).data
+        if filetype == "json":
+            return JsonResponse(recipe, json_dumps_params={"indent": 2})
+        return YamlResponse(recipe)
 
     if filetype == "json":
-        # we need safe=False so we can serializer both lists and dicts
-        return JsonResponse(recipes, json_dumps_params={"indent": 2}, safe=False)
-
-    raise Http404("unknown export filetype")
+        return StreamingHttpResponse(
+            stream_json(export_chunks(queryset)), content_type="application/json"
+        )
+    return StreamingHttpResponse(
+        stream_yaml(export_chunks(queryset)), content_type="text/x-yaml"
+    )
@@ -1,8 +1,11 @@
-from datetime import date, datetime
-from email.utils import parsedate_to_datetime
+import time
+from datetime import date
 from urllib.parse import urlparse
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -87,7 +90,7 @@ def test_ical_view_with_correct_id(
     res = client.get(url)
     assert res.status_code == status.HTTP_200_OK
     assert res["Content-Type"] == "text/calendar"
-    assert isinstance(parsedate_to_datetime(res["Last-Modified"]), datetime)
+    assert "Last-Modified" not in res
 
     assert omit_entry_ids(res.content.decode()) == (
         "BEGIN:VCALENDAR\r\n"
@@ -208,3 +211,51 @@ def test_get_ical_view_404_when_disabled(
     membership.save()
     res = client.get(url, HTTP_ACCEPT="text/calendar")
     assert res.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_ical_view_conditional_get(
+    client: APIClient, user: User, recipe: Recipe, team: Team
+) -> None:
+    """
+    Unchanged calendars should be answered with a 304 from a single query,
+    and changes to the schedule should invalidate the cached calendar.
+    """
+    scheduled = ScheduledRecipe.objects.create(
+        recipe=recipe, team=team, on=date(1976, 7, 6), count=1
+    )
+    membership = Membership.objects.get(user=user, team=team)
+    membership.calendar_sync_enabled = True
+    membership.save()
+    url = f"/t/{team.id}/ical/{membership.calendar_secret_key}/schedule.ics"
+    res = client.get(url)
+    assert res.status_code == status.HTTP_200_OK
+    etag = res["ETag"]
+    assert "Last-Modified" not in res
+
+    with CaptureQueriesContext(connection) as queries:
+        res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == status.HTTP_304_NOT_MODIFIED
+    assert len(queries) == 1
+
+    with CaptureQueriesContext(connection) as queries:
+        res = client.get(url)
+    assert res.status_code == status.HTTP_200_OK
+    # the lookup & the cache read, no events
+    assert len(queries) == 2, "rendered calendar should be cached"
+
+    recipe.name = "Pie"
+    recipe.save()
+    res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == status.HTTP_200_OK
+    assert "SUMMARY:Pie" in res.content.decode()
+    etag = res["ETag"]
+
+    scheduled.delete()
+    res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == status.HTTP_200_OK
+    assert "VEVENT" not in res.content.decode()
+
+    # deletes don't move any timestamp, so dates can't be used to validate
+    res = client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(time.time()))
+    assert res.status_code == status.HTTP_200_OK
+    assert "VEVENT" not in res.content.decode()
@@ -1,37 +1,56 @@
-from datetime import timedelta
-from typing import Optional
+from __future__ import annotations
 
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from django.core.cache import cache
+from django.db.models import Count, Max, OuterRef, QuerySet, Subquery
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.utils.http import http_date
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django.utils.text import slugify
 from django.views.decorators.http import require_http_methods
 
 from core.ical.utils import create_calendar, create_event
 from core.models import Membership, ScheduledRecipe, Team
 
+ICAL_CACHE_TIMEOUT_SEC = 60 * 60 * 24
 
-@require_http_methods(["GET", "HEAD"])
-def get_ical_view(request: HttpRequest, team_id: int, ical_id: str) -> HttpResponse:
+
+def with_schedule_stats(
+    queryset: QuerySet[Any], *, team_field: str, since: datetime
+) -> QuerySet[Any]:
     """
-    Return an icalendar formatted string of scheduled recipes.
+    Annotate what the team's calendar is built from, so it can be checked
+    without loading any events.
 
-    We limit the recipes to the last year to avoid having the response size
-    gradually increasing & time.
+    Deletes change the count, while creates & edits, including edits to the
+    scheduled recipes, change one of the timestamps.
     """
-    membership = Membership.objects.filter(
-        team_id=team_id, calendar_secret_key=ical_id, calendar_sync_enabled=True
-    ).first()
-    if membership is not None:
-        team = membership.team
-    else:
-        # deprecated url
-        team = get_object_or_404(Team, id=team_id, ical_id=ical_id)
+    scheduled = (
+        ScheduledRecipe.objects.filter(team=OuterRef(team_field))
+        .order_by()
+        .values("team")
+    )
+    recent = scheduled.filter(created__gte=since)
+    return queryset.annotate(
+        scheduled_count=Subquery(recent.annotate(n=Count("id")).values("n")),
+        scheduled_modified=Subquery(
+            scheduled.annotate(latest=Max("modified")).values("latest")
+        ),
+        recipe_modified=Subquery(
+            recent.annotate(latest=Max("recipe__modified")).values("latest")
+        ),
+    )
 
+
+def render_calendar(team: Team, since: datetime) -> bytes:
     scheduled_recipes = (
         ScheduledRecipe.objects.filter(team=team)
-        .filter(created__gte=timezone.now() - timedelta(weeks=52))
+        .filter(created__gte=since)
         .select_related("recipe")
         .order_by("on")
     )
@@ -58,16 +77,68 @@ def get_ical_view(request: HttpRequest, team_id: int, ical_id: str) -> HttpRespo
         description=f"Recipe Yak Schedule for Team {team.name}",
         events=events,
     )
+    ical: bytes = cal.to_ical()
+    return ical
 
-    last_modified_scheduled: Optional[ScheduledRecipe] = (
-        ScheduledRecipe.objects.filter(team=team).order_by("-modified").first()
-    )
 
-    response = HttpResponse()
-    response["Content-Type"] = "text/calendar"
-    if last_modified_scheduled is not None:
-        response["Last-Modified"] = http_date(
-            last_modified_scheduled.modified.timestamp()
+@require_http_methods(["GET", "HEAD"])
+def get_ical_view(request: HttpRequest, team_id: int, ical_id: str) -> HttpResponse:
+    """
+    Return an icalendar formatted string of scheduled recipes.
+
+    We limit the recipes to the last year to avoid having the response size
+    gradually increasing & time.
+
+    Calendar apps poll this every few minutes, so unchanged calendars are
+    answered from the ETag of a single lookup, and rendered calendars are
+    cached under that ETag.
+
+    There's no Last-Modified since deletes & events leaving the window don't
+    move any timestamp, If-Modified-Since would answer 304 for those.
+    """
+    since = timezone.now() - timedelta(weeks=52)
+    membership = with_schedule_stats(
+        Membership.objects.filter(
+            team_id=team_id,
+            calendar_secret_key=ical_id,
+            calendar_sync_enabled=True,
+        ).select_related("team"),
+        team_field="team_id",
+        since=since,
+    ).first()
+    stats: Any
+    if membership is not None:
+        stats = membership
+        team = membership.team
+    else:
+        # deprecated url
+        team = stats = get_object_or_404(
+            with_schedule_stats(
+                Team.objects.filter(ical_id=ical_id), team_field="pk", since=since
+            ),
+            id=team_id,
+        )
+
+    fingerprint = repr(
+        (
+            team.id,
+            team.name,
+            stats.scheduled_count,
+            stats.scheduled_modified,
+            stats.recipe_modified,
         )
-    response.content = cal.to_ical()
+    )
+    etag = quote_etag(hashlib.sha256(fingerprint.encode()).hexdigest())
+
+    response = get_conditional_response(request, etag=etag)  # type: ignore [arg-type]
+    if response is None:
+        cache_key = f"ical:{team.id}:{etag}"
+        content: Optional[bytes] = cache.get(cache_key)
+        if content is None:
+            content = render_calendar(team, since)
+            cache.set(cache_key, content, ICAL_CACHE_TIMEOUT_SEC)
+        response = HttpResponse(content)
+        response["Content-Type"] = "text/calendar"
+
+    response["ETag"] = etag
     return response
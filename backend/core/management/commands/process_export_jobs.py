@@ -0,0 +1,42 @@
+import time
+from typing import Optional
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.export.jobs import PRUNE_INTERVAL_SEC, delete_expired_jobs, process_next_job
+
+
+class Command(BaseCommand):
+    help = "Build queued recipe export archives, see `core.export.jobs`."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="exit once no jobs are pending instead of polling",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="seconds to wait between checks for new jobs",
+        )
+
+    def handle(self, *args, once: bool, poll_interval: float, **options):
+        last_prune: Optional[float] = None
+        while True:
+            now = time.monotonic()
+            if last_prune is None or now - last_prune >= PRUNE_INTERVAL_SEC:
+                last_prune = now
+                deleted = delete_expired_jobs()
+                if deleted:
+                    self.stdout.write(f"deleted {deleted} expired export jobs")
+            job = process_next_job()
+            close_old_connections()
+            if job is not None:
+                self.stdout.write(f"export job {job.id}: {job.status}")
+                continue
+            if once:
+                return
+            time.sleep(poll_interval)
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.16 on 2026-10-17 12:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0102_rename_recipe_team_user__deprecated_recipe_team"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CategoryOverride",
+            fields=[
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("name", models.TextField()),
+                ("category", models.TextField()),
+                (
+                    "team",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="core.team"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "category_override",
+                "unique_together": {("team", "name")},
+            },
+        ),
+    ]
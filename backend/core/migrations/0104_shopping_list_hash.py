@@ -0,0 +1,28 @@
+# Generated by Django 3.2.16 on 2026-10-17 12:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0103_category_override"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shoppinglist",
+            name="ingredients_hash",
+            field=models.TextField(
+                help_text="sha256 of `ingredients`, identical lists are only stored once.",
+                null=True,
+                unique=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="shoppinglist",
+            index=models.Index(
+                fields=["created"], name="core_shoppi_created_44ec76_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2.16 on 2026-10-17 12:48
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("core", "0104_shopping_list_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeletionLog",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("kind", models.CharField(max_length=255)),
+                (
+                    "deleted_id",
+                    models.IntegerField(help_text="pk of the deleted object."),
+                ),
+                ("recipe_id", models.IntegerField()),
+                ("owner_object_id", models.PositiveIntegerField(null=True)),
+                (
+                    "owner_content_type",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "deletion_log",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="deletionlog",
+            index=models.Index(
+                fields=["created"], name="deletion_lo_created_42a70f_idx"
+            ),
+        ),
+    ]
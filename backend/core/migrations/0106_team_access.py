@@ -0,0 +1,28 @@
+# Generated by Django 3.2.16 on 2026-10-17 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0105_deletion_log"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="team_access_version",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="bumped whenever the user's memberships change, see `user_active_team_ids`.",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recipe",
+            index=models.Index(
+                fields=["content_type", "object_id"],
+                name="core_recipe_content_30e737_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 3.2.16 on 2026-10-17 13:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0106_team_access"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportJob",
+            fields=[
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                (
+                    "filetype",
+                    models.CharField(
+                        choices=[("json", "json"), ("yaml", "yaml")], max_length=4
+                    ),
+                ),
+                ("include_uploads", models.BooleanField(default=False)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "pending"),
+                            ("running", "running"),
+                            ("complete", "complete"),
+                            ("failed", "failed"),
+                        ],
+                        default="pending",
+                        max_length=8,
+                    ),
+                ),
+                (
+                    "storage",
+                    models.TextField(
+                        help_text="`local` or `s3`, where the archive was written.",
+                        null=True,
+                    ),
+                ),
+                (
+                    "key",
+                    models.TextField(
+                        help_text="path of the archive in `storage`.", null=True
+                    ),
+                ),
+                ("recipe_count", models.IntegerField(default=0)),
+                ("error", models.TextField(null=True)),
+                ("started_at", models.DateTimeField(null=True)),
+                ("finished_at", models.DateTimeField(null=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "export_job",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="exportjob",
+            index=models.Index(
+                fields=["status", "created"], name="export_job_status_47cc8a_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Table for the default `DatabaseCache`, same as `manage.py createcachetable`
+    """
+
+    dependencies = [("core", "0107_export_job")]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE TABLE "django_cache" (
+                "cache_key" varchar(255) NOT NULL PRIMARY KEY,
+                "value" text NOT NULL,
+                "expires" timestamp with time zone NOT NULL
+            );
+            CREATE INDEX "django_cache_expires" ON "django_cache" ("expires");
+            """,
+            """
+            DROP TABLE "django_cache";
+            """,
+        )
+    ]
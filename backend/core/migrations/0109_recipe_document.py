@@ -0,0 +1,49 @@
+# Generated by Django 3.2.16 on 2026-10-17 13:35
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0108_cache_table"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeDocument",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("kind", models.CharField(max_length=255)),
+                ("fingerprint", models.CharField(max_length=64)),
+                ("document", models.TextField(help_text="JSON of the response.")),
+                (
+                    "recipe",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="core.recipe"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "recipe_document",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="recipedocument",
+            constraint=models.UniqueConstraint(
+                fields=("recipe", "kind"), name="one_document_per_recipe_kind"
+            ),
+        ),
+    ]
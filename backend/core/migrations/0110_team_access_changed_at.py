@@ -0,0 +1,21 @@
+# Generated by Django 3.2.16 on 2026-10-17 13:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0109_recipe_document"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="team_access_changed_at",
+            field=models.DateTimeField(
+                help_text="when `team_access_version` was last bumped, recipe list syncs from before it are rejected.",
+                null=True,
+            ),
+        ),
+    ]
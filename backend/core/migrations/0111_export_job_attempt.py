@@ -0,0 +1,29 @@
+# Generated by Django 3.2.16 on 2026-10-17 13:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0110_team_access_changed_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportjob",
+            name="attempt",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="bumped whenever a worker claims the job, only the latest claim can finish it.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="exportjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(
+                help_text="updated by the worker while it builds the archive.",
+                null=True,
+            ),
+        ),
+    ]
@@ -1,6 +1,12 @@
+from __future__ import annotations
+
+from django.core.cache import caches
 from django.db.models import Q, QuerySet
 from django.shortcuts import get_object_or_404
 
+from core.models.category_override import CategoryOverride  # noqa: F401
+from core.models.deletion_log import DeletionLog  # noqa: F401
+from core.models.export_job import ExportJob  # noqa: F401
 from core.models.ingredient import Ingredient  # noqa: F401
 from core.models.invite import Invite  # noqa: F401
 from core.models.membership import Membership, get_random_ical_id  # noqa: F401
@@ -8,6 +14,7 @@ from core.models.note import Note
 from core.models.reaction import Reaction  # noqa: F401
 from core.models.recipe import Recipe  # noqa: F401
 from core.models.recipe_change import ChangeType, RecipeChange  # noqa: F401
+from core.models.recipe_document import RecipeDocument  # noqa: F401
 from core.models.recipe_view import RecipeView  # noqa: F401
 from core.models.scheduled_recipe import ScheduledRecipe  # noqa: F401
 from core.models.scrape import Scrape  # noqa: F401
@@ -19,35 +26,69 @@ from core.models.timeline_event import TimelineEvent  # noqa: F401
 from core.models.upload import Upload  # noqa: F401
 from core.models.user import User  # noqa: F401
 
+TEAM_IDS_CACHE_TIMEOUT_SEC = 60 * 60 * 24
+
+
+def user_active_team_ids(user: User) -> list[int]:
+    """
+    Ids of the teams the user is an active member of.
+
+    Cached under the user's `team_access_version`, which membership changes
+    bump, so a stale entry is never read. The cache is per-process since a
+    shared one would cost the same round trip as the query.
+    """
+    key = f"user-team-ids:{user.id}:{user.team_access_version}"
+    team_ids: list[int] | None = caches["local"].get(key)
+    if team_ids is None:
+        team_ids = list(
+            user.membership_set.filter(is_active=True).values_list("team_id", flat=True)
+        )
+        caches["local"].set(key, team_ids, TEAM_IDS_CACHE_TIMEOUT_SEC)
+    return team_ids
+
 
-def user_active_team_ids(user):
-    return user.membership_set.filter(is_active=True).values_list("team")
+# everything `RecipeSerializer` reads, for callers that serialize full recipes
+FULL_RECIPE_PREFETCHES = (
+    "owner",
+    "step_set",
+    "ingredient_set",
+    "scheduledrecipe_set",
+    "notes",
+    "notes__created_by",
+    "notes__last_modified_by",
+    "notes__uploads",
+    "notes__reactions",
+    "notes__reactions__created_by",
+    "timelineevent_set",
+    "timelineevent_set__created_by",
+    "section_set",
+)
 
 
 def user_and_team_recipes(user: User) -> QuerySet[Recipe]:
+    """
+    Recipes the user can access, without any prefetching.
+
+    Use for access checks and subqueries, see `user_and_team_full_recipes`
+    for serializing.
+    """
     return Recipe.objects.filter(
         Q(owner_user=user) | Q(owner_team__in=user_active_team_ids(user))
-    ).prefetch_related(
-        "owner",
-        "step_set",
-        "ingredient_set",
-        "scheduledrecipe_set",
-        "notes",
-        "notes__created_by",
-        "notes__last_modified_by",
-        "notes__uploads",
-        "notes__reactions",
-        "notes__reactions__created_by",
-        "timelineevent_set",
-        "timelineevent_set__created_by",
-        "section_set",
     )
 
 
+def user_and_team_full_recipes(user: User) -> QuerySet[Recipe]:
+    return user_and_team_recipes(user).prefetch_related(*FULL_RECIPE_PREFETCHES)
+
+
 def user_and_team_recipe_or_404(user: User, recipe_pk: str) -> Recipe:
     return get_object_or_404(user_and_team_recipes(user), pk=recipe_pk)
 
 
+def user_and_team_full_recipe_or_404(user: User, recipe_pk: str) -> Recipe:
+    return get_object_or_404(user_and_team_full_recipes(user), pk=recipe_pk)
+
+
 def user_and_team_ingredients(user: User) -> QuerySet[Ingredient]:
     return Ingredient.objects.filter(recipe__in=user_and_team_recipes(user))
 
@@ -0,0 +1,29 @@
+from typing import TYPE_CHECKING
+
+from django.db import models
+from django.db.models.manager import Manager
+
+from core.models.base import CommonInfo
+
+if TYPE_CHECKING:
+    from core.models import Team  # noqa: F401
+
+
+class CategoryOverride(CommonInfo):
+    """
+    Team specific department for an ingredient name
+
+    Takes precedence over the built-in `core.cumin.cat.DEPARTMENT_MAPPING` when
+    categorizing the team's shopping list.
+    """
+
+    id = models.AutoField(primary_key=True)
+    team = models.ForeignKey["Team"]("Team", on_delete=models.CASCADE)
+    name = models.TextField()
+    category = models.TextField()
+
+    objects = Manager["CategoryOverride"]()
+
+    class Meta:
+        db_table = "category_override"
+        unique_together = (("team", "name"),)
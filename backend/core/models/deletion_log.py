@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.db.models import QuerySet
+from django.db.models.manager import Manager
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.models.base import CommonInfo
+
+PRUNE_INTERVAL_SEC = 60 * 60
+
+
+class DeletionLog(CommonInfo):
+    """
+    Tombstones for recipes & their children, used by the recipe list's sync
+    mode (`?since=`) to tell clients what to remove.
+
+    A `recipe` row is written when a recipe is deleted or moved away from its
+    owner and records that previous owner. Rows for child objects, written by
+    `delete_and_log`, mark their recipe as changed since the child is no longer
+    in the recipe's payload. Rows are kept for `SYNC_RETENTION_DAYS`.
+    """
+
+    RECIPE = "recipe"
+    INGREDIENT = "ingredient"
+    STEP = "step"
+    SECTION = "section"
+    NOTE = "note"
+    REACTION = "reaction"
+    SCHEDULED_RECIPE = "scheduled_recipe"
+
+    kind = models.CharField(max_length=255)
+    deleted_id = models.IntegerField(help_text="pk of the deleted object.")
+    # not a foreign key, the recipe is usually gone as well
+    recipe_id = models.IntegerField()
+    owner_content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, null=True
+    )
+    owner_object_id = models.PositiveIntegerField(null=True)
+
+    objects = Manager["DeletionLog"]()
+
+    class Meta:
+        db_table = "deletion_log"
+        indexes = [models.Index(fields=["created"])]
+
+
+@receiver(post_delete, sender="core.Recipe", dispatch_uid="log_recipe_deletion")
+def log_recipe_deletion(sender: Any, instance: Any, **kwargs: Any) -> None:
+    DeletionLog.objects.create(
+        kind=DeletionLog.RECIPE,
+        deleted_id=instance.id,
+        recipe_id=instance.id,
+        owner_content_type_id=instance.content_type_id,
+        owner_object_id=instance.object_id,
+    )
+    prune_deletion_log()
+
+
+def delete_and_log(kind: str, queryset: QuerySet[Any], recipe_field: str) -> None:
+    """
+    Delete the children in `queryset` and log them with a single insert.
+
+    Children deleted along with their recipe aren't logged, the recipe's
+    tombstone is enough for clients to drop them.
+    """
+    with transaction.atomic():
+        rows = list(queryset.values_list("id", recipe_field))
+        queryset.delete()
+        DeletionLog.objects.bulk_create(
+            DeletionLog(kind=kind, deleted_id=deleted_id, recipe_id=recipe_id)
+            for deleted_id, recipe_id in rows
+        )
+    prune_deletion_log()
+
+
+_last_prune: float | None = None
+
+
+def prune_deletion_log() -> None:
+    """
+    Drop tombstones older than any `since` the recipe list accepts, at most
+    once every `PRUNE_INTERVAL_SEC` per process.
+    """
+    global _last_prune
+    now = time.monotonic()
+    if _last_prune is not None and now - _last_prune < PRUNE_INTERVAL_SEC:
+        return
+    _last_prune = now
+    DeletionLog.objects.filter(
+        created__lt=timezone.now() - timedelta(days=settings.SYNC_RETENTION_DAYS)
+    ).delete()
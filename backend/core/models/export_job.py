@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.db import models
+from django.db.models.manager import Manager
+from typing_extensions import Literal
+
+from core.models.base import CommonInfo
+
+if TYPE_CHECKING:
+    from core.models import User  # noqa: F401
+
+
+class ExportJob(CommonInfo):
+    """
+    Export of all of a user's recipes, built into a zip by the
+    `process_export_jobs` worker so large exports don't tie up web workers.
+    """
+
+    PENDING: Literal["pending"] = "pending"
+    RUNNING: Literal["running"] = "running"
+    COMPLETE: Literal["complete"] = "complete"
+    FAILED: Literal["failed"] = "failed"
+
+    STATUS_CHOICES = (
+        (PENDING, PENDING),
+        (RUNNING, RUNNING),
+        (COMPLETE, COMPLETE),
+        (FAILED, FAILED),
+    )
+
+    FILETYPE_CHOICES = (("json", "json"), ("yaml", "yaml"))
+
+    id = models.AutoField(primary_key=True)
+    user = models.ForeignKey["User"]("User", on_delete=models.CASCADE)
+    filetype = models.CharField(max_length=4, choices=FILETYPE_CHOICES)
+    include_uploads = models.BooleanField(default=False)
+    status = models.CharField(max_length=8, choices=STATUS_CHOICES, default=PENDING)
+    storage = models.TextField(
+        null=True, help_text="`local` or `s3`, where the archive was written."
+    )
+    key = models.TextField(null=True, help_text="path of the archive in `storage`.")
+    recipe_count = models.IntegerField(default=0)
+    error = models.TextField(null=True)
+    started_at = models.DateTimeField(null=True)
+    attempt = models.PositiveIntegerField(
+        default=0,
+        help_text="bumped whenever a worker claims the job, only the latest claim can finish it.",
+    )
+    heartbeat_at = models.DateTimeField(
+        null=True, help_text="updated by the worker while it builds the archive."
+    )
+    finished_at = models.DateTimeField(null=True)
+
+    user_id: int
+
+    objects = Manager["ExportJob"]()
+
+    class Meta:
+        db_table = "export_job"
+        indexes = [models.Index(fields=["status", "created"])]
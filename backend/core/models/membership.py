@@ -32,7 +32,9 @@ class Membership(CommonInfo):
     )
 
     team = models.ForeignKey["Team"]("Team", on_delete=models.CASCADE)
+    team_id: int
     user = models.ForeignKey["User"]("User", on_delete=models.CASCADE)
+    user_id: int
 
     calendar_sync_enabled = models.BooleanField(
         default=False,
@@ -45,6 +47,8 @@ class Membership(CommonInfo):
 
     objects = Manager["Membership"]()
 
+    _access_changed: bool
+
     class Meta:
         unique_together = (("user", "team"),)
 
@@ -57,6 +61,9 @@ class Membership(CommonInfo):
 
     def save(self, *args, **kwargs):
         is_new = self.pk is None
+        # read by `bump_team_access_version`, edits like the calendar settings
+        # don't change what the user can access
+        self._access_changed = is_new
         if not is_new:
             # NOTE: although we check inside the serializer to prevent demoting the
             # last admin, this forms a last line of defence
@@ -65,6 +72,10 @@ class Membership(CommonInfo):
             demoting_admin = current.level == self.ADMIN and self.level != self.ADMIN
             if one_admin_left and demoting_admin:
                 raise ValueError("cannot demote self as last admin")
+            self._access_changed = (current.is_active, current.level) != (
+                self.is_active,
+                self.level,
+            )
         super().save(*args, **kwargs)
 
     def delete(self):
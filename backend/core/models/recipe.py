@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import itertools
 from datetime import date
-from typing import TYPE_CHECKING, Any, Optional, Union
+from typing import TYPE_CHECKING, Any, List, Optional, Union
 
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
@@ -13,6 +12,7 @@ from django.db.models.manager import BaseManager, Manager
 from django.utils import timezone
 
 from core.models.base import CommonInfo
+from core.models.deletion_log import DeletionLog
 from core.models.ingredient import Ingredient
 from core.models.scheduled_recipe import ScheduledRecipe
 from core.models.section import Section
@@ -36,6 +36,7 @@ class Recipe(CommonInfo):
     edits = models.IntegerField(default=0, editable=False)
 
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    content_type_id: int
     object_id = models.PositiveIntegerField()
     owner = GenericForeignKey("content_type", "object_id")
 
@@ -71,6 +72,11 @@ class Recipe(CommonInfo):
     objects = Manager["Recipe"]()
 
     notes: QuerySet["Note"]
+    _loaded_edits: Optional[int]
+
+    class Meta:
+        # access checks filter on the owner, see `user_and_team_recipes`
+        indexes = [models.Index(fields=["content_type", "object_id"])]
 
     def move_to(self, account: Union[User, Team]) -> "Recipe":
         """
@@ -80,6 +86,15 @@ class Recipe(CommonInfo):
             - Steps and Ingredients will be fine since we aren't changing pk's
         """
         with transaction.atomic():
+            if self.owner != account:
+                # members of the previous owner lose access to the recipe
+                DeletionLog.objects.create(
+                    kind=DeletionLog.RECIPE,
+                    deleted_id=self.id,
+                    recipe_id=self.id,
+                    owner_content_type_id=self.content_type_id,
+                    owner_object_id=self.object_id,
+                )
             self.owner = account
             self.save()
             return self
@@ -102,26 +117,40 @@ class Recipe(CommonInfo):
         """
         with transaction.atomic():
             # clone top level recipe object
-            original = self
-            recipe_copy = Recipe.objects.get(pk=original.pk)
-            recipe_copy.pk = None
-            recipe_copy.name += " (copy)"
+            recipe_copy = Recipe(
+                **{
+                    field.attname: getattr(self, field.attname)
+                    for field in Recipe._meta.concrete_fields
+                    if not field.primary_key
+                }
+            )
+            if update_title:
+                recipe_copy.name += " (copy)"
             if account is not None:
                 recipe_copy.owner = account
-            recipe_copy.cloned_from = original
+            recipe_copy.cloned_from = self
             recipe_copy.cloned_by = actor
             recipe_copy.cloned_at = timezone.now()
             recipe_copy.save()
 
-            for recipe_component in itertools.chain(self.steps, self.ingredients):
-                recipe_component.pk = None
-                # alternative to recipe_copy.steps_set.add(step)
-                # this is required due to the db constraint on recipe, position
-                recipe_component.recipe_id = (  # type: ignore [attr-defined]
-                    recipe_copy.pk
-                )
-                recipe_component.save()
-            recipe_copy.save()
+            # a fixed number of queries however large the recipe is
+            steps = list(Step.objects.filter(recipe=self).order_by("id"))
+            for step in steps:
+                step.pk = None
+                step.recipe = recipe_copy
+            Step.objects.bulk_create(steps)
+
+            ingredients = list(Ingredient.objects.filter(recipe=self).order_by("id"))
+            for ingredient in ingredients:
+                ingredient.pk = None
+                ingredient.recipe = recipe_copy
+            Ingredient.objects.bulk_create(ingredients)
+
+            sections = list(Section.objects.filter(recipe=self).order_by("id"))
+            for section in sections:
+                section.pk = None
+                section.recipe = recipe_copy
+            Section.objects.bulk_create(sections)
             return recipe_copy
 
     # TODO(sbdchd): this needs an `@overload` for the user case an the team
@@ -176,12 +205,51 @@ class Recipe(CommonInfo):
     def __str__(self) -> str:
         return f"{self.name} by {self.author}"
 
+    @classmethod
+    def from_db(cls, db: Any, field_names: Any, values: Any) -> "Recipe":
+        instance = super().from_db(db, field_names, values)
+        # remember what was loaded so `save` can tell if `edits` was set
+        instance._loaded_edits = instance.__dict__.get("edits")
+        return instance
+
+    def refresh_from_db(
+        self, using: Optional[str] = None, fields: Optional[List[str]] = None
+    ) -> None:
+        super().refresh_from_db(using=using, fields=fields)
+        if fields is None or "edits" in fields:
+            self._loaded_edits = self.__dict__.get("edits")
+
     def save(self, *args: Any, **kwargs: Any) -> None:
         is_new = self.pk is None
-        if not is_new:
-            # we only want to increment the edits if we aren't setting the
-            # edits field specifically
-            edits_unchanged = Recipe.objects.get(pk=self.id).edits == self.edits
-            if edits_unchanged:
-                self.edits += 1
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        # `edits` wasn't loaded, either deferred or the instance wasn't read
+        # from the database, so it can't have been set on purpose
+        loaded_edits = getattr(self, "_loaded_edits", None)
+        deferred = "edits" not in self.__dict__
+        # we only want to increment the edits if we aren't setting the
+        # edits field specifically
+        increment = (
+            not is_new
+            and (deferred or loaded_edits is None or self.edits == loaded_edits)
+            and (update_fields is None or "edits" in update_fields)
+        )
+        if increment:
+            # increment in the database so concurrent saves aren't lost
+            edits = self.__dict__.get("edits")
+            self.edits = models.F("edits") + 1
+            try:
+                super().save(*args, **kwargs)
+            except BaseException:
+                self._reset_edits(edits)
+                raise
+            self._reset_edits(None if edits is None else edits + 1)
+        else:
+            super().save(*args, **kwargs)
+        self._loaded_edits = self.__dict__.get("edits")
+
+    def _reset_edits(self, edits: Optional[int]) -> None:
+        if edits is None:
+            # leave it deferred, it's read from the database when accessed
+            del self.__dict__["edits"]
+        else:
+            self.edits = edits
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.db import models
+from django.db.models.manager import Manager
+
+from core.models.base import CommonInfo
+
+if TYPE_CHECKING:
+    from core.models.recipe import Recipe  # noqa: F401
+
+
+class RecipeDocument(CommonInfo):
+    """
+    Rendered recipe responses, see `core.recipes.documents`.
+
+    One row per recipe & kind of response, only valid while `fingerprint`
+    matches the recipe's current fingerprint.
+    """
+
+    recipe = models.ForeignKey["Recipe"]("Recipe", on_delete=models.CASCADE)
+    kind = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    document = models.TextField(help_text="JSON of the response.")
+
+    objects = Manager["RecipeDocument"]()
+
+    class Meta:
+        db_table = "recipe_document"
+        constraints = [
+            models.UniqueConstraint(
+                fields=("recipe", "kind"), name="one_document_per_recipe_kind"
+            )
+        ]
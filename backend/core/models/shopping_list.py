@@ -1,5 +1,6 @@
 from typing import Any
 
+from django.db import models
 from django.db.models import JSONField
 from django.db.models.manager import Manager
 
@@ -14,5 +15,13 @@ class ShoppingList(CommonInfo):
     """
 
     ingredients = JSONField[Any]()
+    ingredients_hash = models.TextField(
+        unique=True,
+        null=True,
+        help_text="sha256 of `ingredients`, identical lists are only stored once.",
+    )
 
     objects = Manager["ShoppingList"]()
+
+    class Meta:
+        indexes = [models.Index(fields=["created"])]
@@ -43,6 +43,9 @@ class Team(CommonInfo):
                 team=self, user=user, defaults={"level": level, "is_active": True}
             )
             if not created:
+                # share the caller's instance so its `team_access_version`
+                # is refreshed on save
+                m.user = user
                 m.level = level
                 m.is_active = True
                 m.save()
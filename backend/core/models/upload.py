@@ -21,6 +21,10 @@ s3 = boto3.client(
 )
 
 
+def get_public_url(key: str) -> str:
+    return str(URL(f"https://{config.STORAGE_HOSTNAME}").with_path(key))
+
+
 class Upload(CommonInfo):
     created_by = models.ForeignKey["User"](
         "User", related_name="uploads", on_delete=models.PROTECT
@@ -36,4 +40,4 @@ class Upload(CommonInfo):
     note_id: int | None
 
     def public_url(self) -> str:
-        return str(URL(f"https://{config.STORAGE_HOSTNAME}").with_path(self.key))
+        return get_public_url(self.key)
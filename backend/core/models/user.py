@@ -11,7 +11,11 @@ from django.contrib.auth.models import (
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.postgres.fields import CIEmailField
 from django.db import models, transaction
+from django.db.models import F
 from django.db.models.query import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
 from user_sessions.models import Session
 
 from core.models.membership import Membership
@@ -88,6 +92,15 @@ class User(AbstractBaseUser, PermissionsMixin):
         related_name="+",
     )
 
+    team_access_version = models.PositiveIntegerField(
+        default=0,
+        help_text="bumped whenever the user's memberships change, see `user_active_team_ids`.",
+    )
+    team_access_changed_at = models.DateTimeField(
+        null=True,
+        help_text="when `team_access_version` was last bumped, recipe list syncs from before it are rejected.",
+    )
+
     schedule_team = models.ForeignKey["Team"](
         "Team",
         null=True,
@@ -160,3 +173,21 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.email
+
+
+@receiver([post_save, post_delete], sender=Membership)
+def bump_team_access_version(
+    sender: object, instance: Membership, **kwargs: object
+) -> None:
+    if kwargs["signal"] is post_save and not instance._access_changed:
+        return
+    User.objects.filter(pk=instance.user_id).update(
+        team_access_version=F("team_access_version") + 1,
+        team_access_changed_at=timezone.now(),
+    )
+    # keep the instance we were handed current so later checks in the same
+    # request don't read the previous version's team ids
+    if Membership.user.is_cached(instance):
+        instance.user.refresh_from_db(
+            fields=["team_access_version", "team_access_changed_at"]
+        )
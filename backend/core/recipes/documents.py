@@ -0,0 +1,213 @@
+"""
+Stored per-recipe documents
+
+Building a recipe's response touches a dozen tables while reads outnumber
+writes by a wide margin. Rendered documents are stored in `RecipeDocument`,
+shared by every worker, along with a fingerprint of the recipe and its child
+rows. A document is only used while the fingerprint matches, any write to the
+recipe's rows, including deletes, produces a new fingerprint without having to
+invalidate anything.
+
+Related rows that aren't part of the recipe, like a renamed team or user, are
+picked up once the stored document is older than
+`RECIPE_DOCUMENT_MAX_AGE`.
+
+Documents built by a request are stored in the background by
+`recipe_document_store`, so reading recipes never writes.
+"""
+from __future__ import annotations
+
+import collections
+import hashlib
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Callable, Collection, Mapping
+
+import orjson
+from django.conf import settings
+from django.db import connection
+from django.db.models import CharField, Count, F, Max, QuerySet, Value
+from django.utils import timezone
+from typing_extensions import TypedDict
+
+from core.batching import BatchWriter
+from core.models import (
+    Ingredient,
+    Note,
+    Reaction,
+    Recipe,
+    RecipeDocument,
+    ScheduledRecipe,
+    Section,
+    Step,
+    TimelineEvent,
+    Upload,
+)
+from core.renderers import JSONRenderer
+
+if TYPE_CHECKING:
+    from django.db.models.query import ValuesQuerySet
+
+RECIPE_DOCUMENT_MAX_AGE = timedelta(days=1)
+
+Document = Mapping[str, Any]
+
+
+def _stats(
+    kind: str, queryset: QuerySet[Any], recipe_field: str
+) -> ValuesQuerySet[Any, dict[str, Any]]:
+    """
+    Row count & latest `modified` of a child table for each recipe.
+
+    Edits bump `modified` and deletes drop the count, so any change to the
+    children changes one of the two.
+    """
+    return (
+        queryset.order_by()
+        .values(recipe_pk=F(recipe_field))
+        .annotate(
+            kind=Value(kind, output_field=CharField()),
+            count=Count("id"),
+            latest=Max("modified"),
+        )
+    )
+
+
+def recipe_fingerprints(recipe_ids: Collection[int]) -> dict[int, str]:
+    """
+    Fingerprint of each recipe & everything that goes into its document.
+
+    One aggregate per child table, combined into a single query.
+    """
+    ids = list(recipe_ids)
+    if not ids:
+        return {}
+    recipes = (
+        Recipe.objects.filter(pk__in=ids)
+        .order_by()
+        .values(recipe_pk=F("id"))
+        .annotate(
+            kind=Value("recipe", output_field=CharField()),
+            count=F("object_id"),
+            latest=F("modified"),
+        )
+    )
+    children = [
+        _stats("ingredient", Ingredient.objects.filter(recipe_id__in=ids), "recipe_id"),
+        _stats("step", Step.objects.filter(recipe_id__in=ids), "recipe_id"),
+        _stats("section", Section.objects.filter(recipe_id__in=ids), "recipe_id"),
+        _stats("note", Note.objects.filter(recipe_id__in=ids), "recipe_id"),
+        _stats(
+            "upload", Upload.objects.filter(note__recipe_id__in=ids), "note__recipe_id"
+        ),
+        _stats(
+            "reaction",
+            Reaction.objects.filter(note__recipe_id__in=ids),
+            "note__recipe_id",
+        ),
+        _stats("event", TimelineEvent.objects.filter(recipe_id__in=ids), "recipe_id"),
+        _stats(
+            "schedule", ScheduledRecipe.objects.filter(recipe_id__in=ids), "recipe_id"
+        ),
+    ]
+    rows: dict[int, list[tuple[Any, ...]]] = collections.defaultdict(list)
+    for row in recipes.union(*children, all=True):
+        rows[row["recipe_pk"]].append(
+            (row["kind"], row["count"], row["latest"].isoformat())
+        )
+    return {
+        recipe_id: hashlib.sha256(repr(sorted(stats)).encode()).hexdigest()
+        for recipe_id, stats in rows.items()
+        # children of recipes that don't exist
+        if any(kind == "recipe" for kind, _, _ in stats)
+    }
+
+
+def get_documents(
+    kind: str,
+    fingerprints: Mapping[int, str],
+    build: Callable[[list[int]], Mapping[int, Document]],
+) -> dict[int, Document]:
+    """
+    Stored documents of `kind` for each recipe, calling `build` with the ids
+    of the recipes without a current one.
+    """
+    stored = {
+        recipe_id: document
+        for recipe_id, fingerprint, document in RecipeDocument.objects.filter(
+            recipe_id__in=fingerprints.keys(),
+            kind=kind,
+            modified__gte=timezone.now() - RECIPE_DOCUMENT_MAX_AGE,
+        ).values_list("recipe_id", "fingerprint", "document")
+        if fingerprint == fingerprints[recipe_id]
+    }
+    missing = [recipe_id for recipe_id in fingerprints if recipe_id not in stored]
+    built = build(missing) if missing else {}
+    rendered = {
+        recipe_id: JSONRenderer().render(document).decode()
+        for recipe_id, document in built.items()
+    }
+    for recipe_id, text in rendered.items():
+        recipe_document_store.submit(
+            {
+                "recipe_id": recipe_id,
+                "kind": kind,
+                "fingerprint": fingerprints[recipe_id],
+                "document": text,
+            }
+        )
+
+    documents: dict[int, Document] = {}
+    for recipe_id in fingerprints:
+        document = stored.get(recipe_id) or rendered.get(recipe_id)
+        if document is not None:
+            # parse the rendered JSON so every response goes through the same
+            # rendering, built or stored
+            documents[recipe_id] = orjson.loads(document)
+    return documents
+
+
+class StoredDocument(TypedDict):
+    recipe_id: int
+    kind: str
+    fingerprint: str
+    document: str
+
+
+class RecipeDocumentStore(BatchWriter[StoredDocument]):
+    name = "recipe-document-store"
+
+    def sync(self) -> bool:
+        return bool(settings.RECIPE_DOCUMENT_STORE_SYNC)
+
+    def write(self, batch: list[StoredDocument]) -> None:
+        # an upsert can only touch a row once, keep the latest of each
+        latest = {(item["recipe_id"], item["kind"]): item for item in batch}
+        values = ", ".join(["(%s::int, %s, %s, %s)"] * len(latest))
+        params: list[Any] = []
+        for item in latest.values():
+            params += [
+                item["recipe_id"],
+                item["kind"],
+                item["fingerprint"],
+                item["document"],
+            ]
+        with connection.cursor() as cursor:
+            # skip recipes deleted since they were read
+            cursor.execute(
+                f"""
+                INSERT INTO recipe_document (recipe_id, kind, fingerprint, document, created, modified)
+                SELECT doc.recipe_id, doc.kind, doc.fingerprint, doc.document, now(), now()
+                FROM (VALUES {values}) AS doc (recipe_id, kind, fingerprint, document)
+                JOIN core_recipe ON core_recipe.id = doc.recipe_id
+                ON CONFLICT
+                ON CONSTRAINT one_document_per_recipe_kind
+                DO UPDATE SET
+                    fingerprint = excluded.fingerprint,
+                    document = excluded.document,
+                    modified = excluded.modified
+                """,
+                params,
+            )
+
+
+recipe_document_store = RecipeDocumentStore()
@@ -0,0 +1,101 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Ingredient, RecipeDocument, Step
+from core.recipes import documents
+from core.recipes.documents import recipe_fingerprints
+
+pytestmark = pytest.mark.django_db
+
+
+def test_recipe_fingerprint_changes_with_children(recipe, recipe_pie):
+    before = recipe_fingerprints([recipe.id, recipe_pie.id])
+    assert before == recipe_fingerprints([recipe.id, recipe_pie.id])
+    assert before[recipe.id] != before[recipe_pie.id]
+
+    ingredient = recipe.ingredient_set.first()
+    assert ingredient is not None
+    ingredient.name = "duck egg"
+    ingredient.save()
+    after = recipe_fingerprints([recipe.id, recipe_pie.id])
+    assert after[recipe.id] != before[recipe.id]
+    assert after[recipe_pie.id] == before[recipe_pie.id]
+
+    recipe.step_set.all().delete()
+    assert recipe_fingerprints([recipe.id])[recipe.id] != after[recipe.id]
+
+
+def test_recipe_fingerprint_is_one_query(recipe, recipe_pie):
+    Step.objects.create(recipe=recipe, text="rest", position="z")
+    with CaptureQueriesContext(connection) as queries:
+        before = recipe_fingerprints([recipe.id, recipe_pie.id, 0])
+    assert len(queries) == 1
+    assert set(before) == {recipe.id, recipe_pie.id}
+
+    # deleting a step other than the latest still changes the fingerprint
+    recipe.step_set.order_by("modified").first().delete()
+    assert recipe_fingerprints([recipe.id])[recipe.id] != before[recipe.id]
+
+
+def test_recipe_detail_is_cached(client, user, recipe):
+    client.force_authenticate(user)
+    url = f"/api/v1/recipes/{recipe.id}/"
+
+    with CaptureQueriesContext(connection) as uncached:
+        res = client.get(url)
+    assert res.status_code == 200
+    with CaptureQueriesContext(connection) as cached:
+        assert client.get(url).json() == res.json()
+    assert len(cached) < len(uncached)
+    assert RecipeDocument.objects.filter(recipe=recipe, kind="detail").exists()
+
+    ingredient = Ingredient.objects.filter(recipe=recipe).get(name="egg")
+    ingredient.name = "duck egg"
+    ingredient.save()
+    res = client.get(url)
+    assert "duck egg" in {i["name"] for i in res.json()["ingredients"]}
+
+    recipe.step_set.all().delete()
+    assert client.get(url).json()["steps"] == []
+
+
+def test_recipe_list_uses_cached_children(client, user, recipe):
+    client.force_authenticate(user)
+
+    with CaptureQueriesContext(connection) as uncached:
+        res = client.get("/api/v1/recipes/")
+    assert res.status_code == 200
+    with CaptureQueriesContext(connection) as cached:
+        assert client.get("/api/v1/recipes/").json() == res.json()
+    assert len(cached) < len(uncached)
+
+    recipe.name = "Renamed"
+    recipe.save()
+    (document,) = client.get("/api/v1/recipes/").json()
+    assert document["name"] == "Renamed"
+    assert document["ingredients"] == res.json()[0]["ingredients"]
+
+
+def test_recipe_documents_are_stored_off_the_request(
+    client, monkeypatch, settings, user, recipe
+):
+    settings.RECIPE_DOCUMENT_STORE_SYNC = False
+    store = documents.RecipeDocumentStore()
+    # leave the items queued instead of starting the writer thread
+    monkeypatch.setattr(store, "_ensure_started", lambda: None)
+    monkeypatch.setattr(documents, "recipe_document_store", store)
+    client.force_authenticate(user)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(f"/api/v1/recipes/{recipe.id}/").status_code == 200
+        assert client.get("/api/v1/recipes/").status_code == 200
+    assert not [
+        q for q in queries if "recipe_document" in q["sql"] and "INSERT" in q["sql"]
+    ]
+    assert not RecipeDocument.objects.exists()
+
+    store.flush()
+    assert sorted(
+        RecipeDocument.objects.filter(recipe=recipe).values_list("kind", flat=True)
+    ) == ["detail", "list"]
@@ -1,6 +1,9 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -8,6 +11,7 @@ from syrupy.matchers import path_type
 
 from core import ordering
 from core.models import (
+    DeletionLog,
     Ingredient,
     Membership,
     Note,
@@ -16,6 +20,7 @@ from core.models import (
     Team,
     TimelineEvent,
     User,
+    deletion_log,
 )
 
 pytestmark = pytest.mark.django_db
@@ -213,6 +218,168 @@ def test_recipe_list_timeline_items(client, user, recipe, snapshot):
     )
 
 
+def test_recipe_list_pagination(client, user, recipes):
+    client.force_authenticate(user)
+    everything = client.get("/api/v1/recipes/").json()
+    assert len(everything) > 2
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        res = client.get("/api/v1/recipes/", params)
+        assert res.status_code == status.HTTP_200_OK
+        page = res.json()
+        assert len(page["recipes"]) <= 2
+        seen += page["recipes"]
+        if page["nextCursor"] is None:
+            break
+        params = {"limit": 2, "cursor": page["nextCursor"]}
+
+    assert sorted(seen, key=lambda x: int(x["id"])) == sorted(
+        everything, key=lambda x: int(x["id"])
+    )
+    modified = [(r["modified"], r["id"]) for r in seen]
+    assert modified == sorted(modified, reverse=True)
+
+
+def test_recipe_list_fields(client, user, recipe):
+    client.force_authenticate(user)
+    recipe.schedule(on=datetime(1976, 7, 6).date(), user=user)
+    res = client.get("/api/v1/recipes/", {"fields": "id,name,tags,last_scheduled_at"})
+    assert res.status_code == status.HTTP_200_OK
+    assert res.json() == [
+        {
+            "id": recipe.id,
+            "name": recipe.name,
+            "tags": recipe.tags,
+            "last_scheduled_at": "1976-07-06",
+        }
+    ]
+
+
+def test_recipe_list_sync(client, user, recipe, recipe_pie, recipes, empty_team):
+    first, second, third, fourth = recipe, recipe_pie, recipes[0], recipes[1]
+    yesterday = timezone.now() - timedelta(days=1)
+    # the fixtures' memberships are from before the client's first sync
+    User.objects.filter(pk=user.pk).update(
+        team_access_changed_at=yesterday - timedelta(hours=1)
+    )
+    client.force_authenticate(User.objects.get(pk=user.pk))
+
+    res = client.get("/api/v1/recipes/", {"since": yesterday.isoformat()})
+    assert res.status_code == status.HTTP_200_OK
+    assert len(res.json()["recipes"]) == user.recipes.count()
+    assert res.json()["deleted"] == []
+
+    since = timezone.now()
+    res = client.get("/api/v1/recipes/", {"since": since.isoformat()})
+    assert res.json()["recipes"] == []
+    assert res.json()["deleted"] == []
+
+    ingredient = first.ingredients[0]
+    ingredient.name = "parsnip"
+    ingredient.save()
+    res = client.delete(f"/api/v1/recipes/{second.id}/steps/{second.steps[0].id}/")
+    assert res.status_code == status.HTTP_204_NO_CONTENT
+    deleted_ids = sorted([third.id, fourth.id])
+    third.delete()
+    fourth.move_to(empty_team)
+
+    res = client.get("/api/v1/recipes/", {"since": since.isoformat()})
+    assert res.status_code == status.HTTP_200_OK
+    assert sorted(r["id"] for r in res.json()["recipes"]) == sorted(
+        [first.id, second.id]
+    )
+    assert sorted(res.json()["deleted"]) == deleted_ids
+    assert parse_datetime(res.json()["watermark"]) is not None
+
+
+def test_recipe_list_sync_after_membership_changes(client, user, user2, team, recipe):
+    team_recipe = recipe.move_to(team)
+    since = timezone.now()
+    client.force_authenticate(User.objects.get(pk=user2.pk))
+    res = client.get("/api/v1/recipes/", {"since": since.isoformat()})
+    assert res.status_code == status.HTTP_200_OK
+
+    # joining doesn't change the team's recipes, so a sync wouldn't see them
+    team.force_join(user2)
+    client.force_authenticate(User.objects.get(pk=user2.pk))
+    res = client.get("/api/v1/recipes/", {"since": since.isoformat()})
+    assert res.status_code == status.HTTP_400_BAD_REQUEST
+    res = client.get("/api/v1/recipes/")
+    assert team_recipe.id in [r["id"] for r in res.json()]
+
+    since = timezone.now()
+    res = client.get("/api/v1/recipes/", {"since": since.isoformat()})
+    assert res.status_code == status.HTTP_200_OK
+
+    # nor does leaving, which doesn't log any deletions
+    team.kick_user(user2)
+    client.force_authenticate(User.objects.get(pk=user2.pk))
+    res = client.get("/api/v1/recipes/", {"since": since.isoformat()})
+    assert res.status_code == status.HTTP_400_BAD_REQUEST
+    res = client.get("/api/v1/recipes/")
+    assert team_recipe.id not in [r["id"] for r in res.json()]
+
+
+def test_deletion_log_only_records_recipe_on_cascade(client, user, recipe):
+    client.force_authenticate(user)
+    ingredient = recipe.ingredients[0]
+    res = client.delete(f"/api/v1/recipes/{recipe.id}/ingredients/{ingredient.id}/")
+    assert res.status_code == status.HTTP_204_NO_CONTENT
+    assert list(DeletionLog.objects.values_list("kind", "deleted_id")) == [
+        (DeletionLog.INGREDIENT, ingredient.id)
+    ]
+
+    DeletionLog.objects.all().delete()
+    res = client.delete(f"/api/v1/recipes/{recipe.id}/")
+    assert res.status_code == status.HTTP_204_NO_CONTENT
+    assert list(DeletionLog.objects.values_list("kind", "deleted_id")) == [
+        (DeletionLog.RECIPE, recipe.id)
+    ]
+
+
+def test_deletion_log_is_pruned(monkeypatch, recipe, recipe_pie):
+    monkeypatch.setattr(deletion_log, "_last_prune", None)
+    stale = DeletionLog.objects.create(
+        kind=DeletionLog.RECIPE,
+        deleted_id=0,
+        recipe_id=0,
+        created=timezone.now() - timedelta(days=365),
+    )
+    recipe.delete()
+    assert not DeletionLog.objects.filter(pk=stale.pk).exists()
+
+    # pruning is throttled
+    stale = DeletionLog.objects.create(
+        kind=DeletionLog.RECIPE,
+        deleted_id=0,
+        recipe_id=0,
+        created=timezone.now() - timedelta(days=365),
+    )
+    recipe_pie.delete()
+    assert DeletionLog.objects.filter(pk=stale.pk).exists()
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"fields": "id,bogus"},
+        {"limit": 0},
+        {"limit": 10_000},
+        {"cursor": "nope"},
+        {"since": "yesterday"},
+        {"since": "2000-01-01T00:00:00Z", "limit": 10},
+        # older than SYNC_RETENTION_DAYS
+        {"since": "2000-01-01T00:00:00Z"},
+    ],
+)
+def test_recipe_list_invalid_params(client, user, params):
+    client.force_authenticate(user)
+    res = client.get("/api/v1/recipes/", params)
+    assert res.status_code == status.HTTP_400_BAD_REQUEST
+
+
 def test_updating_step_of_recipe(client, user, recipe):
     """
     ensure a user can update an step of a recipe
@@ -452,6 +619,39 @@ def test_recording_edits_for_recipes(client, user, recipe):
     assert recipe.edits == 1
 
 
+def test_recording_edits_without_reading_recipe(recipe):
+    """
+    saves of stale copies shouldn't lose edits & an explicit edits is kept
+    """
+    first = Recipe.objects.get(pk=recipe.pk)
+    second = Recipe.objects.get(pk=recipe.pk)
+    with CaptureQueriesContext(connection) as queries:
+        first.save()
+    assert len(queries) == 1
+    second.save()
+    assert Recipe.objects.get(pk=recipe.pk).edits == 2
+
+    second.edits = 10
+    second.save()
+    assert Recipe.objects.get(pk=recipe.pk).edits == 10
+
+
+def test_recording_edits_after_refresh_and_defer(recipe):
+    recipe.save()
+    recipe.refresh_from_db()
+    assert recipe.edits == 1
+    recipe.save()
+    assert Recipe.objects.get(pk=recipe.pk).edits == 2
+
+    deferred = Recipe.objects.defer("edits").get(pk=recipe.pk)
+    with CaptureQueriesContext(connection) as queries:
+        deferred.save()
+    assert len(queries) == 1, "edits shouldn't be read to increment it"
+    assert deferred.edits == 3
+    deferred.save()
+    assert Recipe.objects.get(pk=recipe.pk).edits == 4
+
+
 def test_updating_edit_recipe_via_api(client, user, recipe):
     """
     ensure edits occur when updating the recipe via the api
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from core.models import RecipeView
+from core.recipes.view_log import RecipeViewLog
+
+pytestmark = pytest.mark.django_db
+
+
+def test_recipe_views_are_deduped_per_hour(user, recipe, recipe_pie) -> None:
+    now = timezone.now()
+    RecipeViewLog().write(
+        [
+            {"recipe_id": recipe.id, "user_id": user.id, "visited_at": now},
+            {
+                "recipe_id": recipe.id,
+                "user_id": user.id,
+                "visited_at": now - timedelta(hours=2),
+            },
+            {
+                "recipe_id": recipe.id,
+                "user_id": user.id,
+                "visited_at": now - timedelta(minutes=90),
+            },
+            {
+                "recipe_id": recipe_pie.id,
+                "user_id": user.id,
+                "visited_at": now - timedelta(minutes=10),
+            },
+        ]
+    )
+    view = RecipeView.objects.get(recipe=recipe, user=user)
+    assert view.count == 2
+    assert view.last_visited_at == now
+    assert RecipeView.objects.get(recipe=recipe_pie, user=user).count == 1
+
+    RecipeViewLog().write(
+        [{"recipe_id": recipe.id, "user_id": user.id, "visited_at": now}]
+    )
+    assert RecipeView.objects.get(recipe=recipe, user=user).count == 2
+
+
+def test_recipe_views_of_deleted_recipes_are_dropped(user, recipe, recipe_pie) -> None:
+    recipe_id = recipe.id
+    recipe.delete()
+    RecipeViewLog().write(
+        [
+            {"recipe_id": recipe_id, "user_id": user.id, "visited_at": timezone.now()},
+            {
+                "recipe_id": recipe_pie.id,
+                "user_id": user.id,
+                "visited_at": timezone.now(),
+            },
+        ]
+    )
+    assert list(RecipeView.objects.values_list("recipe_id", flat=True)) == [
+        recipe_pie.id
+    ]
+
+
+def test_recipe_get_records_view(client, user, recipe) -> None:
+    client.force_authenticate(user)
+    assert client.get(f"/api/v1/recipes/{recipe.id}/").status_code == 200
+    assert RecipeView.objects.get(recipe=recipe, user=user).count == 1
@@ -0,0 +1,84 @@
+"""
+Background tracking of recipe views
+
+Views are recorded off the request path so reading a recipe never waits on
+the `recipe_view` row. Each view keeps the time it happened and batches are
+written with a multi-row upsert. A view counts only if the previous counted
+view is more than an hour older.
+"""
+from __future__ import annotations
+
+import collections
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+from django.db import connection
+from typing_extensions import TypedDict
+
+from core.batching import BatchWriter
+
+
+class RecipeVisit(TypedDict):
+    recipe_id: int
+    user_id: int
+    visited_at: datetime
+
+
+class RecipeViewLog(BatchWriter[RecipeVisit]):
+    name = "recipe-view-log"
+
+    def sync(self) -> bool:
+        return bool(settings.RECIPE_VIEW_LOG_SYNC)
+
+    def write(self, batch: list[RecipeVisit]) -> None:
+        visits: dict[tuple[int, int], list[datetime]] = collections.defaultdict(list)
+        for visit in batch:
+            visits[(visit["recipe_id"], visit["user_id"])].append(visit["visited_at"])
+        for times in visits.values():
+            times.sort()
+        # An upsert can only touch a row once, so repeat views of a recipe go
+        # in later rounds, in the order they happened.
+        rounds = max(len(times) for times in visits.values())
+        for index in range(rounds):
+            self._upsert(
+                [
+                    (recipe_id, user_id, times[index])
+                    for (recipe_id, user_id), times in visits.items()
+                    if index < len(times)
+                ]
+            )
+
+    def _upsert(self, rows: list[tuple[int, int, datetime]]) -> None:
+        values = ", ".join(["(%s::int, %s::int, %s::timestamptz)"] * len(rows))
+        params: list[Any] = [value for row in rows for value in row]
+        with connection.cursor() as cursor:
+            # skip visits to recipes or users deleted since the view
+            cursor.execute(
+                f"""
+                INSERT INTO recipe_view (recipe_id, user_id, last_visited_at, count, created, modified)
+                SELECT visit.recipe_id, visit.user_id, visit.visited_at, 1, now(), now()
+                FROM (VALUES {values}) AS visit (recipe_id, user_id, visited_at)
+                JOIN core_recipe ON core_recipe.id = visit.recipe_id
+                JOIN core_myuser ON core_myuser.id = visit.user_id
+                ON CONFLICT
+                ON CONSTRAINT one_user_view_row_per_recipe
+                DO UPDATE SET
+                    last_visited_at =
+                        CASE WHEN recipe_view.last_visited_at < excluded.last_visited_at - '1 hour'::interval THEN
+                            excluded.last_visited_at
+                        ELSE
+                            recipe_view.last_visited_at
+                        END,
+                    count =
+                        CASE WHEN recipe_view.last_visited_at < excluded.last_visited_at - '1 hour'::interval THEN
+                            recipe_view.count + 1
+                        ELSE
+                            recipe_view.count
+                        END
+                """,
+                params,
+            )
+
+
+recipe_view_log = RecipeViewLog()
@@ -10,6 +10,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from core.models import ChangeType, RecipeChange, user_and_team_ingredients
+from core.models.deletion_log import DeletionLog, delete_and_log
 from core.recipes.serializers import ingredient_to_text, serialize_ingredient
 from core.request import AuthedRequest
 from core.serialization import RequestParams
@@ -72,6 +73,10 @@ def ingredients_detail_view(
             after="",
             change_type=ChangeType.INGREDIENT_DELETE,
         )
-        user_and_team_ingredients(request.user).filter(pk=ingredient_pk).delete()
+        delete_and_log(
+            DeletionLog.INGREDIENT,
+            user_and_team_ingredients(request.user).filter(pk=ingredient_pk),
+            "recipe_id",
+        )
         return Response(status=status.HTTP_204_NO_CONTENT)
     raise MethodNotAllowed(request.method or "")
@@ -12,6 +12,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from core.models import Note, Upload, user_and_team_notes, user_and_team_recipes
+from core.models.deletion_log import DeletionLog, delete_and_log
 from core.recipes.serializers import serialize_note
 from core.request import AuthedRequest
 from core.serialization import RequestParams
@@ -82,5 +83,9 @@ def note_patch_view(request: AuthedRequest, note_pk: str) -> Response:
 
 
 def note_delete_view(request: AuthedRequest, note_pk: str) -> Response:
-    user_and_team_notes(request.user).filter(pk=note_pk).delete()
+    delete_and_log(
+        DeletionLog.NOTE,
+        user_and_team_notes(request.user).filter(pk=note_pk),
+        "recipe_id",
+    )
     return Response(status=status.HTTP_204_NO_CONTENT)
@@ -12,6 +12,7 @@ from rest_framework.response import Response
 from typing_extensions import Literal
 
 from core.models import user_and_team_notes, user_reactions
+from core.models.deletion_log import DeletionLog, delete_and_log
 from core.models.reaction import Reaction
 from core.recipes.serializers import serialize_reactions
 from core.request import AuthedRequest
@@ -49,5 +50,9 @@ def note_reaction_create_view(request: AuthedRequest, note_pk: int) -> Response:
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
 def note_reaction_delete_view(request: AuthedRequest, reaction_pk: str) -> Response:
-    user_reactions(request.user).filter(pk=reaction_pk).delete()
+    delete_and_log(
+        DeletionLog.REACTION,
+        user_reactions(request.user).filter(pk=reaction_pk),
+        "note__recipe_id",
+    )
     return Response(status=status.HTTP_204_NO_CONTENT)
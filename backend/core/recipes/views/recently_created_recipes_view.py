@@ -11,8 +11,5 @@ from core.request import AuthedRequest
 @api_view(["GET"])
 @permission_classes((IsAuthenticated,))
 def get_recently_created_recipes(request: AuthedRequest) -> Response:
-    recipes = [
-        {"id": r.id, "name": r.name}
-        for r in user_and_team_recipes(user=request.user).order_by("-created")[:6]
-    ]
-    return Response(recipes)
+    recipes = user_and_team_recipes(user=request.user).order_by("-created")
+    return Response(list(recipes.values("id", "name")[:6]))
@@ -8,7 +8,13 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from typing_extensions import Literal
 
-from core.models import Recipe, Team, User, user_and_team_recipe_or_404
+from core.models import (
+    FULL_RECIPE_PREFETCHES,
+    Recipe,
+    Team,
+    User,
+    user_and_team_recipe_or_404,
+)
 from core.recipes.serializers import RecipeSerializer
 from core.request import AuthedRequest
 from core.serialization import RequestParams
@@ -43,15 +49,6 @@ def recipe_copy_view(request: AuthedRequest, recipe_pk: str) -> Response:
 
     # refetch all relations before serialization
     prefetched_recipe: Recipe = Recipe.objects.prefetch_related(
-        "owner",
-        "step_set",
-        "ingredient_set",
-        "scheduledrecipe_set",
-        "notes",
-        "notes__uploads",
-        "notes__reactions",
-        "notes__reactions__created_by",
-        "timelineevent_set",
-        "section_set",
+        *FULL_RECIPE_PREFETCHES
     ).get(id=new_recipe.id)
     return Response(RecipeSerializer(prefetched_recipe).data, status=status.HTTP_200_OK)
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import IO, Any, Iterator, List, Optional, Type, Union
+
+import pydantic
+import yaml
+from django.db import transaction
+from pydantic import constr
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core import ordering
+from core.auth.permissions import get_team_membership
+from core.models import (
+    Ingredient,
+    Membership,
+    Recipe,
+    Section,
+    Step,
+    Team,
+    TimelineEvent,
+    User,
+)
+from core.request import AuthedRequest
+
+# recipes created per transaction
+IMPORT_CHUNK_SIZE = 100
+# bytes read from the request body at a time when parsing json
+READ_SIZE = 64 * 1024
+# largest item of a json array, in characters, before the body is rejected
+MAX_ITEM_SIZE = 1024 * 1024
+# libyaml's parser is many times faster than the pure Python one
+YAML_LOADER: Union[Type[yaml.CSafeLoader], Type[yaml.SafeLoader]] = (
+    yaml.CSafeLoader if yaml.__with_libyaml__ else yaml.SafeLoader
+)
+
+ShortText = constr(max_length=255)
+
+
+class ImportIngredient(pydantic.BaseModel):
+    quantity: ShortText = ""  # type: ignore [valid-type]
+    name: ShortText  # type: ignore [valid-type]
+    description: ShortText = ""  # type: ignore [valid-type]
+    optional: bool = False
+
+
+class ImportSection(pydantic.BaseModel):
+    section: ShortText  # type: ignore [valid-type]
+
+
+class ImportRecipe(pydantic.BaseModel):
+    """
+    A recipe in the `core.export` format, the `id` & `owner` are ignored.
+
+    Sections can be placed between ingredients as `{"section": "<title>"}`.
+    """
+
+    name: ShortText  # type: ignore [valid-type]
+    author: Optional[ShortText] = None  # type: ignore [valid-type]
+    time: Optional[ShortText] = None  # type: ignore [valid-type]
+    source: Optional[ShortText] = None  # type: ignore [valid-type]
+    servings: Optional[ShortText] = None  # type: ignore [valid-type]
+    ingredients: List[Union[ImportSection, ImportIngredient]] = []
+    steps: List[str] = []
+    tags: Optional[List[str]] = None
+
+
+# characters that end a number or literal, once one follows the position of
+# a decode error, reading more of the body can't fix it
+TOKEN_END = re.compile(r'[\s,:\[\]{}"]')
+
+
+def is_truncated(buffer: str, error: json.JSONDecodeError) -> bool:
+    """
+    Could the decode error be caused by an item split across reads, rather
+    than a malformed item?
+    """
+    if error.msg == "Unterminated string starting at":
+        return True
+    # a cut off number, literal or escape runs to the end of the buffer
+    return TOKEN_END.search(buffer, error.pos) is None
+
+
+def iter_json_array(stream: IO[bytes]) -> Iterator[Any]:
+    """
+    Yield the items of a top level JSON array without reading the whole body
+    into memory.
+    """
+    decoder = json.JSONDecoder()
+    # multi-byte characters can be split across reads
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = False
+    eof = False
+    while True:
+        buffer = buffer.lstrip()
+        if not started and buffer:
+            if buffer[0] != "[":
+                raise ValueError("expected a JSON array")
+            buffer = buffer[1:]
+            started = True
+            continue
+        if started and buffer[:1] == ",":
+            buffer = buffer[1:]
+            continue
+        if started and buffer[:1] == "]":
+            return
+        if started and buffer:
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError as e:
+                # an item split across reads, unless there is nothing left
+                if eof or not is_truncated(buffer, e):
+                    raise
+                if len(buffer) > MAX_ITEM_SIZE:
+                    raise ValueError(
+                        f"item is larger than {MAX_ITEM_SIZE} characters"
+                    ) from e
+            else:
+                yield item
+                buffer = buffer[end:]
+                continue
+        if eof:
+            raise ValueError("unexpected end of JSON array")
+        chunk = stream.read(READ_SIZE)
+        eof = not chunk
+        buffer += text.decode(chunk, final=eof)
+
+
+def parse_documents(request: AuthedRequest) -> Iterator[Any]:
+    if "yaml" in (request.content_type or ""):
+        return yaml.load_all(request.stream, Loader=YAML_LOADER)
+    return iter_json_array(request.stream)
+
+
+def build_recipe(
+    recipe: Recipe, params: ImportRecipe
+) -> tuple[list[Ingredient], list[Section], list[Step]]:
+    ingredients: list[Ingredient] = []
+    sections: list[Section] = []
+    # sections & ingredients share positions since they're displayed together
+    position = ordering.FIRST_POSITION
+    for item in params.ingredients:
+        if isinstance(item, ImportSection):
+            sections.append(
+                Section(recipe=recipe, title=item.section, position=position)
+            )
+        else:
+            ingredients.append(
+                Ingredient(
+                    recipe=recipe,
+                    position=position,
+                    quantity=item.quantity,
+                    name=item.name,
+                    description=item.description,
+                    optional=item.optional,
+                )
+            )
+        position = ordering.position_after(position)
+
+    steps: list[Step] = []
+    position = ordering.FIRST_POSITION
+    for text in params.steps:
+        steps.append(Step(recipe=recipe, text=text, position=position))
+        position = ordering.position_after(position)
+    return ingredients, sections, steps
+
+
+def create_recipes(
+    *, owner: Union[User, Team], actor: User, chunk: list[ImportRecipe]
+) -> list[int]:
+    with transaction.atomic():
+        recipes = Recipe.objects.bulk_create(
+            Recipe(
+                owner=owner,
+                name=params.name,
+                author=params.author,
+                time=params.time,
+                source=params.source,
+                servings=params.servings,
+                tags=params.tags or [],
+            )
+            for params in chunk
+        )
+        ingredients: list[Ingredient] = []
+        sections: list[Section] = []
+        steps: list[Step] = []
+        for recipe, params in zip(recipes, chunk):
+            recipe_ingredients, recipe_sections, recipe_steps = build_recipe(
+                recipe, params
+            )
+            ingredients += recipe_ingredients
+            sections += recipe_sections
+            steps += recipe_steps
+        Ingredient.objects.bulk_create(ingredients)
+        Section.objects.bulk_create(sections)
+        Step.objects.bulk_create(steps)
+        TimelineEvent.objects.bulk_create(
+            TimelineEvent(action="created", created_by=actor, recipe=recipe)
+            for recipe in recipes
+        )
+        return [recipe.id for recipe in recipes]
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def recipe_import_view(request: AuthedRequest) -> Response:
+    """
+    Create recipes from an export, either a JSON array or YAML documents
+    depending on the content type.
+
+    /recipes/import?team=<team_id>
+        omit `team` to import into the user's own recipes
+
+    Invalid recipes are skipped and reported by their index in the export.
+    """
+    owner: Union[User, Team] = request.user
+    team_pk = request.query_params.get("team")
+    if team_pk is not None:
+        team_membership = get_team_membership(request, team_pk)
+        membership = team_membership.membership
+        if not (
+            membership is not None
+            and membership.is_active
+            and membership.level in {Membership.ADMIN, Membership.CONTRIBUTOR}
+        ):
+            raise PermissionDenied(detail="user must have write permissions")
+        owner = team_membership.team
+
+    # DRF doesn't provide a stream for empty bodies
+    if request.stream is None:
+        return Response(
+            {"error": True, "message": "empty body"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    created: list[int] = []
+    errors: list[dict[str, Any]] = []
+    chunk: list[ImportRecipe] = []
+    last_index = -1
+    try:
+        for index, document in enumerate(parse_documents(request)):
+            last_index = index
+            try:
+                chunk.append(ImportRecipe.parse_obj(document))
+            except pydantic.ValidationError as e:
+                errors.append({"index": index, "errors": e.errors()})
+            if len(chunk) == IMPORT_CHUNK_SIZE:
+                created += create_recipes(owner=owner, actor=request.user, chunk=chunk)
+                chunk = []
+    except (ValueError, yaml.YAMLError) as e:
+        # recipes before the malformed part are still imported
+        errors.append({"index": last_index + 1, "errors": str(e)})
+    if chunk:
+        created += create_recipes(owner=owner, actor=request.user, chunk=chunk)
+
+    return Response(
+        {"created": created, "errors": errors}, status=status.HTTP_201_CREATED
+    )
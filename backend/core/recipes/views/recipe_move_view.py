@@ -8,7 +8,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from typing_extensions import Literal
 
-from core.models import Team, User, user_and_team_recipe_or_404
+from core.models import Team, User, user_and_team_full_recipe_or_404
 from core.recipes.serializers import RecipeSerializer
 from core.request import AuthedRequest
 from core.serialization import RequestParams
@@ -29,7 +29,7 @@ def recipe_move_view(request: AuthedRequest, recipe_pk: str) -> Response:
     /recipes/<recipe_id>/move
         {'id':<team_id>, type:'team'}
     """
-    recipe = user_and_team_recipe_or_404(request.user, recipe_pk=recipe_pk)
+    recipe = user_and_team_full_recipe_or_404(request.user, recipe_pk=recipe_pk)
     params = RecipeMoveParams.parse_obj(request.data)
 
     if params.type == "team":
@@ -12,6 +12,7 @@ from rest_framework.response import Response
 from core import ordering
 from core.auth.permissions import has_recipe_access
 from core.models import ChangeType, Recipe, RecipeChange, Section
+from core.models.deletion_log import DeletionLog, delete_and_log
 from core.recipes.serializers import SectionSerializer
 from core.request import AuthedRequest
 from core.serialization import RequestParams
@@ -70,7 +71,9 @@ def delete_section_view(request: AuthedRequest, section_pk: int) -> Response:
         change_type=ChangeType.SECTION_DELETE,
     )
 
-    section.delete()
+    delete_and_log(
+        DeletionLog.SECTION, Section.objects.filter(pk=section.pk), "recipe_id"
+    )
 
     return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -10,6 +10,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from core.models import ChangeType, RecipeChange, user_and_team_steps
+from core.models.deletion_log import DeletionLog, delete_and_log
 from core.recipes.serializers import serialize_step
 from core.request import AuthedRequest
 from core.serialization import RequestParams
@@ -54,6 +55,10 @@ def steps_detail_view(
             after="",
             change_type=ChangeType.STEP_DELETE,
         )
-        step.delete()
+        delete_and_log(
+            DeletionLog.STEP,
+            user_and_team_steps(request.user).filter(pk=step.pk),
+            "recipe_id",
+        )
         return Response(status=status.HTTP_204_NO_CONTENT)
     raise MethodNotAllowed(request.method or "")
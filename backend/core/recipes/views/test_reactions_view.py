@@ -1,8 +1,13 @@
+import json
+from typing import Any
+
 import pytest
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from core.models import Recipe, User
+from core.models import Reaction, Recipe, Upload, User
+from core.recipes.serializers import serialize_attachments, serialize_reactions
+from core.renderers import JSONRenderer
 
 
 @pytest.mark.django_db(transaction=True)
@@ -27,3 +32,38 @@ def test_reactions(client: APIClient, user: User, recipe: Recipe) -> None:
     assert res.status_code == status.HTTP_204_NO_CONTENT
 
     assert note.reactions.count() == 0
+
+
+@pytest.mark.django_db
+def test_recipe_list_reactions_and_attachments(
+    client: APIClient, user: User, user2: User, recipe: Recipe
+) -> None:
+    """
+    The recipe list assembles reactions & attachments from rows, ensure they
+    match what the serializers produce.
+    """
+    note = recipe.notes.all()[0]
+    Reaction.objects.create(emoji="❤️", created_by=user, note=note)
+    Reaction.objects.create(emoji="😆", created_by=user2, note=note)
+    Upload.objects.create(
+        created_by=user, bucket="bucket", key="some/key.png", note=note
+    )
+
+    client.force_authenticate(user)
+    res = client.get("/api/v1/recipes/")
+    assert res.status_code == status.HTTP_200_OK
+    (listed_note,) = [
+        item
+        for item in res.json()[0]["timelineItems"]
+        if item["type"] == "note" and item["id"] == note.pk
+    ]
+
+    def render(x: Any) -> Any:
+        return json.loads(JSONRenderer().render(x))
+
+    assert listed_note["reactions"] == render(
+        [r.dict() for r in serialize_reactions(note.reactions.all())]
+    )
+    assert listed_note["attachments"] == render(
+        [a.dict() for a in serialize_attachments(note.uploads.all())]
+    )
@@ -1,4 +1,6 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 from core.models import Recipe, User
@@ -10,3 +12,14 @@ def test_recently_viewed(client: APIClient, user: User, recipe: Recipe) -> None:
     res = client.get("/api/v1/recipes/recently_created")
     assert len(res.json()) == 1
     assert res.json()[0]["id"] == recipe.pk
+
+
+@pytest.mark.django_db
+def test_recently_created_skips_prefetching(
+    client: APIClient, user: User, recipe: Recipe, recipe_pie: Recipe
+) -> None:
+    client.force_authenticate(user)
+    with CaptureQueriesContext(connection) as queries:
+        res = client.get("/api/v1/recipes/recently_created")
+    assert [r["id"] for r in res.json()] == [recipe_pie.pk, recipe.pk]
+    assert not any("core_ingredient" in q["sql"] for q in queries)
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import Membership, Recipe, Team, TimelineEvent, User
+from core.recipes.views import recipe_import_view
+from core.recipes.views.recipe_import_view import iter_json_array
+
+pytestmark = pytest.mark.django_db
+
+
+def test_import_round_trips_export(
+    client: APIClient, user: User, recipe: Recipe
+) -> None:
+    client.force_login(user)
+    exported = client.get("/recipes.json").getvalue()
+    res = client.post(
+        "/api/v1/recipes/import/", exported, content_type="application/json"
+    )
+    assert res.status_code == 201
+    assert res.json()["errors"] == []
+    (imported_id,) = res.json()["created"]
+
+    imported = Recipe.objects.get(id=imported_id)
+    assert imported.owner == user
+    assert imported.name == recipe.name
+    assert imported.source == recipe.source
+    assert [i.name for i in imported.ingredient_set.order_by("position")] == [
+        i.name for i in recipe.ingredient_set.order_by("position")
+    ]
+    assert [s.text for s in imported.step_set.all()] == [
+        s.text for s in recipe.step_set.all()
+    ]
+    assert TimelineEvent.objects.get(recipe=imported).action == "created"
+
+
+def test_import_yaml(client: APIClient, user: User, recipe: Recipe) -> None:
+    client.force_login(user)
+    exported = client.get("/recipes.yaml").getvalue()
+    res = client.post("/api/v1/recipes/import/", exported, content_type="text/x-yaml")
+    assert res.status_code == 201
+    assert len(res.json()["created"]) == 1
+
+
+def test_import_sections_share_positions(client: APIClient, user: User) -> None:
+    client.force_authenticate(user)
+    res = client.post(
+        "/api/v1/recipes/import/",
+        [
+            {
+                "name": "Pie",
+                "ingredients": [
+                    {"section": "Crust"},
+                    {"quantity": "1 cup", "name": "flour"},
+                    {"section": "Filling"},
+                    {"name": "apples"},
+                ],
+                "steps": ["mix", "bake"],
+            }
+        ],
+        format="json",
+    )
+    recipe = Recipe.objects.get(id=res.json()["created"][0])
+    items = sorted(
+        [(s.position, s.title) for s in recipe.section_set.all()]
+        + [(i.position, i.name) for i in recipe.ingredient_set.all()]
+    )
+    assert [name for _, name in items] == ["Crust", "flour", "Filling", "apples"]
+    assert [s.text for s in recipe.step_set.order_by("position")] == ["mix", "bake"]
+
+
+def test_import_reports_invalid_recipes(client: APIClient, user: User) -> None:
+    client.force_authenticate(user)
+    res = client.post(
+        "/api/v1/recipes/import/",
+        [{"name": "Soup"}, {"name": "x" * 300}, {"steps": ["boil"]}],
+        format="json",
+    )
+    assert res.status_code == 201
+    assert len(res.json()["created"]) == 1
+    assert [e["index"] for e in res.json()["errors"]] == [1, 2]
+
+
+def test_import_reports_malformed_body(
+    client: APIClient, monkeypatch: pytest.MonkeyPatch, user: User
+) -> None:
+    monkeypatch.setattr(recipe_import_view, "IMPORT_CHUNK_SIZE", 2)
+    client.force_authenticate(user)
+    # the first two are in a created chunk, the third is still pending
+    body = '[{"name": "a"}, {"name": "b"}, {"name": "c"}, {"name": '
+    res = client.post("/api/v1/recipes/import/", body, content_type="application/json")
+    assert res.status_code == 201
+    assert len(res.json()["created"]) == 3
+    assert [e["index"] for e in res.json()["errors"]] == [3]
+
+    res = client.post(
+        "/api/v1/recipes/import/",
+        '[{"name": "a"}, {"steps": []}, {"name": "c"}, nope]',
+        content_type="application/json",
+    )
+    assert len(res.json()["created"]) == 2
+    assert [e["index"] for e in res.json()["errors"]] == [1, 3]
+
+    res = client.post(
+        "/api/v1/recipes/import/",
+        "name: a\n---\nname: [b\n",
+        content_type="text/x-yaml",
+    )
+    assert len(res.json()["created"]) == 1
+    assert [e["index"] for e in res.json()["errors"]] == [1]
+
+
+def test_import_empty_body(client: APIClient, user: User) -> None:
+    client.force_authenticate(user)
+    res = client.post("/api/v1/recipes/import/", "", content_type="application/json")
+    assert res.status_code == 400
+    res = client.post("/api/v1/recipes/import/")
+    assert res.status_code == 400
+
+
+def test_import_queries_are_per_chunk(
+    client: APIClient, monkeypatch: pytest.MonkeyPatch, user: User
+) -> None:
+    monkeypatch.setattr(recipe_import_view, "IMPORT_CHUNK_SIZE", 10)
+    client.force_authenticate(user)
+    recipes = [
+        {"name": f"Recipe {i}", "ingredients": [{"name": "egg"}], "steps": ["cook"]}
+        for i in range(20)
+    ]
+    with CaptureQueriesContext(connection) as queries:
+        res = client.post("/api/v1/recipes/import/", recipes, format="json")
+    assert len(res.json()["created"]) == 20
+    inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "core_recipe"')]
+    assert len(inserts) == 2
+    assert len(queries) < 20
+
+
+def test_import_into_team(
+    client: APIClient, user: User, user2: User, team: Team
+) -> None:
+    client.force_authenticate(user)
+    res = client.post(
+        f"/api/v1/recipes/import/?team={team.id}", [{"name": "Soup"}], format="json"
+    )
+    assert res.status_code == 201
+    assert Recipe.objects.get(id=res.json()["created"][0]).owner == team
+
+    team.force_join(user2, level=Membership.READ_ONLY)
+    client.force_authenticate(user2)
+    res = client.post(
+        f"/api/v1/recipes/import/?team={team.id}", [{"name": "Soup"}], format="json"
+    )
+    assert res.status_code == 403
+
+
+def test_iter_json_array_across_reads(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(recipe_import_view, "READ_SIZE", 3)
+    items = [
+        {"name": "a, b"},
+        {"name": "[c] 🦠"},
+        {"optional": True, "quantity": -1.5e3, "description": None},
+        {"name": "caf\u00e9"},
+        1,
+    ]
+    body = json.dumps(items, ensure_ascii=False).encode()
+    assert list(iter_json_array(io.BytesIO(body))) == items
+    body = json.dumps(items, ensure_ascii=True).encode()
+    assert list(iter_json_array(io.BytesIO(body))) == items
+    assert list(iter_json_array(io.BytesIO(b" [ ] "))) == []
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.BytesIO(b'{"name": "a"}')))
+
+
+def test_iter_json_array_fails_fast(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(recipe_import_view, "READ_SIZE", 1024)
+    body = io.BytesIO(b'[{"name": nope}, ' + b'{"name": "a"}, ' * 100_000 + b"]")
+    with pytest.raises(ValueError):
+        list(iter_json_array(body))
+    assert body.tell() == 1024, "the rest of the body shouldn't be read"
+
+    monkeypatch.setattr(recipe_import_view, "MAX_ITEM_SIZE", 4096)
+    body = io.BytesIO(b'[{"name": "' + b"a" * 100_000 + b'"}]')
+    with pytest.raises(ValueError, match="larger than"):
+        list(iter_json_array(body))
+    assert body.tell() < 8192
@@ -1,4 +1,7 @@
+from __future__ import annotations
+
 from decimal import Decimal
+from fractions import Fraction
 
 import orjson
 import pydantic
@@ -7,12 +10,15 @@ from rest_framework.renderers import JSONRenderer as DRFJSONRenderer
 MAX_DECIMAL_PLACES = 8
 
 
-def fmt_decimal(d: Decimal) -> str:
+def fmt_decimal(d: Decimal | Fraction) -> str:
     """
     remove trailing zeros
 
     Decimal("4.0000") -> "4"
+    Fraction(1, 3) -> "0.33333333"
     """
+    if isinstance(d, Fraction):
+        d = Decimal(d.numerator) / Decimal(d.denominator)
     d = round(d, MAX_DECIMAL_PLACES)
     if d == d.to_integral():
         return str(d.quantize(Decimal(1)))
@@ -20,7 +26,7 @@ def fmt_decimal(d: Decimal) -> str:
 
 
 def default(o):
-    if isinstance(o, Decimal):
+    if isinstance(o, (Decimal, Fraction)):
         return fmt_decimal(o)
     if isinstance(o, pydantic.BaseModel):
         return o.dict()
@@ -32,7 +38,7 @@ class JSONRenderer(DRFJSONRenderer):
     We define our own renderer so we can return dataclasses and decimals in
     in our calls to Response. The default DRF JSONEncoder supports decimals
     but converts them to floats. Normalizing Decimals gives a more human readable
-    output.
+    output. Fractions are rendered the same way as Decimals.
     """
 
     def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
@@ -1,4 +1,6 @@
+import re
 from collections import OrderedDict
+from typing import Any, Iterable, Optional, Type, cast
 
 import yaml
 from django.http import HttpResponse
@@ -13,7 +15,79 @@ def represent_ordereddict(dumper, data):
     return yaml.nodes.MappingNode("tag:yaml.org,2002:map", value)
 
 
-yaml.add_representer(OrderedDict, represent_ordereddict)
+class YamlDumper(yaml.SafeDumper):
+    """
+    Safe dumper that keeps the key order of serializer output.
+
+    Being safe, anything besides plain data raises instead of being dumped as
+    a `!!python/` object.
+    """
+
+
+# multi so DRF's `ReturnDict` & other subclasses are covered too
+YamlDumper.add_multi_representer(OrderedDict, represent_ordereddict)
+
+# libyaml's emitter is many times faster than the pure Python one
+FAST_YAML_DUMPER: Optional[Type[yaml.CSafeDumper]] = None
+if yaml.__with_libyaml__:
+
+    class CYamlDumper(yaml.CSafeDumper):
+        """`YamlDumper` on top of libyaml"""
+
+    CYamlDumper.add_multi_representer(OrderedDict, represent_ordereddict)
+    FAST_YAML_DUMPER = CYamlDumper
+
+
+# characters outside the BMP, like emoji
+ASTRAL_CHARS = re.compile("[\U00010000-\U0010FFFF]")
+
+
+def has_astral_chars(data: Any) -> bool:
+    if isinstance(data, str):
+        return ASTRAL_CHARS.search(data) is not None
+    if isinstance(data, dict):
+        return any(has_astral_chars(k) or has_astral_chars(v) for k, v in data.items())
+    if isinstance(data, (list, tuple)):
+        return any(has_astral_chars(item) for item in data)
+    return False
+
+
+def dump_yaml_all(documents: Iterable[Any], **kwargs: Any) -> str:
+    """
+    Dump the documents with libyaml when it's available.
+
+    The output loads back to the same data as the Python emitter's, but isn't
+    always the same text, double quoted scalars like strings with tabs or
+    trailing spaces can be wrapped differently.
+    """
+    documents = list(documents)
+    kwargs = {"default_flow_style": False, "allow_unicode": True, **kwargs}
+    if FAST_YAML_DUMPER is None:
+        return cast(str, yaml.dump_all(documents, Dumper=YamlDumper, **kwargs))
+    # libyaml escapes characters outside the BMP, like emoji, even with
+    # `allow_unicode`, so documents with them use the Python emitter
+    needs_python = [has_astral_chars(document) for document in documents]
+    if not any(needs_python):
+        return cast(str, yaml.dump_all(documents, Dumper=FAST_YAML_DUMPER, **kwargs))
+    explicit_start = kwargs.pop("explicit_start", False)
+    return "".join(
+        cast(
+            str,
+            yaml.dump(
+                document,
+                Dumper=YamlDumper if python else FAST_YAML_DUMPER,
+                # same separators `dump_all` writes between documents
+                explicit_start=explicit_start or index > 0,
+                **kwargs,
+            ),
+        )
+        for index, (document, python) in enumerate(zip(documents, needs_python))
+    )
+
+
+def dump_yaml(data: Any) -> str:
+    # we wrap in an OrderedDict since PyYaml sorts dict keys for some odd reason!
+    return dump_yaml_all([OrderedDict(data)])
 
 
 class YamlResponse(HttpResponse):
@@ -25,11 +99,8 @@ class YamlResponse(HttpResponse):
     def __init__(self, data, **kwargs):
         kwargs.setdefault("content_type", "text/x-yaml")
         if isinstance(data, list):
-            data = yaml.dump_all(data, default_flow_style=False, allow_unicode=True)
+            data = dump_yaml_all(data)
         else:
-            # we wrap in an OrderedDict since PyYaml sorts dict keys for some odd reason!
-            data = yaml.dump(
-                OrderedDict(data), default_flow_style=False, allow_unicode=True
-            )
+            data = dump_yaml(data)
 
         super().__init__(content=data, **kwargs)
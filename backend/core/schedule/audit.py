@@ -0,0 +1,58 @@
+"""
+Background log of generated shopping lists
+
+Shopping lists are only stored to debug bad combines, so we keep the write off
+the request path. Lists are rendered & inserted in batches by a background
+`BatchWriter`. Identical lists are stored once, keyed by a hash of their content,
+and rows older than `SHOPPING_LIST_RETENTION_DAYS` are deleted periodically.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.batching import BatchWriter
+from core.cumin.combine import IngredientList
+from core.models import ShoppingList
+from core.renderers import JSONRenderer
+
+PRUNE_INTERVAL_SEC = 60 * 60
+
+
+class ShoppingListLog(BatchWriter[IngredientList]):
+    name = "shopping-list-log"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._last_prune: float | None = None
+
+    def sync(self) -> bool:
+        return bool(settings.SHOPPING_LIST_LOG_SYNC)
+
+    def write(self, batch: list[IngredientList]) -> None:
+        rows: dict[str, ShoppingList] = {}
+        for ingredients in batch:
+            rendered = JSONRenderer().render(ingredients).decode()
+            ingredients_hash = hashlib.sha256(rendered.encode()).hexdigest()
+            rows[ingredients_hash] = ShoppingList(
+                ingredients=rendered, ingredients_hash=ingredients_hash
+            )
+        ShoppingList.objects.bulk_create(rows.values(), ignore_conflicts=True)
+        self._prune()
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        if self._last_prune is not None and now - self._last_prune < PRUNE_INTERVAL_SEC:
+            return
+        self._last_prune = now
+        ShoppingList.objects.filter(
+            created__lt=timezone.now()
+            - timedelta(days=settings.SHOPPING_LIST_RETENTION_DAYS)
+        ).delete()
+
+
+shopping_list_log = ShoppingListLog()
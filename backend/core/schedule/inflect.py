@@ -20,8 +20,11 @@ https://github.com/clips/pattern/blob/ec95f97b2e34c2232e7c43ef1e34e3f0dea6654b/p
 import re
 from typing import Dict, List, Optional, Tuple
 
+from core.cumin.caching import ParseCache
+
 VERB, NOUN, ADJECTIVE, ADVERB = "VB", "NN", "JJ", "RB"
 
+
 # PLURALIZE
 # Based on "An Algorithmic Approach to English Pluralization" by Damian Conway:
 # http://www.csse.monash.edu.au/~damian/papers/HTML/Plurals.html
@@ -829,15 +832,66 @@ singular_irregular = {
 }
 
 
+# For performance, precompute lookup tables for the word lists above so
+# singularize() doesn't have to loop over them:
+
+# A word is returned unchanged if an uninflected or uncountable word ends with
+# it, so store every suffix of those words.
+singular_unchanged_suffixes = frozenset(
+    x[i:]
+    for x in singular_uninflected | singular_uncountable
+    for i in range(len(x) + 1)
+)
+singular_ie_plurals = frozenset(x + "s" for x in singular_ie)
+singular_ie_plural_lengths = sorted({len(x) for x in singular_ie_plurals})
+# the first matching irregular word wins so keep track of the dict order
+singular_irregular_order = {x: i for i, x in enumerate(singular_irregular)}
+singular_irregular_lengths = sorted({len(x) for x in singular_irregular})
+singular_irregular_compiled = {
+    x: re.compile("(?i)" + x + "$") for x in singular_irregular
+}
+
+
+def _scoped_rule(regex: str) -> str:
+    """
+    r"(?i)(.)ae$" -> r"(?i:(.)ae$)"
+
+    Global flags are only allowed at the start of a pattern, so scope them to
+    the rule when combining the rules.
+    """
+    if regex.startswith("(?i)"):
+        return "(?i:" + regex[len("(?i)") :] + ")"
+    return "(?:" + regex + ")"
+
+
+# All the rules as one regex. Each rule is a lookahead that can match anywhere
+# in the word, like `re.search`, and the alternation tries the rules in order,
+# so the first rule that matches is the one whose group is set.
+singular_rules_combined = re.compile(
+    "|".join(
+        f"(?=(?s:.*?)(?P<rule{idx}>{_scoped_rule(regex)}))"
+        for idx, (regex, _) in enumerate(singular_rules)
+    )
+)
+
+
+@ParseCache
+def _singularize_cached(word: str, pos: str) -> str:
+    return _singularize(word, pos, custom=None)
+
+
 def singularize(
     word: str, pos: str = NOUN, custom: Optional[Dict[str, str]] = None
 ) -> str:
     """Returns the singular of a given word."""
-    if custom is None:
-        custom = {}
+    if not custom:
+        return _singularize_cached(word, pos)
     if word in custom:
         return custom[word]
+    return _singularize(word, pos, custom)
+
 
+def _singularize(word: str, pos: str, custom: Optional[Dict[str, str]]) -> str:
     # Recurse compound words (e.g. mothers-in-law).
     if "-" in word:
         w = word.split("-")
@@ -848,19 +902,28 @@ def singularize(
     # dogs' => dog's
     if word.endswith("'"):
         return singularize(word[:-1]) + "'s"
-    for x in singular_uninflected:
-        if x.endswith(word_normalized):
-            return word
-    for x in singular_uncountable:
-        if x.endswith(word_normalized):
-            return word
-    for x in singular_ie:
-        if word_normalized.endswith(x + "s"):
+    if word_normalized in singular_unchanged_suffixes:
+        return word
+    for length in singular_ie_plural_lengths:
+        if word_normalized[-length:] in singular_ie_plurals:
             return word_normalized
-    for x, value in singular_irregular.items():
-        if word_normalized.endswith(x):
-            return re.sub("(?i)" + x + "$", value, word)
-    for suffix, inflection in singular_rules_compiled:
-        if suffix.search(word):
-            return suffix.sub(inflection, word)
+    irregular = min(
+        (
+            word_normalized[-length:]
+            for length in singular_irregular_lengths
+            if word_normalized[-length:] in singular_irregular
+        ),
+        key=singular_irregular_order.__getitem__,
+        default=None,
+    )
+    if irregular is not None:
+        return singular_irregular_compiled[irregular].sub(
+            singular_irregular[irregular], word
+        )
+    match = singular_rules_combined.match(word)
+    if match is not None and match.lastgroup is not None:
+        suffix, inflection = singular_rules_compiled[
+            int(match.lastgroup[len("rule") :])
+        ]
+        return suffix.sub(inflection, word)
     return word
@@ -1,4 +1,5 @@
-from core.models import ScheduledRecipe
+from core.cumin.cat import normalize
+from core.models import CategoryOverride, ScheduledRecipe
 from core.recipes.serializers import RecipeSerializer
 from core.serialization import BaseModelSerializer
 
@@ -19,3 +20,15 @@ class ScheduledRecipeSerializerCreate(BaseModelSerializer):
     def create(self, validated_data):
         recipe = validated_data.pop("recipe")
         return recipe.schedule(**validated_data)
+
+
+class CategoryOverrideSerializer(BaseModelSerializer):
+    class Meta:
+        model = CategoryOverride
+        fields = ("id", "name", "category", "created", "modified")
+
+    def validate_name(self, value: str) -> str:
+        return normalize(value).strip()
+
+    def validate_category(self, value: str) -> str:
+        return value.strip()
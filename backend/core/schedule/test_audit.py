@@ -0,0 +1,37 @@
+from datetime import timedelta
+from fractions import Fraction
+
+import pytest
+from django.utils import timezone
+
+from core.cumin.combine import IngredientItem, Quantity
+from core.cumin.quantity import Unit
+from core.models import ShoppingList
+from core.schedule.audit import ShoppingListLog
+
+pytestmark = pytest.mark.django_db
+
+
+def test_identical_shopping_lists_are_stored_once() -> None:
+    log = ShoppingListLog()
+    eggs = {"egg": IngredientItem(quantities=[Quantity(Fraction(2), Unit.NONE)])}
+    log.submit(eggs)
+    log.submit(eggs)
+    assert ShoppingList.objects.count() == 1
+
+    log.submit({**eggs, "milk": IngredientItem(quantities=[])})
+    assert ShoppingList.objects.count() == 2
+
+
+def test_old_shopping_lists_are_pruned(settings) -> None:
+    settings.SHOPPING_LIST_RETENTION_DAYS = 7
+    ShoppingList.objects.create(
+        ingredients="{}", created=timezone.now() - timedelta(days=8)
+    )
+    recent = ShoppingList.objects.create(
+        ingredients="{}", created=timezone.now() - timedelta(days=6)
+    )
+
+    ShoppingListLog().submit({})
+    assert ShoppingList.objects.exclude(ingredients_hash=None).count() == 1
+    assert list(ShoppingList.objects.filter(ingredients_hash=None)) == [recent]
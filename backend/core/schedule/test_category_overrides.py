@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+
+import pytest
+from rest_framework import status
+
+from core.models import CategoryOverride
+
+pytestmark = pytest.mark.django_db
+
+
+def test_creating_category_overrides(client, user, team, user2):
+    url = f"/api/v1/t/{team.pk}/category-overrides/"
+
+    client.force_authenticate(user2)
+    res = client.post(url, {"name": "Soy Sauce", "category": "asian"})
+    assert res.status_code == status.HTTP_403_FORBIDDEN
+
+    client.force_authenticate(user)
+    res = client.post(url, {"name": "Soy Sauce", "category": "asian"})
+    assert res.status_code == status.HTTP_201_CREATED
+    assert res.json()["name"] == "soy sauce"
+
+    # posting the same name replaces the existing override
+    res = client.post(url, {"name": "soy sauce", "category": "aisle 4"})
+    assert res.status_code == status.HTTP_201_CREATED
+    assert CategoryOverride.objects.filter(team=team).count() == 1
+
+    res = client.get(url)
+    assert res.status_code == status.HTTP_200_OK
+    assert [(o["name"], o["category"]) for o in res.json()] == [
+        ("soy sauce", "aisle 4")
+    ]
+
+    res = client.delete(f"{url}{res.json()[0]['id']}/")
+    assert res.status_code == status.HTTP_204_NO_CONTENT
+    assert not CategoryOverride.objects.filter(team=team).exists()
+
+
+def test_personal_category_overrides_unsupported(client, user):
+    url = "/api/v1/t/me/category-overrides/"
+    client.force_authenticate(user)
+    assert client.get(url).json() == []
+    res = client.post(url, {"name": "egg", "category": "fridge"})
+    assert res.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_shopping_list_uses_team_overrides(client, user, team, recipe):
+    start = date(1976, 7, 6)
+    params = {"start": start, "end": start + timedelta(days=1)}
+    url = f"/api/v1/t/{team.pk}/shoppinglist/"
+    recipe.schedule(on=start, team=team)
+    CategoryOverride.objects.create(team=team, name="soy sauce", category="aisle 4")
+
+    client.force_authenticate(user)
+    res = client.get(url, params)
+    assert res.status_code == status.HTTP_200_OK
+    assert {name: item["category"] for name, item in res.json().items()} == {
+        "egg": "dairy",
+        "soy sauce": "aisle 4",
+    }
+
+    # personal shopping lists ignore the team's overrides
+    recipe.schedule(on=start, user=user)
+    res = client.get("/api/v1/t/me/shoppinglist/", params)
+    assert res.json()["soy sauce"]["category"] == "condiments"
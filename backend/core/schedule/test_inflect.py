@@ -0,0 +1,35 @@
+import pytest
+
+from core.schedule.inflect import singularize
+
+
+@pytest.mark.parametrize(
+    "word,expected",
+    [
+        # uninflected & uncountable words, along with their suffixes
+        ("flour", "flour"),
+        ("our", "our"),
+        ("cheese", "cheese"),
+        # irregular
+        ("leaves", "leaf"),
+        ("Geese", "goose"),
+        # rules
+        ("tomatoes", "tomato"),
+        ("berries", "berry"),
+        ("feta", "fetum"),
+        ("loaves", "loaf"),
+        ("scallions", "scallion"),
+        ("oxen", "ox"),
+        # compound words & possessives
+        ("mothers-in-law", "mother-in-law"),
+        ("dogs'", "dog's"),
+    ],
+)
+def test_singularize(word: str, expected: str) -> None:
+    assert singularize(word) == expected
+
+
+def test_singularize_custom() -> None:
+    assert singularize("apples", custom={"apples": "pomme"}) == "pomme"
+    assert singularize("apples", custom={"pears": "pear"}) == "apple"
+    assert singularize("apples") == "apple"
@@ -1,9 +1,11 @@
 import json
 from datetime import date, timedelta
-from decimal import Decimal
+from fractions import Fraction
 from typing import List, Tuple
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -59,6 +61,65 @@ def test_fetching_shoppinglist(client, user, recipe):
     assert json.loads(shopping_list.ingredients) == res.json()
 
 
+def test_fetching_shoppinglist_query_count(client, user, recipe, recipe2):
+    """
+    The number of queries shouldn't depend on the number of scheduled recipes
+    """
+    client.force_authenticate(user)
+    start = date(1976, 7, 6)
+    params = dict(start=start, end=start + timedelta(days=3))
+
+    recipe.schedule(user=user, on=start, count=2)
+    with CaptureQueriesContext(connection) as single:
+        res = client.get(url, params)
+    assert res.status_code == status.HTTP_200_OK
+
+    recipe.schedule(user=user, on=start + timedelta(days=1), count=1)
+    recipe2.schedule(user=user, on=start + timedelta(days=2), count=3)
+    with CaptureQueriesContext(connection) as many:
+        res = client.get(url, params)
+    assert res.status_code == status.HTTP_200_OK
+    assert res.json()["egg"]["quantities"] == [
+        {"quantity": "3", "unit": "POUND", "unknown_unit": None}
+    ]
+
+    assert len(many) == len(single)
+
+
+def test_fetching_shoppinglist_is_cached(client, user, recipe):
+    client.force_authenticate(user)
+    start = date(1976, 7, 6)
+    params = dict(start=start, end=start + timedelta(days=1))
+    scheduled = recipe.schedule(user=user, on=start, count=2)
+
+    with CaptureQueriesContext(connection) as uncached:
+        res = client.get(url, params)
+    assert res.json()["soy sauce"]["quantities"][0]["quantity"] == "4"
+
+    # the ingredients aren't fetched again
+    with CaptureQueriesContext(connection) as cached:
+        cached_res = client.get(url, params)
+    assert cached_res.json() == res.json()
+    assert len(cached) < len(uncached)
+    assert not any('"core_ingredient"."quantity"' in q["sql"] for q in cached)
+
+    # editing an ingredient of a scheduled recipe invalidates the list
+    soy_sauce = recipe.ingredients.get(name="soy sauce")
+    soy_sauce.quantity = "1 tablespoon"
+    soy_sauce.save()
+    res = client.get(url, params)
+    assert res.json()["soy sauce"]["quantities"][0]["quantity"] == "2"
+
+    # as does changing the schedule
+    scheduled.count = 1
+    scheduled.save()
+    res = client.get(url, params)
+    assert res.json()["soy sauce"]["quantities"][0]["quantity"] == "1"
+
+    scheduled.delete()
+    assert client.get(url, params).json() == {}
+
+
 def test_fetching_shoppinglist_with_team_recipe(client, team, user, recipe):
 
     client.force_authenticate(user)
@@ -142,7 +203,7 @@ def test_scheduling_multiple_times_some_ingredient(
             [("1/2", "lemon"), ("1", "lemon"), ("2", "lemons")],
             {
                 "lemons": IngredientItem(
-                    quantities=[Quantity(quantity=Decimal(3.5), unit=Unit.NONE)]
+                    quantities=[Quantity(quantity=Fraction(7, 2), unit=Unit.NONE)]
                 )
             },
         ),
@@ -150,7 +211,7 @@ def test_scheduling_multiple_times_some_ingredient(
             [("1", "bay leaf"), ("4", "bay leaves")],
             {
                 "bay leaves": IngredientItem(
-                    quantities=[Quantity(quantity=Decimal(5), unit=Unit.NONE)]
+                    quantities=[Quantity(quantity=Fraction(5), unit=Unit.NONE)]
                 )
             },
         ),
@@ -158,7 +219,7 @@ def test_scheduling_multiple_times_some_ingredient(
             [("1", "large tomato"), ("2", "large tomatoes")],
             {
                 "large tomatoes": IngredientItem(
-                    quantities=[Quantity(quantity=Decimal(3), unit=Unit.NONE)]
+                    quantities=[Quantity(quantity=Fraction(3), unit=Unit.NONE)]
                 )
             },
         ),
@@ -166,7 +227,7 @@ def test_scheduling_multiple_times_some_ingredient(
             [("4-5", "medium button mushrooms"), ("4-5", "medium button mushrooms")],
             {
                 "medium button mushrooms": IngredientItem(
-                    quantities=[Quantity(quantity=Decimal(10), unit=Unit.NONE)]
+                    quantities=[Quantity(quantity=Fraction(10), unit=Unit.NONE)]
                 )
             },
         ),
@@ -180,8 +241,8 @@ def test_scheduling_multiple_times_some_ingredient(
             {
                 "black pepper": IngredientItem(
                     quantities=[
-                        Quantity(quantity=Decimal(3), unit=Unit.TABLESPOON),
-                        Quantity(quantity=Decimal(2), unit=Unit.SOME),
+                        Quantity(quantity=Fraction(3), unit=Unit.TABLESPOON),
+                        Quantity(quantity=Fraction(2), unit=Unit.SOME),
                     ]
                 )
             },
@@ -195,8 +256,8 @@ def test_scheduling_multiple_times_some_ingredient(
             {
                 "basil leaves": IngredientItem(
                     quantities=[
-                        Quantity(quantity=Decimal(16), unit=Unit.NONE),
-                        Quantity(quantity=Decimal(2), unit=Unit.SOME),
+                        Quantity(quantity=Fraction(16), unit=Unit.NONE),
+                        Quantity(quantity=Fraction(2), unit=Unit.SOME),
                     ]
                 )
             },
@@ -208,7 +269,7 @@ def test_scheduling_multiple_times_some_ingredient(
             ],
             {
                 "extra virgin olive oil": IngredientItem(
-                    quantities=[Quantity(quantity=Decimal(9), unit=Unit.TABLESPOON)]
+                    quantities=[Quantity(quantity=Fraction(9), unit=Unit.TABLESPOON)]
                 )
             },
         ),
@@ -216,7 +277,7 @@ def test_scheduling_multiple_times_some_ingredient(
             [("1", "garlic clove")],
             {
                 "garlic clove": IngredientItem(
-                    quantities=[Quantity(quantity=Decimal(1), unit=Unit.NONE)]
+                    quantities=[Quantity(quantity=Fraction(1), unit=Unit.NONE)]
                 )
             },
         ),
@@ -224,7 +285,7 @@ def test_scheduling_multiple_times_some_ingredient(
             [("8", "Garlic Cloves"), ("1", "garlic clove")],
             {
                 "garlic cloves": IngredientItem(
-                    quantities=[Quantity(quantity=Decimal(9), unit=Unit.NONE)]
+                    quantities=[Quantity(quantity=Fraction(9), unit=Unit.NONE)]
                 )
             },
         ),
@@ -233,8 +294,8 @@ def test_scheduling_multiple_times_some_ingredient(
             {
                 "scallions": IngredientItem(
                     quantities=[
-                        Quantity(quantity=Decimal(2), unit=Unit.TABLESPOON),
-                        Quantity(quantity=Decimal(4), unit=Unit.NONE),
+                        Quantity(quantity=Fraction(2), unit=Unit.TABLESPOON),
+                        Quantity(quantity=Fraction(4), unit=Unit.NONE),
                     ]
                 )
             },
@@ -243,7 +304,7 @@ def test_scheduling_multiple_times_some_ingredient(
             [("2 tbs", "soy sauce")],
             {
                 "soy sauce": IngredientItem(
-                    quantities=[Quantity(quantity=Decimal(2), unit=Unit.TABLESPOON)]
+                    quantities=[Quantity(quantity=Fraction(2), unit=Unit.TABLESPOON)]
                 )
             },
         ),
@@ -253,7 +314,7 @@ def test_scheduling_multiple_times_some_ingredient(
                 "tomato": IngredientItem(
                     quantities=[
                         Quantity(
-                            quantity=Decimal("4.204622864866847967783965457"),
+                            quantity=2 + Fraction(1000) / (16 * Fraction("28.34952")),
                             unit=Unit.POUND,
                         )
                     ]
@@ -264,7 +325,7 @@ def test_scheduling_multiple_times_some_ingredient(
             [("1 teaspoon + 1 Tablespoon", "ginger"), ("1 teaspoon", "Ginger")],
             {
                 "ginger": IngredientItem(
-                    quantities=[Quantity(quantity=Decimal(5), unit=Unit.TEASPOON)]
+                    quantities=[Quantity(quantity=Fraction(5), unit=Unit.TEASPOON)]
                 )
             },
         ),
@@ -272,7 +333,7 @@ def test_scheduling_multiple_times_some_ingredient(
             [("1/2 cup", "scallions")],
             {
                 "scallions": IngredientItem(
-                    quantities=[Quantity(quantity=Decimal(0.5), unit=Unit.CUP)]
+                    quantities=[Quantity(quantity=Fraction(1, 2), unit=Unit.CUP)]
                 )
             },
         ),
@@ -280,7 +341,7 @@ def test_scheduling_multiple_times_some_ingredient(
             [("½ cup", "scallions")],
             {
                 "scallions": IngredientItem(
-                    quantities=[Quantity(quantity=Decimal(0.5), unit=Unit.CUP)]
+                    quantities=[Quantity(quantity=Fraction(1, 2), unit=Unit.CUP)]
                 )
             },
         ),
@@ -295,8 +356,8 @@ def test_scheduling_multiple_times_some_ingredient(
             {
                 "lemons": IngredientItem(
                     quantities=[
-                        Quantity(quantity=Decimal(4.5), unit=Unit.NONE),
-                        Quantity(quantity=Decimal(1), unit=Unit.SOME),
+                        Quantity(quantity=Fraction(9, 2), unit=Unit.NONE),
+                        Quantity(quantity=Fraction(1), unit=Unit.SOME),
                     ]
                 )
             },
@@ -1,11 +1,13 @@
 from datetime import date
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from core.models import Recipe, ScheduledRecipe, Team, User
+from core.models import Recipe, ScheduledRecipe, Team, User, user_active_team_ids
 from core.models.membership import Membership
 
 pytestmark = pytest.mark.django_db
@@ -26,6 +28,22 @@ def test_adding_to_team_calendar(client, user, team, recipe):
     assert scheduled.team is not None and scheduled.team.pk == team.pk
 
 
+def test_team_calendar_settings_resolve_membership_once(client, user, team):
+    client.force_authenticate(user)
+    url = reverse("calendar-update-settings", kwargs={"team_pk": team.pk})
+    user_active_team_ids(user)
+    with CaptureQueriesContext(connection) as queries:
+        res = client.patch(url, {"syncEnabled": True})
+    assert res.status_code == status.HTTP_200_OK
+    assert res.json()["syncEnabled"] is True
+    lookups = [
+        q["sql"]
+        for q in queries
+        if q["sql"].startswith("SELECT") and '"core_membership"."user_id" =' in q["sql"]
+    ]
+    assert len(lookups) == 1, lookups
+
+
 def test_removing_from_team_calendar(client, user, team, recipe):
     scheduled = recipe.schedule(on=date(1976, 1, 2), team=team)
     url = reverse("calendar-detail", kwargs={"team_pk": team.pk, "pk": scheduled.id})
@@ -1,11 +1,13 @@
+import hashlib
 import logging
-from typing import List, Optional, TypeVar, cast
+from typing import Optional, TypeVar, cast
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import connection
-from django.db.models import QuerySet
-from django.shortcuts import get_object_or_404
-from rest_framework import serializers, status
+from django.db.models import Count, Max, QuerySet
+from django.http import Http404
+from rest_framework import mixins, serializers, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -13,19 +15,15 @@ from rest_framework.views import APIView
 from typing_extensions import TypedDict
 
 from core import viewsets
-from core.auth.permissions import IsTeamMember
-from core.cumin.cat import category
-from core.cumin.combine import Ingredient, combine_ingredients
-from core.models import (
-    Membership,
-    ScheduledRecipe,
-    ShoppingList,
-    Team,
-    get_random_ical_id,
-)
-from core.renderers import JSONRenderer
+from core.auth.permissions import IsTeamMember, get_team_membership
+from core.cumin.cat import categorize_many
+from core.cumin.combine import Ingredient, IngredientList, combine_ingredients
+from core.models import CategoryOverride, ScheduledRecipe, get_random_ical_id
+from core.models.deletion_log import DeletionLog, delete_and_log
 from core.request import AuthedRequest
+from core.schedule.audit import shopping_list_log
 from core.schedule.serializers import (
+    CategoryOverrideSerializer,
     ScheduledRecipeSerializer,
     ScheduledRecipeSerializerCreate,
 )
@@ -51,10 +49,7 @@ def get_scheduled_recipes(
             QuerySet[ScheduledRecipe], request.user.scheduled_recipes
         )
     else:
-        team = Team.objects.filter(pk=team_pk).first()
-        if team is None:
-            return None
-        scheduled_recipes = team.scheduled_recipes
+        scheduled_recipes = get_team_membership(request, team_pk).team.scheduled_recipes
 
     try:
         return scheduled_recipes.filter(on__gte=start).filter(on__lte=end)
@@ -62,6 +57,61 @@ def get_scheduled_recipes(
         return None
 
 
+# Cached lists are keyed by a fingerprint of their inputs so they never need
+# to be invalidated, the timeout only bounds how long stale lists are kept.
+SHOPPING_LIST_CACHE_TIMEOUT_SEC = 60 * 60 * 24
+
+
+def get_combined_ingredients(
+    scheduled_recipes: QuerySet[ScheduledRecipe], *, owner: str
+) -> IngredientList:
+    """
+    Combine the ingredients of the scheduled recipes, reusing a cached result
+    when neither the scheduled recipes nor their ingredients have changed.
+
+    Any save of a scheduled recipe or one of its ingredients bumps `modified`
+    and deletes change the counts, so either changes the fingerprint.
+    """
+    fingerprint = scheduled_recipes.aggregate(
+        scheduled_count=Count("id", distinct=True),
+        scheduled_modified=Max("modified"),
+        ingredient_count=Count("recipe__ingredient"),
+        ingredient_modified=Max("recipe__ingredient__modified"),
+    )
+    if not fingerprint["scheduled_count"]:
+        return combine_ingredients([])
+
+    # the query includes the owner & date range of the scheduled recipes
+    digest = hashlib.sha256(
+        repr(sorted(fingerprint.items())).encode()
+        + str(scheduled_recipes.query).encode()
+    ).hexdigest()
+    cache_key = f"shoppinglist:{owner}:{digest}"
+    cached: Optional[IngredientList] = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # one row per (scheduled recipe, ingredient), weighted by how many times
+    # the recipe is scheduled
+    rows = (
+        scheduled_recipes.filter(recipe__ingredient__isnull=False)
+        .order_by("-on", "id", "recipe__ingredient__created")
+        .values_list(
+            "count",
+            "recipe__ingredient__quantity",
+            "recipe__ingredient__name",
+            "recipe__ingredient__description",
+        )
+    )
+
+    ingredient_mapping = combine_ingredients(
+        Ingredient(quantity=quantity, name=name, description=description, count=count)
+        for count, quantity, name, description in rows
+    )
+    cache.set(cache_key, ingredient_mapping, SHOPPING_LIST_CACHE_TIMEOUT_SEC)
+    return ingredient_mapping
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, IsTeamMember])
 def get_shopping_list_view(request: AuthedRequest, team_pk: str) -> Response:
@@ -69,26 +119,28 @@ def get_shopping_list_view(request: AuthedRequest, team_pk: str) -> Response:
     if scheduled_recipes is None:
         return Response(status=status.HTTP_400_BAD_REQUEST)
 
-    ingredients: List[Ingredient] = []
-    for scheduled_recipe in scheduled_recipes:
-        for _ in range(scheduled_recipe.count):
-            ingredients += (
-                scheduled_recipe.recipe.ingredients  # type: ignore [arg-type]
+    owner = (
+        f"user:{request.user.id}"
+        if team_pk in {"personal", "me"}
+        else f"team:{team_pk}"
+    )
+    ingredient_mapping = get_combined_ingredients(scheduled_recipes, owner=owner)
+
+    # categorize outside of the cache so category override edits apply at once
+    overrides = (
+        None
+        if team_pk in {"personal", "me"}
+        else dict(
+            CategoryOverride.objects.filter(team=team_pk).values_list(
+                "name", "category"
             )
-
-    ingredients = [
-        Ingredient(quantity=i.quantity, name=i.name, description=i.description)
-        for i in ingredients
-    ]
-
-    ingredient_mapping = combine_ingredients(ingredients)
-
+        )
+    )
+    categories = categorize_many(ingredient_mapping, overrides)
     for ingredient in ingredient_mapping:
-        ingredient_mapping[ingredient].category = category(ingredient)
+        ingredient_mapping[ingredient].category = categories[ingredient]
 
-    ShoppingList.objects.create(
-        ingredients=JSONRenderer().render(ingredient_mapping).decode()
-    )
+    shopping_list_log.submit(ingredient_mapping)
 
     return Response(ingredient_mapping, status=status.HTTP_200_OK)
 
@@ -104,13 +156,51 @@ class ReportBadMerge(APIView):
         return Response(status=status.HTTP_201_CREATED)
 
 
+class CategoryOverrideViewSet(viewsets.ListModelViewSet, mixins.DestroyModelMixin):
+    """
+    Team specific ingredient departments for /t/<team>/category-overrides
+
+    List - return all overrides for the team
+    Create - set the category for a name, replacing any existing override
+    Destroy - remove existing override
+
+    Only teams store overrides, personal shopping lists use the defaults.
+    """
+
+    serializer_class = CategoryOverrideSerializer
+    permission_classes = (IsAuthenticated, IsTeamMember)
+
+    def get_queryset(self):
+        pk = self.kwargs["team_pk"]
+        if pk == "me":
+            return CategoryOverride.objects.none()
+        return CategoryOverride.objects.filter(team=pk).order_by("name")
+
+    def create(  # type: ignore [override]
+        self, request: AuthedRequest, team_pk: str
+    ) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if team_pk == "me":
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        team = get_team_membership(request, team_pk).team
+        override, _ = CategoryOverride.objects.update_or_create(
+            team=team,
+            name=serializer.validated_data["name"],
+            defaults={"category": serializer.validated_data["category"]},
+        )
+        return Response(
+            self.get_serializer(override).data, status=status.HTTP_201_CREATED
+        )
+
+
 class CalSettings(TypedDict):
     syncEnabled: bool
     calendarLink: str
 
 
 def get_cal_settings(*, team_pk: str, request: AuthedRequest) -> CalSettings:
-    membership = Membership.objects.get(team=team_pk, user=request.user)
+    membership = unwrap(get_team_membership(request, team_pk).membership)
 
     method = "https" if request.is_secure() else "http"
     calendar_link = (
@@ -144,7 +234,7 @@ class CalendarViewSet(viewsets.ModelViewSet):
             return ScheduledRecipe.objects.filter(
                 user=self.request.user
             ).select_related("recipe")
-        team = get_object_or_404(Team, pk=pk)
+        team = get_team_membership(self.request, pk).team
         return ScheduledRecipe.objects.filter(team=team).select_related("recipe")
 
     def create(  # type: ignore [override]
@@ -158,20 +248,29 @@ class CalendarViewSet(viewsets.ModelViewSet):
         if team_pk == "me":
             data = serializer.save(user=request.user)
         else:
-            team = get_object_or_404(Team, pk=team_pk)
+            team = get_team_membership(request, team_pk).team
             data = serializer.save(team=team)
         return Response(
             self.get_serializer(data, dangerously_allow_db=True).data,
             status=status.HTTP_201_CREATED,
         )
 
+    def perform_destroy(self, instance: ScheduledRecipe) -> None:
+        delete_and_log(
+            DeletionLog.SCHEDULED_RECIPE,
+            ScheduledRecipe.objects.filter(pk=instance.pk),
+            "recipe_id",
+        )
+
     @action(detail=False, methods=["PATCH"], url_path="settings")
     def update_settings(self, request: AuthedRequest, team_pk: str) -> Response:
         serializer = CalSettingsSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         sync_enabled = serializer.validated_data["syncEnabled"]
 
-        membership = get_object_or_404(Membership, team=team_pk, user=request.user)
+        membership = get_team_membership(request, team_pk).membership
+        if membership is None:
+            raise Http404
         membership.calendar_sync_enabled = sync_enabled
         membership.save()
 
@@ -179,7 +278,9 @@ class CalendarViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["POST"])
     def generate_link(self, request: AuthedRequest, team_pk: str) -> Response:
-        membership = get_object_or_404(Membership, team=team_pk, user=request.user)
+        membership = get_team_membership(request, team_pk).membership
+        if membership is None:
+            raise Http404
         membership.calendar_secret_key = get_random_ical_id()
         membership.save()
 
@@ -128,6 +128,36 @@ if DEBUG and not TESTING:
 
 API_DELAY_MS = 200
 
+# Max number of distinct strings kept by each of the ingredient parsing caches
+# in `core.cumin.quantity`, `core.cumin.cat` and `core.schedule.inflect`.
+# Ingredient text repeats heavily across recipes and shopping lists so most
+# parses are served from the cache.
+CUMIN_PARSE_CACHE_SIZE = int(os.getenv("CUMIN_PARSE_CACHE_SIZE", 8192))
+
+# Generated shopping lists are logged in the background for debugging bad
+# combines, see `core.schedule.audit`. Rows older than this are deleted.
+SHOPPING_LIST_RETENTION_DAYS = int(os.getenv("SHOPPING_LIST_RETENTION_DAYS", 30))
+# Write the log inline with the request, tests rely on this to see the rows.
+SHOPPING_LIST_LOG_SYNC = TESTING
+# Same for recipe views, see `core.recipes.view_log`.
+RECIPE_VIEW_LOG_SYNC = TESTING
+# And for stored recipe documents, see `core.recipes.documents`.
+RECIPE_DOCUMENT_STORE_SYNC = TESTING
+
+# Oldest `since` the recipe list's sync mode accepts, older clients do a full
+# sync instead. Deletion tombstones are kept this long.
+SYNC_RETENTION_DAYS = int(os.getenv("SYNC_RETENTION_DAYS", 30))
+
+# Where `process_export_jobs` writes export archives, `local` stores them under
+# EXPORT_DIRECTORY, `s3` in the upload bucket.
+EXPORT_STORAGE = os.getenv("EXPORT_STORAGE", "local")
+EXPORT_DIRECTORY = os.getenv("EXPORT_DIRECTORY", os.path.join(BASE_DIR, "exports"))
+# Finished jobs & their archives are deleted after this many days.
+EXPORT_RETENTION_DAYS = int(os.getenv("EXPORT_RETENTION_DAYS", 7))
+# Running jobs without a heartbeat for this long are assumed to belong to a
+# dead worker and are picked up again.
+EXPORT_JOB_TIMEOUT_SEC = int(os.getenv("EXPORT_JOB_TIMEOUT_SEC", 10 * 60))
+
 AUTH_USER_MODEL = "core.User"
 
 ROOT_URLCONF = "core.urls"
@@ -170,6 +200,23 @@ DATABASES["default"] = dj_database_url.config(conn_max_age=600)
 
 ERROR_ON_SERIALIZER_DB_ACCESS = DEBUG or TESTING
 
+# `default` is shared by all the gunicorn workers, the table is created by
+# migration 0108. `local` is a per-process cache for small entries that are
+# cheaper to rebuild than to fetch, like the cached team ids.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "django_cache"),
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 50_000))},
+    },
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "OPTIONS": {"MAX_ENTRIES": 10_000},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
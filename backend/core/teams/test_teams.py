@@ -1,8 +1,10 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
-from core.models import Invite, Membership, Team
+from core.models import Invite, Membership, Team, User, user_active_team_ids
 
 pytestmark = pytest.mark.django_db
 
@@ -794,3 +796,41 @@ def test_deleting_last_membership_of_team(client, team, user):
     client.force_authenticate(user)
     res = client.delete(url)
     assert res.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_user_active_team_ids_follow_membership_changes(user, user2, team):
+    assert user_active_team_ids(User.objects.get(pk=user2.pk)) == []
+    assert user_active_team_ids(user) == [team.pk]
+    with CaptureQueriesContext(connection) as queries:
+        user_active_team_ids(user)
+    assert len(queries) == 0, "team ids should be cached"
+
+    team.force_join(user2)
+    assert user_active_team_ids(User.objects.get(pk=user2.pk)) == [team.pk]
+
+    team.kick_user(user2)
+    assert user_active_team_ids(User.objects.get(pk=user2.pk)) == []
+
+
+def test_team_access_version_only_follows_access_changes(user, user2, team):
+    team.force_join(user2, level=Membership.READ_ONLY)
+    membership = Membership.objects.get(user=user2, team=team)
+    version = User.objects.get(pk=user2.pk).team_access_version
+
+    membership.calendar_sync_enabled = True
+    membership.save()
+    Membership.objects.get(pk=membership.pk).save(update_fields=["calendar_secret_key"])
+    assert User.objects.get(pk=user2.pk).team_access_version == version
+
+    membership.level = Membership.CONTRIBUTOR
+    membership.save()
+    assert User.objects.get(pk=user2.pk).team_access_version == version + 1
+
+    membership.delete()
+    assert User.objects.get(pk=user2.pk).team_access_version == version + 2
+
+
+def test_team_member_check_missing_team(client, user, team):
+    client.force_authenticate(user)
+    assert client.get(f"/api/v1/t/{team.pk}/members/").status_code == status.HTTP_200_OK
+    assert client.get("/api/v1/t/0/members/").status_code == status.HTTP_404_NOT_FOUND
@@ -1,6 +1,5 @@
 from typing import Any, Tuple, cast
 
-from django.shortcuts import get_object_or_404
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
@@ -11,6 +10,7 @@ from core.auth.permissions import (
     IsTeamAdmin,
     IsTeamAdminOrMembershipOwner,
     IsTeamMember,
+    get_team_membership,
 )
 from core.models import Invite, Team
 from core.request import AuthedRequest
@@ -50,7 +50,7 @@ class TeamInviteViewSet(
         We want id, user object, and team data response
         need to use to_representation or form_represenation
         """
-        team = Team.objects.get(pk=team_pk)
+        team = get_team_membership(request, team_pk).team
         serializer = CreateInviteSerializer(data={**request.data, "team": team})
         serializer.is_valid(raise_exception=True)
         invite = serializer.save(team=team, creator=self.request.user)
@@ -150,7 +150,7 @@ class MembershipViewSet(
     serializer_class = MembershipSerializer
 
     def get_queryset(self):
-        team = get_object_or_404(Team.objects.all(), pk=self.kwargs["team_pk"])
+        team = get_team_membership(self.request, self.kwargs["team_pk"]).team
         return team.membership_set.select_related("user").all()
 
     def get_permissions(self):
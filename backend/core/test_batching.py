@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pytest
+
+from core.batching import BatchWriter
+
+
+class ListWriter(BatchWriter[int]):
+    name = "list-writer"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[list[int]] = []
+
+    def write(self, batch: list[int]) -> None:
+        self.batches.append(batch)
+
+
+def test_batch_writer_requires_write() -> None:
+    class NoWrite(BatchWriter[int]):
+        name = "no-write"
+
+    with pytest.raises(TypeError):
+        NoWrite()  # type: ignore [abstract]
+
+
+def test_batch_writer_flush() -> None:
+    writer = ListWriter()
+    writer._queue.put_nowait(1)
+    writer._queue.put_nowait(2)
+    writer.flush()
+    assert writer.batches == [[1, 2]]
+    writer.flush()
+    assert writer.batches == [[1, 2]]
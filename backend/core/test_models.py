@@ -1,6 +1,8 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from core.models import Recipe, Team, User
+from core.models import Ingredient, Recipe, Section, Step, Team, User
 
 pytestmark = pytest.mark.django_db
 
@@ -93,6 +95,7 @@ def test_recipe_copy_to(client, team: Team, user: User, recipe: Recipe) -> None:
 
     assert recipe != team_recipe
     assert team_recipe.owner == team and recipe.owner == user
+    assert team_recipe.name == recipe.name
 
     for a, b in [
         (recipe.steps.values(), team_recipe.steps.values()),
@@ -107,3 +110,36 @@ def test_recipe_copy_to(client, team: Team, user: User, recipe: Recipe) -> None:
                 x.pop(key)
                 y.pop(key)
             assert x == y
+
+
+def test_recipe_duplicate_query_count(user: User, recipe: Recipe) -> None:
+    """
+    Duplicating copies steps, ingredients & sections with a fixed number of
+    queries
+    """
+    with CaptureQueriesContext(connection) as small:
+        recipe.duplicate(actor=user)
+    assert not any(
+        q["sql"].startswith("SELECT") and 'FROM "core_recipe"' in q["sql"]
+        for q in small
+    ), "the recipe is copied from the instance, not re-read"
+    for position in range(20):
+        Ingredient.objects.create(
+            quantity="1",
+            name=f"ingredient {position}",
+            position=position,
+            recipe=recipe,
+        )
+        Step.objects.create(text=f"step {position}", position=position, recipe=recipe)
+    with CaptureQueriesContext(connection) as large:
+        copy = recipe.duplicate(actor=user)
+    assert len(large) == len(small)
+
+    assert copy.name == "Recipe name (copy)"
+    for model in (Step, Ingredient, Section):
+        positions = model.objects.order_by("position").values_list(
+            "position", flat=True
+        )
+        assert list(positions.filter(recipe=copy)) == list(
+            positions.filter(recipe=recipe)
+        )
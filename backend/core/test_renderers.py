@@ -1,5 +1,6 @@
 import json
 from decimal import Decimal
+from fractions import Fraction
 
 from core.renderers import JSONRenderer
 
@@ -23,3 +24,17 @@ def test_decimal_encoding() -> None:
         larger_than_float="2000000.12345679",
         rounding_errors="6.5",
     )
+
+
+def test_fraction_encoding() -> None:
+    data = dict(
+        whole_number=Fraction(750),
+        third=Fraction(1, 3),
+        eighth=Fraction(1, 8),
+    )
+
+    assert json.loads(JSONRenderer().render(data)) == dict(
+        whole_number="750",
+        third="0.33333333",
+        eighth="0.125",
+    )
@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from typing import Any
+
+import pytest
+import yaml
+
+from core import response
+from core.response import dump_yaml, dump_yaml_all
+
+
+class ReturnDict(OrderedDict):  # type: ignore [type-arg]
+    """like the `OrderedDict` subclass DRF serializers return"""
+
+
+RECIPE: "OrderedDict[str, Any]" = OrderedDict(
+    [
+        ("name", "Brandied Pumpkin Pie"),
+        ("servings", None),
+        ("ingredients", [OrderedDict([("quantity", "1 cup"), ("name", "flour")])]),
+        ("steps", ["Make the crust", "Bake"]),
+        ("owner", {"user": "john@doe.org"}),
+        ("tags", []),
+    ]
+)
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_dump_yaml_keeps_key_order(monkeypatch: pytest.MonkeyPatch, fast: bool) -> None:
+    if not fast:
+        monkeypatch.setattr(response, "FAST_YAML_DUMPER", None)
+    assert dump_yaml(ReturnDict(RECIPE)) == (
+        """\
+name: Brandied Pumpkin Pie
+servings: null
+ingredients:
+- quantity: 1 cup
+  name: flour
+steps:
+- Make the crust
+- Bake
+owner:
+  user: john@doe.org
+tags: []
+"""
+    )
+    assert dump_yaml_all([RECIPE, RECIPE]) == (
+        dump_yaml(RECIPE) + "---\n" + dump_yaml(RECIPE)
+    )
+
+
+def test_dump_yaml_keeps_emoji() -> None:
+    assert dump_yaml({"name": "foo 🦠", "notes": "C:\\Users"}) == (
+        "name: foo 🦠\nnotes: C:\\Users\n"
+    )
+
+
+def test_dump_yaml_only_renders_emoji_documents_in_python(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    python_documents = []
+
+    class RecordingDumper(response.YamlDumper):
+        def represent(self, data: Any) -> None:
+            python_documents.append(data)
+            super().represent(data)
+
+    monkeypatch.setattr(response, "YamlDumper", RecordingDumper)
+    emoji = OrderedDict(name="foo 🦠")
+    plain = OrderedDict(name="foo", notes="C:\\Users")
+    assert dump_yaml_all([plain, emoji, plain]) == (
+        "name: foo\nnotes: C:\\Users\n---\nname: foo 🦠\n---\nname: foo\nnotes: C:\\Users\n"
+    )
+    if response.FAST_YAML_DUMPER is not None:
+        assert python_documents == [emoji]
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_dump_yaml_round_trips(monkeypatch: pytest.MonkeyPatch, fast: bool) -> None:
+    if not fast:
+        monkeypatch.setattr(response, "FAST_YAML_DUMPER", None)
+    # double quoted, the emitters wrap these differently
+    recipe = OrderedDict(
+        name="Pie\t",
+        steps=["mix  \nwell", "x" * 100 + " \t" + "y" * 100, "bake 🦠 \n"],
+    )
+    documents = [recipe, OrderedDict(name="plain"), recipe]
+    assert list(yaml.safe_load_all(dump_yaml_all(documents))) == documents
+
+
+def test_dump_yaml_is_safe() -> None:
+    with pytest.raises(yaml.representer.RepresenterError):
+        dump_yaml({"value": object()})
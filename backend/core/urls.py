@@ -4,6 +4,11 @@ from rest_framework.routers import DefaultRouter
 
 from core.auth.registration.views import RegisterView
 from core.auth.views import LoginView, LogoutView, PasswordChangeView
+from core.export.job_views import (
+    export_create_view,
+    export_detail_view,
+    export_download_view,
+)
 from core.export.views import export_recipes
 from core.ical.views import get_ical_view
 from core.recipes.views.ingredients_detail_view import ingredients_detail_view
@@ -19,6 +24,7 @@ from core.recipes.views.recently_created_recipes_view import (
 from core.recipes.views.recently_view_recipes_view import get_recently_viewed_recipes
 from core.recipes.views.recipe_copy_view import recipe_copy_view
 from core.recipes.views.recipe_duplicate_view import recipe_duplicate_view
+from core.recipes.views.recipe_import_view import recipe_import_view
 from core.recipes.views.recipe_move_view import recipe_move_view
 from core.recipes.views.sections_view import (
     create_section_view,
@@ -27,7 +33,12 @@ from core.recipes.views.sections_view import (
 from core.recipes.views.steps_detail_view import steps_detail_view
 from core.recipes.views.steps_list_view import steps_list_view
 from core.recipes.views.timeline_view import get_recipe_timeline
-from core.schedule.views import CalendarViewSet, ReportBadMerge, get_shopping_list_view
+from core.schedule.views import (
+    CalendarViewSet,
+    CategoryOverrideViewSet,
+    ReportBadMerge,
+    get_shopping_list_view,
+)
 from core.teams.views import (
     MembershipViewSet,
     TeamInviteViewSet,
@@ -50,6 +61,11 @@ teams_router = DefaultRouter()
 teams_router.register(r"members", MembershipViewSet, basename="team-member")
 teams_router.register(r"invites", TeamInviteViewSet, basename="team-invites")
 teams_router.register(r"calendar", CalendarViewSet, basename="calendar")
+teams_router.register(
+    r"category-overrides",
+    CategoryOverrideViewSet,
+    basename="team-category-overrides",
+)
 
 urlpatterns = [
     path("api/v1/", include(router.urls)),
@@ -59,6 +75,9 @@ urlpatterns = [
     path("api/v1/auth/password/reset/", password_reset_view),
     path("api/v1/auth/password/reset/confirm/", password_reset_confirm_view),
     path("api/v1/auth/registration/", RegisterView.as_view(), name="rest_register"),
+    path("api/v1/exports/", export_create_view),
+    path("api/v1/exports/<int:export_pk>/", export_detail_view),
+    path("api/v1/exports/<int:export_pk>/download", export_download_view),
     path("api/v1/notes/<int:note_pk>/", note_detail_view),
     path("api/v1/notes/<int:note_pk>/reactions/", note_reaction_create_view),
     path("api/v1/reactions/<str:reaction_pk>/", note_reaction_delete_view),
@@ -77,6 +96,7 @@ urlpatterns = [
     path("api/v1/recipes/<int:recipe_pk>/steps/", steps_list_view),
     path("api/v1/recipes/<int:recipe_pk>/steps/<int:step_pk>/", steps_detail_view),
     path("api/v1/recipes/<int:recipe_pk>/timeline", get_recipe_timeline),
+    path("api/v1/recipes/import/", recipe_import_view),
     path("api/v1/recipes/recently_viewed", get_recently_viewed_recipes),
     path("api/v1/recipes/recently_created", get_recently_created_recipes),
     path("api/v1/report-bad-merge", ReportBadMerge.as_view(), name="report-bad-merge"),
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from django.db import connection
+from django.http import Http404
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.exceptions import MethodNotAllowed
@@ -11,43 +12,50 @@ from core.models import (
     ChangeType,
     RecipeChange,
     TimelineEvent,
+    user_and_team_full_recipe_or_404,
+    user_and_team_full_recipes,
     user_and_team_recipe_or_404,
+    user_and_team_recipes,
 )
+from core.recipes.documents import get_documents, recipe_fingerprints
 from core.recipes.serializers import RecipeSerializer
+from core.recipes.view_log import recipe_view_log
 from core.request import AuthedRequest
 
 
 def recipe_get_view(request: AuthedRequest, recipe_pk: str) -> Response:
-    recipe = user_and_team_recipe_or_404(user=request.user, recipe_pk=recipe_pk)
-    with connection.cursor() as cursor:
-        cursor.execute(
-            """
-            INSERT INTO recipe_view (recipe_id, user_id, last_visited_at, count, created, modified)
-            VALUES (%(recipe_id)s, %(user_id)s, now(), 1, now(), now())
-            ON CONFLICT
-            ON CONSTRAINT one_user_view_row_per_recipe
-            DO UPDATE SET
-                last_visited_at =
-                    CASE WHEN recipe_view.last_visited_at < now() - '1 hour'::interval THEN
-                        now()
-                    ELSE
-                        recipe_view.last_visited_at
-                    END,
-                count =
-                    CASE WHEN recipe_view.last_visited_at < now() - '1 hour'::interval THEN
-                        recipe_view.count + 1
-                    ELSE
-                        recipe_view.count
-                    END
-            """,
-            {"user_id": request.user.id, "recipe_id": recipe.id},
-        )
-
-    return Response(RecipeSerializer(recipe).data)
+    recipe_id = (
+        user_and_team_recipes(request.user)
+        .filter(pk=recipe_pk)
+        .values_list("id", flat=True)
+        .first()
+    )
+    if recipe_id is None:
+        raise Http404
+    document = get_documents(
+        "detail",
+        recipe_fingerprints([recipe_id]),
+        lambda ids: {
+            recipe.id: RecipeSerializer(recipe).data
+            for recipe in user_and_team_full_recipes(request.user).filter(pk__in=ids)
+        },
+    ).get(recipe_id)
+    if document is None:
+        raise Http404
+
+    recipe_view_log.submit(
+        {
+            "recipe_id": recipe_id,
+            "user_id": request.user.id,
+            "visited_at": timezone.now(),
+        }
+    )
+
+    return Response(document)
 
 
 def recipe_patch_view(request: AuthedRequest, recipe_pk: str) -> Response:
-    recipe = user_and_team_recipe_or_404(user=request.user, recipe_pk=recipe_pk)
+    recipe = user_and_team_full_recipe_or_404(user=request.user, recipe_pk=recipe_pk)
     serializer = RecipeSerializer(recipe, data=request.data, partial=True)
     serializer.is_valid(raise_exception=True)
 
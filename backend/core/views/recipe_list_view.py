@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import base64
 import collections
 import logging
-from typing import Any, Iterable, Optional
+from datetime import datetime, timedelta
+from typing import Any, Collection, Iterable, Mapping, Optional
 
 import advocate
+import pydantic
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.exceptions import MethodNotAllowed
@@ -15,6 +22,7 @@ from rest_framework.response import Response
 from core import ordering
 from core.cumin.quantity import parse_ingredient
 from core.models import (
+    DeletionLog,
     Ingredient,
     Note,
     Reaction,
@@ -23,91 +31,354 @@ from core.models import (
     Step,
     TimelineEvent,
     Upload,
+    user_active_team_ids,
     user_and_team_recipes,
 )
 from core.models.recipe import Recipe
 from core.models.team import Team
-from core.models.user import get_avatar_url
+from core.models.upload import get_public_url
+from core.models.user import User, get_avatar_url
+from core.recipes.documents import get_documents, recipe_fingerprints
 from core.recipes.scraper import scrape_recipe
-from core.recipes.serializers import (
-    RecipeSerializer,
-    serialize_attachments,
-    serialize_reactions,
-)
+from core.recipes.serializers import RecipeSerializer
 from core.request import AuthedRequest
 from core.serialization import RequestParams
 
 logger = logging.getLogger(__name__)
 
 
-def group_by_recipe_id(x: Iterable[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+def group_by_recipe_id(x: Iterable[dict[str, Any]]) -> dict[int, list[dict[str, Any]]]:
     map = collections.defaultdict(list)
     for item in x:
         map[item["recipe_id"]].append(item)
     return map
 
 
-def recipe_get_view(request: AuthedRequest) -> Response:
-    recipes = {
-        x["id"]: x
-        for x in user_and_team_recipes(request.user).values(
-            "id",
-            "name",
-            "author",
-            "source",
-            "time",
-            "servings",
-            "modified",
-            "owner_team",
-            "owner_team__name",
-            "owner_user",
-            "created",
-            "archived_at",
-            "tags",
-        )
-    }
-
-    ingredients = group_by_recipe_id(
-        Ingredient.objects.filter(recipe_id__in=recipes.keys()).values(
-            "id",
-            "quantity",
-            "name",
-            "description",
-            "position",
-            "recipe_id",
+RECIPE_FIELDS = (
+    "id",
+    "name",
+    "author",
+    "source",
+    "time",
+    "servings",
+    "modified",
+    "owner_team",
+    "created",
+    "archived_at",
+    "tags",
+    "owner",
+    "last_scheduled_at",
+    "ingredients",
+    "steps",
+    "sections",
+    "timelineItems",
+)
+
+# fields built from rows other than the recipe's own
+CHILD_FIELDS = {
+    "last_scheduled_at",
+    "ingredients",
+    "steps",
+    "sections",
+    "timelineItems",
+}
+
+MAX_PAGE_SIZE = 500
+
+
+class RecipeListParams(RequestParams):
+    """
+    Without any params we return every recipe with all of its fields.
+    """
+
+    # opaque value from `nextCursor` of the previous page
+    cursor: Optional[str] = None
+    limit: Optional[int] = None
+    # comma separated subset of `RECIPE_FIELDS`
+    fields: Optional[str] = None
+    # `watermark` from a previous sync, only return what changed since then
+    since: Optional[datetime] = None
+
+    @pydantic.root_validator(skip_on_failure=True)
+    def validate_since(cls, values: dict[str, Any]) -> dict[str, Any]:
+        if values["since"] is not None and (
+            values["cursor"] is not None or values["limit"] is not None
+        ):
+            raise ValueError("since can't be combined with cursor or limit")
+        return values
+
+    @pydantic.validator("since")
+    def validate_since_age(cls, v: Optional[datetime]) -> Optional[datetime]:
+        # deletions older than this have been pruned from `DeletionLog`
+        if v is not None and v < timezone.now() - timedelta(
+            days=settings.SYNC_RETENTION_DAYS
+        ):
+            raise ValueError("since is too old, fetch the full list instead")
+        return v
+
+    @pydantic.validator("fields")
+    def validate_fields(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None:
+            unknown = set(v.split(",")) - set(RECIPE_FIELDS)
+            if unknown:
+                raise ValueError(f"unknown fields: {', '.join(sorted(unknown))}")
+        return v
+
+    @pydantic.validator("limit")
+    def validate_limit(cls, v: Optional[int]) -> Optional[int]:
+        if v is not None and not 1 <= v <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        return v
+
+    @pydantic.validator("cursor")
+    def validate_cursor(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None:
+            decode_cursor(v)
+        return v
+
+
+def encode_cursor(modified: datetime, id: int) -> str:
+    return base64.urlsafe_b64encode(f"{modified.isoformat()}|{id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        modified, id = base64.urlsafe_b64decode(cursor).decode().split("|")
+        return datetime.fromisoformat(modified), int(id)
+    except ValueError as e:
+        raise ValueError("invalid cursor") from e
+
+
+# Rows become visible when their transaction commits, which can be a little
+# after the `modified` they were saved with, so the watermark we hand out lags
+# behind the current time. Clients may see a recent change twice.
+SYNC_WATERMARK_LAG = timedelta(minutes=1)
+
+
+def changed_since(since: datetime) -> Q:
+    """
+    Recipes that changed, or had any of their children change, since `since`.
+    """
+    recipe = OuterRef("pk")
+    children = (
+        Ingredient.objects.filter(recipe=recipe, modified__gt=since),
+        Step.objects.filter(recipe=recipe, modified__gt=since),
+        Section.objects.filter(recipe=recipe, modified__gt=since),
+        Note.objects.filter(recipe=recipe, modified__gt=since),
+        Upload.objects.filter(note__recipe=recipe, modified__gt=since),
+        Reaction.objects.filter(note__recipe=recipe, modified__gt=since),
+        TimelineEvent.objects.filter(recipe=recipe, modified__gt=since),
+        ScheduledRecipe.objects.filter(recipe=recipe, modified__gt=since),
+        DeletionLog.objects.filter(recipe_id=recipe, created__gt=since),
+    )
+    q = Q(modified__gt=since)
+    for child in children:
+        q |= Q(Exists(child))
+    return q
+
+
+def deleted_since(user: User, since: datetime) -> list[int]:
+    """
+    Recipes the user could see that were deleted or moved out of reach.
+    """
+    return list(
+        DeletionLog.objects.filter(kind=DeletionLog.RECIPE, created__gt=since)
+        .filter(
+            Q(
+                owner_content_type=ContentType.objects.get_for_model(User),
+                owner_object_id=user.id,
+            )
+            | Q(
+                owner_content_type=ContentType.objects.get_for_model(Team),
+                owner_object_id__in=user_active_team_ids(user),
+            )
         )
+        .exclude(recipe_id__in=user_and_team_recipes(user).values("id"))
+        .values_list("recipe_id", flat=True)
+        .distinct()
     )
 
-    schedule_recipe = dict()
-    for schedule in (
-        ScheduledRecipe.objects.filter(recipe_id__in=recipes.keys())
-        .distinct("recipe_id")
-        .order_by("-recipe_id", "-on")
-        .values("recipe_id", "on")
+
+def recipe_get_view(request: AuthedRequest) -> Response:
+    params = RecipeListParams.parse_obj(request.query_params.dict())
+    fields = set(params.fields.split(",") if params.fields else RECIPE_FIELDS)
+    paginate = params.cursor is not None or params.limit is not None
+    watermark = timezone.now() - SYNC_WATERMARK_LAG
+
+    access_changed_at = request.user.team_access_changed_at
+    if (
+        params.since is not None
+        and access_changed_at is not None
+        and params.since < access_changed_at
     ):
-        schedule_recipe[schedule["recipe_id"]] = schedule["on"]
-
-    steps = group_by_recipe_id(
-        Step.objects.filter(recipe_id__in=recipes.keys()).values(
-            "id",
-            "text",
-            "position",
-            "recipe_id",
+        # recipes of teams joined or left since then show up in neither the
+        # changes nor the deletion log
+        return Response(
+            {"message": "teams changed since `since`, fetch the full list instead"},
+            status=status.HTTP_400_BAD_REQUEST,
         )
+
+    queryset = user_and_team_recipes(request.user)
+    if params.since is not None:
+        queryset = queryset.filter(changed_since(params.since))
+    if paginate:
+        # newest first with the id breaking ties between equal `modified`
+        queryset = queryset.order_by("-modified", "-id")
+        if params.cursor is not None:
+            cursor_modified, cursor_id = decode_cursor(params.cursor)
+            queryset = queryset.filter(
+                Q(modified__lt=cursor_modified)
+                | Q(modified=cursor_modified, id__lt=cursor_id)
+            )
+    rows = queryset.values(
+        "id",
+        "name",
+        "author",
+        "source",
+        "time",
+        "servings",
+        "modified",
+        "owner_team",
+        "owner_team__name",
+        "owner_user",
+        "created",
+        "archived_at",
+        "tags",
     )
+    next_cursor = None
+    if paginate:
+        limit = params.limit or MAX_PAGE_SIZE
+        page = list(rows[: limit + 1])
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor(page[-1]["modified"], page[-1]["id"])
+        rows = page  # type: ignore [assignment]
+    recipes = {x["id"]: x for x in rows}
+
+    children: Mapping[int, Mapping[str, Any]] = {}
+    if fields & CHILD_FIELDS:
+        # the child rows are most of the work, so reuse cached documents of
+        # them while the recipe's own fields come from the rows we just read
+        children = get_documents(
+            "list",
+            recipe_fingerprints(recipes.keys()),
+            lambda ids: {
+                recipe_id: {k: document[k] for k in CHILD_FIELDS}
+                for recipe_id, document in build_recipe_documents(
+                    {recipe_id: dict(recipes[recipe_id]) for recipe_id in ids},
+                    CHILD_FIELDS,
+                ).items()
+            },
+        )
+    documents = build_recipe_documents(recipes, fields - CHILD_FIELDS)
+
+    results = [
+        {**document, **children.get(recipe_id, {})}
+        for recipe_id, document in documents.items()
+    ]
+    if params.fields:
+        results = [{k: v for k, v in r.items() if k in fields} for r in results]
+    if params.since is not None:
+        return Response(
+            {
+                "recipes": results,
+                "deleted": deleted_since(request.user, params.since),
+                "watermark": watermark,
+            }
+        )
+    if paginate:
+        return Response({"recipes": results, "nextCursor": next_cursor})
+    return Response(results)
+
+
+def build_recipe_documents(
+    recipes: dict[int, dict[str, Any]], fields: Collection[str]
+) -> dict[int, dict[str, Any]]:
+    """
+    Attach the requested child rows to each recipe row.
+    """
+    ingredients: dict[int, list[dict[str, Any]]] = {}
+    if "ingredients" in fields:
+        ingredients = group_by_recipe_id(
+            Ingredient.objects.filter(recipe_id__in=recipes.keys()).values(
+                "id",
+                "quantity",
+                "name",
+                "description",
+                "position",
+                "recipe_id",
+            )
+        )
 
-    sections = group_by_recipe_id(
-        Section.objects.filter(recipe_id__in=recipes.keys()).values(
-            "id",
-            "title",
-            "position",
-            "recipe_id",
+    schedule_recipe = dict()
+    if "last_scheduled_at" in fields:
+        for schedule in (
+            ScheduledRecipe.objects.filter(recipe_id__in=recipes.keys())
+            .distinct("recipe_id")
+            .order_by("-recipe_id", "-on")
+            .values("recipe_id", "on")
+        ):
+            schedule_recipe[schedule["recipe_id"]] = schedule["on"]
+
+    steps: dict[int, list[dict[str, Any]]] = {}
+    if "steps" in fields:
+        steps = group_by_recipe_id(
+            Step.objects.filter(recipe_id__in=recipes.keys()).values(
+                "id",
+                "text",
+                "position",
+                "recipe_id",
+            )
         )
-    )
 
-    notes = collections.defaultdict(list)
+    sections: dict[int, list[dict[str, Any]]] = {}
+    if "sections" in fields:
+        sections = group_by_recipe_id(
+            Section.objects.filter(recipe_id__in=recipes.keys()).values(
+                "id",
+                "title",
+                "position",
+                "recipe_id",
+            )
+        )
+
+    notes: dict[int, list[dict[str, Any]]] = {}
+    timeline_events: dict[int, list[dict[str, Any]]] = {}
+    if "timelineItems" in fields:
+        notes, timeline_events = get_timeline_items(recipes.keys())
+
+    for recipe_id, recipe in recipes.items():
+        if recipe["owner_team"]:
+            recipe["owner"] = dict(
+                type="team",
+                id=recipe["owner_team"],
+                name=recipe["owner_team__name"],
+            )
+        else:
+            recipe["owner"] = dict(type="user", id=recipe["owner_team"])
+
+        recipe.pop("owner_user", None)
+        recipe.pop("owner_user", None)
+        recipe.pop("owner_team__name", None)
+
+        recipe["last_scheduled_at"] = schedule_recipe.get(recipe_id)
+
+        recipe["ingredients"] = ingredients.get(recipe_id) or []
+        recipe["steps"] = steps.get(recipe_id) or []
+        recipe["sections"] = sections.get(recipe_id) or []
+        recipe["timelineItems"] = (notes.get(recipe_id) or []) + (
+            timeline_events.get(recipe_id) or []
+        )
+
+    return recipes
+
+
+def get_timeline_items(
+    recipe_ids: Collection[int],
+) -> tuple[dict[int, list[dict[str, Any]]], dict[int, list[dict[str, Any]]]]:
+    notes: dict[int, list[dict[str, Any]]] = collections.defaultdict(list)
     note_map = dict()
-    for note in Note.objects.filter(recipe_id__in=recipes.keys()).values(
+    for note in Note.objects.filter(recipe_id__in=recipe_ids).values(
         "id",
         "text",
         "modified",
@@ -141,18 +412,41 @@ def recipe_get_view(request: AuthedRequest) -> Response:
         notes[note["recipe_id"]].append(note)
         note_map[note["id"]] = note
 
-    for upload in Upload.objects.filter(note__recipe_id__in=recipes.keys()):
-        note_map[upload.note_id]["attachments"].append(
-            list(serialize_attachments([upload]))[0].dict()
+    # same shape as `serialize_attachments` & `serialize_reactions`
+    for upload in Upload.objects.filter(note__recipe_id__in=recipe_ids).values(
+        "id", "key", "note_id"
+    ):
+        note_map[upload["note_id"]]["attachments"].append(
+            dict(id=str(upload["id"]), url=get_public_url(upload["key"]), type="upload")
         )
-    for reaction in Reaction.objects.filter(note__recipe_id__in=recipes.keys()):
-        note_map[reaction.note_id]["reactions"].append(
-            list(serialize_reactions([reaction]))[0].dict()
+    for reaction in Reaction.objects.filter(note__recipe_id__in=recipe_ids).values(
+        "id",
+        "emoji",
+        "note_id",
+        "created",
+        "created_by",
+        "created_by__email",
+        "created_by__name",
+    ):
+        email = reaction["created_by__email"]
+        note_map[reaction["note_id"]]["reactions"].append(
+            dict(
+                id=str(reaction["id"]),
+                type=reaction["emoji"],
+                note_id=str(reaction["note_id"]),
+                user=dict(
+                    id=reaction["created_by"],
+                    name=reaction["created_by__name"] or email,
+                    email=email,
+                    avatar_url=get_avatar_url(email),
+                ),
+                created=reaction["created"],
+            )
         )
 
-    timeline_events = collections.defaultdict(list)
+    timeline_events: dict[int, list[dict[str, Any]]] = collections.defaultdict(list)
 
-    for event in TimelineEvent.objects.filter(recipe_id__in=recipes.keys()).values(
+    for event in TimelineEvent.objects.filter(recipe_id__in=recipe_ids).values(
         "id",
         "action",
         "created",
@@ -171,30 +465,7 @@ def recipe_get_view(request: AuthedRequest) -> Response:
         event["type"] = "recipe"
         timeline_events[event["recipe_id"]].append(event)
 
-    for recipe_id, recipe in recipes.items():
-        if recipe["owner_team"]:
-            recipe["owner"] = dict(
-                type="team",
-                id=recipe["owner_team"],
-                name=recipe["owner_team__name"],
-            )
-        else:
-            recipe["owner"] = dict(type="user", id=recipe["owner_team"])
-
-        recipe.pop("owner_user", None)
-        recipe.pop("owner_user", None)
-        recipe.pop("owner_team__name", None)
-
-        recipe["last_scheduled_at"] = schedule_recipe.get(recipe_id)
-
-        recipe["ingredients"] = ingredients.get(recipe_id) or []
-        recipe["steps"] = steps.get(recipe_id) or []
-        recipe["sections"] = sections.get(recipe_id) or []
-        recipe["timelineItems"] = (notes.get(recipe_id) or []) + (
-            timeline_events.get(recipe_id) or []
-        )
-
-    return Response(list(recipes.values()))
+    return notes, timeline_events
 
 
 class RecipePostParams(RequestParams):
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Compare YAML export speed of the pure Python dumper against `dump_yaml_all`,
+which uses libyaml when it's installed.
+
+The mixed run puts an emoji in every `--emoji-every`th recipe, those recipes
+have to go through the Python emitter.
+
+    ./s/bench_yaml.py [--recipes 1000] [--repeat 5] [--emoji-every 10]
+"""
+import argparse
+import sys
+import timeit
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Optional
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.response import (  # noqa: E402
+    FAST_YAML_DUMPER,
+    YamlDumper,
+    dump_yaml_all,
+)
+
+
+def make_recipes(
+    count: int, emoji_every: Optional[int] = None
+) -> List["OrderedDict[str, Any]"]:
+    """Shaped like `RecipeExportSerializer` output"""
+    return [
+        OrderedDict(
+            id=i,
+            name=f"Brandied Pumpkin Pie {i}"
+            + (" 🥧" if emoji_every and i % emoji_every == 0 else ""),
+            author="Melissa Clark",
+            time="4 hours",
+            source="https://cooking.nytimes.com/recipes/1015413-brandied-pumpkin-pie",
+            servings="8 servings",
+            ingredients=[
+                OrderedDict(
+                    quantity=f"{n} cups",
+                    name=f"ingredient {n}",
+                    description="finely chopped",
+                    optional=n % 5 == 0,
+                )
+                for n in range(12)
+            ],
+            steps=[
+                f"Step {n}: In a food processor, pulse together the flour and salt."
+                for n in range(8)
+            ],
+            owner={"team": "Recipe Yak Team"},
+            tags=["dessert", "holiday"],
+        )
+        for i in range(count)
+    ]
+
+
+def bench(name: str, recipes: List["OrderedDict[str, Any]"], repeat: int) -> None:
+    python = min(
+        timeit.repeat(
+            lambda: yaml.dump_all(
+                recipes, Dumper=YamlDumper, default_flow_style=False, allow_unicode=True
+            ),
+            number=1,
+            repeat=repeat,
+        )
+    )
+    fast = min(timeit.repeat(lambda: dump_yaml_all(recipes), number=1, repeat=repeat))
+    print(f"{name}:")
+    print(f"  python dumper:  {python:.3f}s for {len(recipes)} recipes")
+    print(f"  dump_yaml_all:  {fast:.3f}s for {len(recipes)} recipes")
+    print(f"  speedup:        {python / fast:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipes", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--emoji-every", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"libyaml available: {FAST_YAML_DUMPER is not None}")
+    bench("plain", make_recipes(args.recipes), args.repeat)
+    bench(
+        f"emoji in every {args.emoji_every}th recipe",
+        make_recipes(args.recipes, emoji_every=args.emoji_every),
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()